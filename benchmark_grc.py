@@ -0,0 +1,238 @@
+"""
+benchmark_grc.py
+
+Parser and importer benchmarks on synthetic .grc files (grc_synth.py).
+
+What this file does
+-------------------
+- Builds synthetic files from a single load up to tens of thousands of
+  loads, plus each format variant (BOM, latin-1, CRLF, trailing commas,
+  minimal layout, GPS columns)
+- Times, per file:
+    parse_grc_text     decode + full parse to load dicts (text path)
+    parse_grc_bytes    the bytes path (parsed cache off)
+    parse_grc_bytes_lean  the same into GrcLoad records, as the importers parse
+    tokenize           splitting lines into cells and finding the load header
+    normalize          turning already tokenized rows into load dicts
+    parse_grc_columns  typed column arrays (skipped without pandas)
+    write_parsed_file  the batched Harvest upsert of every load (only with --db)
+- Reports the best of --repeat runs as seconds and loads per second, and
+  the peak traced memory of a separate run
+- Writes everything as JSON (outputs/benchmarks/ by default) so runs can be
+  compared before and after a change with --compare
+
+--db runs write_parsed_file against the database from .env inside one
+transaction that is always rolled back, so nothing is kept, but the rows
+are briefly locked; do not point it at a busy production database.
+
+Run
+---
+python benchmark_grc.py
+python benchmark_grc.py --sizes 1,1000,50000 --repeat 5
+python benchmark_grc.py --compare outputs/benchmarks/grc_20251104_120000.json
+python benchmark_grc.py --db --db-max-loads 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from grc_synth import STANDARD_VARIANTS, GrcVariant, SyntheticGrc, build_grc_file
+from slingshot_client import SlingshotClientBase, compile_load_row_plan
+
+
+DEFAULT_SIZES = "1,100,1000,10000,50000"
+DEFAULT_VARIANT_SIZE = 1000
+DEFAULT_OUTPUT_DIR = "outputs/benchmarks"
+
+
+def build_cases(sizes: List[int], variant_size: int) -> List[Tuple[str, SyntheticGrc]]:
+    """(case label, file) for every size with the default variant, plus every variant at variant_size."""
+    cases = [(f"{size} loads {GrcVariant().label}", build_grc_file(90000000 + size, size)) for size in sizes]
+    for index, variant in enumerate(STANDARD_VARIANTS[1:], start=1):
+        cases.append((
+            f"{variant_size} loads {variant.label}",
+            build_grc_file(91000000 + index, variant_size, variant, index=index),
+        ))
+    return cases
+
+
+def parser_benchmarks(parser: SlingshotClientBase, raw: bytes) -> Dict[str, Callable[[], Any]]:
+    """name -> zero-argument callable; setup work (decoding, tokenizing) is done up front."""
+    text = parser.decode_grc_bytes(raw)
+    rows = parser._iter_grc_rows(text.splitlines())
+    header_map, load_columns = parser._read_grc_header(rows)
+    width = len(load_columns)
+    load_rows = [row[:width] + [None] * (width - len(row)) for row in rows]
+    plan = compile_load_row_plan(tuple(load_columns), header_map.get("GrcVersion")) if load_columns else None
+
+    def tokenize() -> Any:
+        token_rows = parser._iter_grc_rows(parser.decode_grc_bytes(raw).splitlines())
+        parser._read_grc_header(token_rows)
+        return list(token_rows)
+
+    benchmarks: Dict[str, Callable[[], Any]] = {
+        "parse_grc_text": lambda: parser.parse_grc_text(parser.decode_grc_bytes(raw)),
+        "parse_grc_bytes": lambda: parser.parse_grc_bytes(raw),
+        "parse_grc_bytes_lean": lambda: parser.parse_grc_bytes(raw, lean=True),
+        "tokenize": tokenize,
+    }
+    if plan is not None:
+        benchmarks["normalize"] = lambda: [plan.normalize(row) for row in load_rows]
+    try:
+        import pandas  # noqa: F401
+    except ImportError:
+        pass
+    else:
+        benchmarks["parse_grc_columns"] = lambda: parser.parse_grc_columns(raw)
+    return benchmarks
+
+
+def measure(func: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+
+    # Measured separately: tracing slows the code down too much to time it.
+    tracemalloc.start()
+    try:
+        result = func()
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+
+    return {"seconds": best, "peak_memory_kb": peak / 1024}
+
+
+def run_db_benchmark(parser: SlingshotClientBase, synthetic: SyntheticGrc) -> Dict[str, float]:
+    import pymysql
+
+    import import_grc
+
+    parsed = parser.parse_grc_bytes(synthetic.content, graincart_id=synthetic.graincart_id, file_name=synthetic.name)
+    conn = pymysql.connect(**import_grc.DB_CONFIG)
+    try:
+        started = time.perf_counter()
+        import_grc.write_parsed_file(conn, parsed["header"], parsed["loads"], synthetic.graincart_id, synthetic.name)
+        seconds = time.perf_counter() - started
+    finally:
+        conn.rollback()
+        conn.close()
+    return {"seconds": seconds, "peak_memory_kb": None}
+
+
+def run(
+    sizes: List[int],
+    variant_size: int,
+    repeat: int,
+    db: bool = False,
+    db_max_loads: int = 1000,
+) -> Dict[str, Any]:
+    parser = SlingshotClientBase()
+    results: List[Dict[str, Any]] = []
+
+    for case, synthetic in build_cases(sizes, variant_size):
+        benchmarks = parser_benchmarks(parser, synthetic.content)
+        for name, func in benchmarks.items():
+            # Large files get fewer repeats; their timings are stable anyway.
+            runs = repeat if synthetic.loads <= 10000 else max(1, repeat // 3)
+            results.append(_result(case, name, synthetic, measure(func, runs)))
+            _print_result(results[-1])
+
+        if db and synthetic.loads <= db_max_loads:
+            results.append(_result(case, "write_parsed_file", synthetic, run_db_benchmark(parser, synthetic)))
+            _print_result(results[-1])
+
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    previous = {(row["case"], row["benchmark"]): row for row in baseline.get("results", [])}
+    print(f"\nCompared with {baseline.get('created')} ({baseline.get('git_commit') or 'unknown commit'}):")
+    for row in current["results"]:
+        before = previous.get((row["case"], row["benchmark"]))
+        if not before or not before.get("seconds") or not row["seconds"]:
+            continue
+        speedup = before["seconds"] / row["seconds"]
+        memory = ""
+        if before.get("peak_memory_kb") and row.get("peak_memory_kb"):
+            memory = f", memory x{row['peak_memory_kb'] / before['peak_memory_kb']:.2f}"
+        print(f"  {row['case']:<40} {row['benchmark']:<20} x{speedup:.2f} faster{memory}")
+
+
+def _result(case: str, benchmark: str, synthetic: SyntheticGrc, measured: Dict[str, Any]) -> Dict[str, Any]:
+    seconds = measured["seconds"]
+    peak = measured["peak_memory_kb"]
+    return {
+        "case": case,
+        "benchmark": benchmark,
+        "loads": synthetic.loads,
+        "bytes": len(synthetic.content),
+        "seconds": round(seconds, 6),
+        "loads_per_second": round(synthetic.loads / seconds, 1) if seconds else None,
+        "peak_memory_kb": round(peak, 1) if peak is not None else None,
+    }
+
+
+def _print_result(row: Dict[str, Any]) -> None:
+    memory = f"{row['peak_memory_kb']:.0f} KiB peak" if row["peak_memory_kb"] is not None else "-"
+    print(
+        f"{row['case']:<40} {row['benchmark']:<20} "
+        f"{row['seconds'] * 1000:9.2f} ms  {row['loads_per_second'] or 0:12.0f} loads/s  {memory}"
+    )
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the .grc parser and importer on synthetic files.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="loads per file, comma separated")
+    parser.add_argument("--variant-size", type=int, default=DEFAULT_VARIANT_SIZE, help="loads per file for the format variants")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per benchmark; the best is kept")
+    parser.add_argument("--output", default=None, help="JSON results file (default outputs/benchmarks/grc_<timestamp>.json)")
+    parser.add_argument("--compare", default=None, help="earlier JSON results to compare against")
+    parser.add_argument("--db", action="store_true", help="also time write_parsed_file (rolled back)")
+    parser.add_argument("--db-max-loads", type=int, default=1000, help="largest file to run through the DB benchmark")
+    args = parser.parse_args()
+
+    sizes = [int(part) for part in args.sizes.split(",") if part.strip()]
+    report = run(sizes, args.variant_size, max(1, args.repeat), db=args.db, db_max_loads=args.db_max_loads)
+
+    output = Path(args.output or f"{DEFAULT_OUTPUT_DIR}/grc_{datetime.now():%Y%m%d_%H%M%S}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=1), encoding="utf-8")
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as handle:
+            compare(report, json.load(handle))
+
+
+if __name__ == "__main__":
+    main()
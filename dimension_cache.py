@@ -0,0 +1,246 @@
+"""
+dimension_cache.py
+
+In-memory maps of the Harvest dimension tables for the .grc importer.
+
+What this file does
+-------------------
+- Loads Grower, Department, Field, Crop, Cart and Storage_Location into
+  natural key -> ID maps once, at the start of an import run
+- Resolves the dimension IDs of a whole batch of loads at once: the
+  distinct natural keys are collected, keys not in the maps are looked up
+  with one statement per table, and the ones that still do not exist are
+  created with one multi-row INSERT per table
+- Keeps the maps up to date as rows are created, and forgets rows created
+  in a transaction that is rolled back
+
+Every load of a file shares its grower, farm, field and crop, so after
+the first file a batch usually resolves without any query at all.
+
+Lookups of keys missing from the maps go through the database's own
+comparison (collation), exactly like the old per-row SELECTs; the maps are
+keyed by the spelling that was looked up, so "corn" and "Corn" both end up
+on the same Crop_ID.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+# Crop_Code, Weight_PerBushel, Base_MC for crops created by the importer.
+CROP_DEFAULTS = {
+    "Corn": ("C", 56.00, 15.50),
+    "Soybeans": ("SB", 60.00, 13.00),
+    "Milo": ("M", 56.00, 14.00),
+    "Unknown": ("UNK", 60.00, 13.00),
+}
+DEFAULT_CROP_VALUES = ("UNK", 60.00, 13.00)
+
+# Keys per lookup statement; bounds the statement size on the first batch
+# of a run with an empty map.
+LOOKUP_CHUNK_SIZE = 200
+
+Key = Tuple[Any, ...]
+
+
+@dataclass(frozen=True)
+class DimensionTable:
+    table: str
+    id_column: str
+    key_columns: Tuple[str, ...]
+    # Columns and values for rows created from a key; no insert_columns
+    # means the importer never creates rows in this table.
+    insert_columns: Tuple[str, ...] = ()
+    insert_values: Optional[Callable[[Key], Tuple[Any, ...]]] = None
+
+
+def _crop_values(key: Key) -> Tuple[Any, ...]:
+    crop_code, weight_per_bushel, base_mc = CROP_DEFAULTS.get(key[0], DEFAULT_CROP_VALUES)
+    return crop_code, key[0], weight_per_bushel, base_mc
+
+
+DIMENSIONS: Dict[str, DimensionTable] = {
+    "grower": DimensionTable(
+        "Grower", "Grower_ID", ("Grower_Name",),
+        ("Grower_Name",), lambda key: key,
+    ),
+    "department": DimensionTable(
+        "Department", "Dpt_ID", ("Dpt_Name", "Grower_ID"),
+        ("Dpt_Name", "Contact", "Manager", "Grower_ID"), lambda key: (key[0], "Unknown", "Unknown", key[1]),
+    ),
+    "field": DimensionTable(
+        "Field", "Field_ID", ("Field_Name", "Crop_Year", "Dpt_ID"),
+        ("Field_Name", "Crop_Year", "Dpt_ID"), lambda key: key,
+    ),
+    "crop": DimensionTable(
+        "Crop", "Crop_ID", ("Crop_Name",),
+        ("Crop_Code", "Crop_Name", "Weight_PerBushel", "Base_MC"), _crop_values,
+    ),
+    "cart": DimensionTable(
+        "Cart", "Cart_ID", ("Cart_Code",),
+        ("Cart_Code", "Cart_Name"), lambda key: (key[0], f"Cart {key[0]}"),
+    ),
+    "storage_location": DimensionTable("Storage_Location", "StorLoc_ID", ("Bin_Code",)),
+}
+
+
+@dataclass
+class DimensionKeys:
+    """Natural keys of one load's dimensions, as normalized by the importer."""
+
+    grower_name: str
+    farm_name: str
+    field_name: str
+    crop_year: int
+    crop_name: str
+    cart_code: str
+    destination_code: Optional[str]
+
+
+@dataclass
+class DimensionIds:
+    grower_id: int
+    dpt_id: int
+    field_id: int
+    crop_id: int
+    cart_id: int
+    storloc_id: Optional[int]
+
+
+class DimensionResolver:
+    def __init__(self) -> None:
+        # dimension -> {natural key: ID}; Storage_Location may map to None
+        # (no such bin), which is remembered too.
+        self.maps: Dict[str, Dict[Key, Optional[int]]] = {name: {} for name in DIMENSIONS}
+        self.queries = 0
+        # (dimension, key) added to the maps since the last commit()
+        self._created: List[Tuple[str, Key]] = []
+
+    @classmethod
+    def preload(cls, conn) -> "DimensionResolver":
+        """Load every dimension table into the maps (one SELECT per table)."""
+        resolver = cls()
+        with conn.cursor() as cur:
+            for name, table in DIMENSIONS.items():
+                columns = ", ".join((table.id_column,) + table.key_columns)
+                cur.execute(f"SELECT {columns} FROM {table.table} ORDER BY {table.id_column}")
+                resolver.queries += 1
+                known = resolver.maps[name]
+                for row in cur.fetchall():
+                    key = tuple(row[column] for column in table.key_columns)
+                    # Duplicate keys: the oldest row wins.
+                    known.setdefault(key, row[table.id_column])
+        return resolver
+
+    def resolve(self, conn, rows: Sequence[DimensionKeys]) -> List[DimensionIds]:
+        """Return the dimension IDs of every row, creating missing dimension rows."""
+        self._ensure(conn, "grower", {(row.grower_name,) for row in rows})
+        growers = self.maps["grower"]
+        department_keys = [(row.farm_name, growers[(row.grower_name,)]) for row in rows]
+
+        self._ensure(conn, "department", set(department_keys))
+        departments = self.maps["department"]
+        field_keys = [
+            (row.field_name, row.crop_year, departments[department_key])
+            for row, department_key in zip(rows, department_keys)
+        ]
+
+        self._ensure(conn, "field", set(field_keys))
+        self._ensure(conn, "crop", {(row.crop_name,) for row in rows})
+        self._ensure(conn, "cart", {(row.cart_code,) for row in rows})
+        self._ensure(conn, "storage_location", {(row.destination_code,) for row in rows if row.destination_code})
+
+        fields = self.maps["field"]
+        crops = self.maps["crop"]
+        carts = self.maps["cart"]
+        storage_locations = self.maps["storage_location"]
+        return [
+            DimensionIds(
+                grower_id=growers[(row.grower_name,)],
+                dpt_id=departments[department_key],
+                field_id=fields[field_key],
+                crop_id=crops[(row.crop_name,)],
+                cart_id=carts[(row.cart_code,)],
+                storloc_id=storage_locations[(row.destination_code,)] if row.destination_code else None,
+            )
+            for row, department_key, field_key in zip(rows, department_keys, field_keys)
+        ]
+
+    def commit(self) -> None:
+        """Call after conn.commit(): rows created so far are now permanent."""
+        self._created.clear()
+
+    def rollback(self) -> None:
+        """Call after conn.rollback(): forget what was learned in the rolled-back transaction."""
+        for name, key in self._created:
+            self.maps[name].pop(key, None)
+        self._created.clear()
+
+    def _ensure(self, conn, name: str, keys: Iterable[Key]) -> None:
+        known = self.maps[name]
+        missing = [key for key in keys if key not in known]
+        if not missing:
+            return
+        # Everything learned inside a transaction may point at rows that a
+        # rollback removes, so it is all forgotten on rollback().
+        self._created.extend((name, key) for key in missing)
+
+        table = DIMENSIONS[name]
+        self._lookup(conn, table, known, missing)
+        missing = [key for key in missing if key not in known]
+        if not missing:
+            return
+
+        if not table.insert_columns:
+            for key in missing:
+                known[key] = None
+            return
+
+        # Keys that may compare equal in the database ("Corn" / "CORN") are
+        # created once; the rest then resolve to that row on the next pass.
+        while missing:
+            firsts: Dict[Key, Key] = {}
+            for key in missing:
+                firsts.setdefault(_fold(key), key)
+            self._insert(conn, table, list(firsts.values()))
+            self._lookup(conn, table, known, missing)
+            still_missing = [key for key in missing if key not in known]
+            if len(still_missing) == len(missing):
+                raise RuntimeError(f"{table.table} rows were inserted but cannot be found: {still_missing[:5]}")
+            missing = still_missing
+
+    def _lookup(self, conn, table: DimensionTable, known: Dict[Key, Optional[int]], keys: List[Key]) -> None:
+        # One UNION ALL of single-key SELECTs: each key is compared by the
+        # database itself and comes back tagged with its position.
+        condition = " AND ".join(f"{column} = %s" for column in table.key_columns)
+        with conn.cursor() as cur:
+            for start in range(0, len(keys), LOOKUP_CHUNK_SIZE):
+                chunk = keys[start:start + LOOKUP_CHUNK_SIZE]
+                sql = " UNION ALL ".join(
+                    f"SELECT {index} AS key_index, {table.id_column} AS id FROM {table.table} WHERE {condition}"
+                    for index in range(len(chunk))
+                )
+                cur.execute(sql, [value for key in chunk for value in key])
+                self.queries += 1
+                found: Dict[int, int] = {}
+                for row in cur.fetchall():
+                    index = int(row["key_index"])
+                    found[index] = min(found.get(index, row["id"]), row["id"])
+                for index, row_id in found.items():
+                    known[chunk[index]] = row_id
+
+    def _insert(self, conn, table: DimensionTable, keys: List[Key]) -> None:
+        placeholders = "(" + ", ".join(["%s"] * len(table.insert_columns)) + ")"
+        with conn.cursor() as cur:
+            cur.execute(
+                f"INSERT INTO {table.table} ({', '.join(table.insert_columns)}) "
+                f"VALUES {', '.join([placeholders] * len(keys))}",
+                [value for key in keys for value in table.insert_values(key)],
+            )
+            self.queries += 1
+
+
+def _fold(key: Key) -> Key:
+    return tuple(part.casefold() if isinstance(part, str) else part for part in key)
@@ -0,0 +1,146 @@
+"""
+grc_archive.py
+
+Reads .grc files straight out of zip and tar bundles.
+
+What this file does
+-------------------
+- Iterates the .grc members of a .zip, .tar, .tar.gz/.tgz, .tar.bz2 or
+  .tar.xz bundle as (member name, bytes); nothing is extracted to disk
+- Tar bundles are read in streaming mode: one sequential pass, so a
+  compressed tar is decompressed exactly once and never seeked
+- Zip members are decompressed one at a time
+- Only *.grc members are returned, at any folder depth; macOS metadata
+  (__MACOSX/, ._name) is skipped
+- A member that is too large or fails to decompress is returned with an
+  error instead of content, so one bad member does not end the pass
+
+Run
+---
+python grc_archive.py backups/2025.zip       # list the .grc members
+python grc_archive.py backups/2025.tar.gz
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tarfile
+import zipfile
+from dataclasses import dataclass
+from pathlib import PurePosixPath
+from typing import Iterator, Optional
+
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+# A .grc file is a few MB even for a full season on one cart; anything far
+# beyond that is a corrupt or hostile member.
+DEFAULT_MAX_MEMBER_BYTES = 256 * 1024 * 1024
+
+
+@dataclass
+class ArchiveMember:
+    """One .grc member of a bundle; exactly one of content/error is set."""
+
+    name: str
+    content: Optional[bytes] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def base_name(self) -> str:
+        return PurePosixPath(self.name).name
+
+
+def is_grc_archive(path: str | os.PathLike) -> bool:
+    return str(path).lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def count_grc_members(path: str | os.PathLike) -> Optional[int]:
+    """Number of .grc members of a zip (read from its directory); None for tar, which would need a full pass."""
+    if not zipfile.is_zipfile(path):
+        return None
+    with zipfile.ZipFile(path) as archive:
+        return sum(1 for info in archive.infolist() if not info.is_dir() and _is_grc_member(info.filename))
+
+
+def iter_grc_archive(
+    path: str | os.PathLike,
+    max_member_bytes: int = DEFAULT_MAX_MEMBER_BYTES,
+) -> Iterator[ArchiveMember]:
+    """Yield the .grc members of a zip or tar bundle, in archive order."""
+    if zipfile.is_zipfile(path):
+        yield from _iter_zip(path, max_member_bytes)
+    else:
+        yield from _iter_tar(path, max_member_bytes)
+
+
+def _iter_zip(path: str | os.PathLike, max_member_bytes: int) -> Iterator[ArchiveMember]:
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            if info.is_dir() or not _is_grc_member(info.filename):
+                continue
+            if info.file_size > max_member_bytes:
+                yield ArchiveMember(info.filename, error=f"member is {info.file_size} bytes, over the limit")
+                continue
+            try:
+                with archive.open(info) as handle:
+                    content = handle.read(max_member_bytes + 1)
+            except (OSError, zipfile.BadZipFile, EOFError, RuntimeError) as exc:
+                # RuntimeError: encrypted member
+                yield ArchiveMember(info.filename, error=str(exc))
+                continue
+            if len(content) > max_member_bytes:
+                yield ArchiveMember(info.filename, error="member is over the size limit")
+                continue
+            yield ArchiveMember(info.filename, content=content)
+
+
+def _iter_tar(path: str | os.PathLike, max_member_bytes: int) -> Iterator[ArchiveMember]:
+    # "r|*": sequential stream with transparent gzip/bz2/xz; members must be
+    # read in order, which is all a single import pass needs.
+    with tarfile.open(path, mode="r|*") as archive:
+        for info in archive:
+            if not info.isfile() or not _is_grc_member(info.name):
+                continue
+            if info.size > max_member_bytes:
+                yield ArchiveMember(info.name, error=f"member is {info.size} bytes, over the limit")
+                continue
+            try:
+                handle = archive.extractfile(info)
+                content = handle.read() if handle is not None else b""
+            except (OSError, tarfile.TarError, EOFError) as exc:
+                yield ArchiveMember(info.name, error=str(exc))
+                continue
+            yield ArchiveMember(info.name, content=content)
+
+
+def _is_grc_member(name: str) -> bool:
+    member = PurePosixPath(name)
+    if "__MACOSX" in member.parts or member.name.startswith("._"):
+        return False
+    return member.suffix.lower() == ".grc"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="List the .grc members of a zip or tar bundle.")
+    parser.add_argument("archive")
+    args = parser.parse_args()
+
+    count = 0
+    total_bytes = 0
+    for member in iter_grc_archive(args.archive):
+        if member.ok:
+            count += 1
+            total_bytes += len(member.content)
+            print(f"{len(member.content):>10}  {member.name}")
+        else:
+            print(f"{'ERROR':>10}  {member.name}: {member.error}")
+    print(f"{count} .grc member(s), {total_bytes / 1024 / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+"""
+grc_cache.py
+
+Local on-disk cache for raw .grc downloads.
+
+What this file does
+-------------------
+- Stores the raw bytes of each downloaded .grc file, gzip-compressed
+- Blobs are content-addressed (sha256 of the raw bytes), so identical
+  content is only stored once
+- An index (index.json) maps graincart ID + Slingshot last-modified value
+  to a blob, so lookups never scan the directory
+- Only the newest version of each graincart ID is kept
+- Least-recently-used entries are evicted once the cache exceeds its size
+  budget
+- Entries can also be read and written as streams (open / open_writer),
+  so large files never have to be held in memory
+
+Optional .env variables
+-----------------------
+RAVEN_GRC_CACHE_DIR=data/grc_cache     # "off" disables the cache
+RAVEN_GRC_CACHE_MAX_MB=512
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Optional
+
+from dotenv import load_dotenv
+
+
+INDEX_FILE_NAME = "index.json"
+DEFAULT_CACHE_DIR = "data/grc_cache"
+DEFAULT_MAX_MB = 512
+
+
+class GrcFileCache:
+    def __init__(self, directory: str | os.PathLike, max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index_path = self.directory / INDEX_FILE_NAME
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._entries: Dict[str, Dict[str, Any]] = self._load_index()
+
+    @classmethod
+    def from_env(cls) -> Optional["GrcFileCache"]:
+        load_dotenv()
+
+        directory = (os.getenv("RAVEN_GRC_CACHE_DIR") or DEFAULT_CACHE_DIR).strip()
+        if directory.lower() in {"", "0", "off", "false", "none"}:
+            return None
+
+        max_mb = int((os.getenv("RAVEN_GRC_CACHE_MAX_MB") or str(DEFAULT_MAX_MB)).strip())
+        return cls(directory, max_bytes=max_mb * 1024 * 1024)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def get(self, graincart_id: int, version: Optional[str]) -> Optional[bytes]:
+        """Return cached raw bytes, or None if missing, stale or corrupt."""
+        if not version:
+            return None
+
+        key = str(graincart_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if not entry or entry["version"] != version:
+                return None
+            digest = entry["sha256"]
+
+        # Read, decompress and hash without the lock so cache hits from
+        # several download threads run in parallel.
+        try:
+            raw = gzip.decompress(self._blob_path(digest).read_bytes())
+            valid = hashlib.sha256(raw).hexdigest() == digest
+        except (OSError, EOFError):
+            valid = False
+
+        with self._lock:
+            # The entry may have been replaced or evicted meanwhile.
+            entry = self._entries.get(key)
+            if not entry or entry["sha256"] != digest:
+                return raw if valid else None
+            if not valid:
+                self._drop(key)
+                return None
+            # Persisted with the next put(); LRU order only needs to be approximate.
+            entry["last_used"] = time.time()
+            return raw
+
+    def open(self, graincart_id: int, version: Optional[str]) -> Optional[BinaryIO]:
+        """
+        Open a cached entry as a decompressing binary stream, or None.
+
+        Unlike get(), the content hash is not re-checked; gzip's own CRC
+        still fails the read if the blob is damaged.
+        """
+        if not version:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(str(graincart_id))
+            if not entry or entry["version"] != version:
+                return None
+            try:
+                handle = gzip.open(self._blob_path(entry["sha256"]), "rb")
+            except OSError:
+                self._drop(str(graincart_id))
+                return None
+            entry["last_used"] = time.time()
+            return handle
+
+    def open_writer(self, graincart_id: int, version: Optional[str]) -> Optional["GrcCacheWriter"]:
+        """Start a streamed put(); call commit() once all bytes are written."""
+        if not version:
+            return None
+        return GrcCacheWriter(self, graincart_id, version)
+
+    def put(self, graincart_id: int, version: Optional[str], raw: bytes) -> None:
+        if not version:
+            return
+
+        digest = hashlib.sha256(raw).hexdigest()
+        blob_path = self._blob_path(digest)
+
+        with self._lock:
+            if not blob_path.exists():
+                blob_path.parent.mkdir(parents=True, exist_ok=True)
+                self._write_atomic(blob_path, gzip.compress(raw, compresslevel=6))
+
+            self._register(graincart_id, version, digest, len(raw))
+
+    def invalidate(self, graincart_id: int) -> None:
+        with self._lock:
+            if str(graincart_id) in self._entries:
+                self._drop(str(graincart_id))
+                self._save_index()
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._stored_bytes()
+
+    # ------------------------------------------------------------------
+    # Internal helpers (call with self._lock held)
+    # ------------------------------------------------------------------
+    def _blob_path(self, digest: str) -> Path:
+        return self.directory / digest[:2] / f"{digest}.grc.gz"
+
+    def _register(self, graincart_id: int, version: str, digest: str, raw_size: int) -> None:
+        key = str(graincart_id)
+        # The new entry goes in before the old one's blob is released: a new
+        # version with unchanged content shares that blob.
+        previous = self._entries.get(key)
+        self._entries[key] = {
+            "version": version,
+            "sha256": digest,
+            "size": self._blob_path(digest).stat().st_size,
+            "raw_size": raw_size,
+            "last_used": time.time(),
+        }
+        if previous is not None:
+            self._release_blob(previous["sha256"])
+
+        self._evict()
+        self._save_index()
+
+    def _stored_bytes(self) -> int:
+        # Blobs shared by several IDs are counted once.
+        sizes = {entry["sha256"]: entry["size"] for entry in self._entries.values()}
+        return sum(sizes.values())
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._release_blob(entry["sha256"])
+
+    def _release_blob(self, digest: str) -> None:
+        """Delete the blob unless an entry still points at it."""
+        if any(other["sha256"] == digest for other in self._entries.values()):
+            return
+        try:
+            self._blob_path(digest).unlink()
+        except FileNotFoundError:
+            pass
+
+    def _evict(self) -> None:
+        total = self._stored_bytes()
+        if total <= self.max_bytes:
+            return
+
+        for key, _entry in sorted(self._entries.items(), key=lambda item: item[1]["last_used"]):
+            self._drop(key)
+            total = self._stored_bytes()
+            if total <= self.max_bytes:
+                break
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with self._index_path.open("r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        return data.get("entries", {}) if isinstance(data, dict) else {}
+
+    def _save_index(self) -> None:
+        payload = json.dumps({"entries": self._entries}, indent=1, sort_keys=True)
+        self._write_atomic(self._index_path, payload.encode("utf-8"))
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> None:
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+
+class GrcCacheWriter:
+    """
+    Streams one entry into the cache.
+
+    Bytes are compressed into a temporary file while being hashed; commit()
+    moves the file to its content-addressed blob path and updates the index.
+    abort() discards everything, e.g. when a download is cut short.
+    """
+
+    def __init__(self, cache: GrcFileCache, graincart_id: int, version: str) -> None:
+        self._cache = cache
+        self._graincart_id = graincart_id
+        self._version = version
+        self._hash = hashlib.sha256()
+        self._raw_size = 0
+        self._tmp_path = cache.directory / f".incoming.{os.getpid()}.{threading.get_ident()}.{graincart_id}.tmp"
+        self._handle: Optional[gzip.GzipFile] = gzip.open(self._tmp_path, "wb", compresslevel=6)
+
+    def write(self, data: bytes) -> None:
+        if self._handle is None:
+            raise ValueError("cache writer is already closed")
+        self._hash.update(data)
+        self._raw_size += len(data)
+        self._handle.write(data)
+
+    def commit(self) -> None:
+        if self._handle is None:
+            return
+        self._handle.close()
+        self._handle = None
+
+        digest = self._hash.hexdigest()
+        blob_path = self._cache._blob_path(digest)
+
+        with self._cache._lock:
+            if blob_path.exists():
+                self._tmp_path.unlink()
+            else:
+                blob_path.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(self._tmp_path, blob_path)
+            self._cache._register(self._graincart_id, self._version, digest, self._raw_size)
+
+    def abort(self) -> None:
+        if self._handle is None:
+            return
+        self._handle.close()
+        self._handle = None
+        try:
+            self._tmp_path.unlink()
+        except FileNotFoundError:
+            pass
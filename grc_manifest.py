@@ -0,0 +1,209 @@
+"""
+grc_manifest.py
+
+Local manifest of Slingshot grain cart files, built from their names.
+
+What this file does
+-------------------
+- Parses Slingshot file names such as
+      Corn_1793_106_2025-11-03_092643_15895.grc
+  into crop, field, job number, creation time and cart (bridge) suffix.
+  Field names may themselves contain underscores (Corn_1330_31_3_...).
+- Keeps one entry per graincart ID (name, last-modified, parsed fields),
+  filled from the summary listing and from graincart_summary_names.txt
+- Selects files by season, crop, field or cart, so the importer only
+  downloads what matches
+- Gives the importer file names by ID, so it can skip the detail call
+
+Optional .env variables
+-----------------------
+RAVEN_MANIFEST=data/grc_manifest.json
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from dotenv import load_dotenv
+
+
+DEFAULT_MANIFEST_PATH = "data/grc_manifest.json"
+DEFAULT_NAMES_FILE = "graincart_summary_names.txt"
+
+FILE_NAME_PATTERN = re.compile(
+    r"^(?P<crop>[^_]+)_(?P<field>.+)_(?P<job>\d+)_(?P<date>\d{4}-\d{2}-\d{2})_(?P<time>\d{6})_(?P<cart>[^_.]+)\.grc$",
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class GraincartFileName:
+    crop: str
+    field: str
+    job_number: int
+    created: datetime
+    cart: str
+
+    @property
+    def season(self) -> int:
+        return self.created.year
+
+
+def parse_graincart_file_name(name: Optional[str]) -> Optional[GraincartFileName]:
+    if not name:
+        return None
+    match = FILE_NAME_PATTERN.match(name.strip())
+    if not match:
+        return None
+    try:
+        created = datetime.strptime(f"{match.group('date')} {match.group('time')}", "%Y-%m-%d %H%M%S")
+    except ValueError:
+        return None
+    return GraincartFileName(
+        crop=match.group("crop"),
+        field=match.group("field"),
+        job_number=int(match.group("job")),
+        created=created,
+        cart=match.group("cart"),
+    )
+
+
+@dataclass
+class ManifestEntry:
+    file_id: int
+    name: str
+    last_modified: Optional[str] = None
+    crop: Optional[str] = None
+    field: Optional[str] = None
+    job_number: Optional[int] = None
+    created: Optional[str] = None
+    season: Optional[int] = None
+    cart: Optional[str] = None
+
+    @classmethod
+    def from_name(cls, file_id: int, name: str, last_modified: Optional[str] = None) -> "ManifestEntry":
+        entry = cls(file_id=file_id, name=name, last_modified=last_modified)
+        parsed = parse_graincart_file_name(name)
+        if parsed is not None:
+            entry.crop = parsed.crop
+            entry.field = parsed.field
+            entry.job_number = parsed.job_number
+            entry.created = parsed.created.isoformat()
+            entry.season = parsed.season
+            entry.cart = parsed.cart
+        return entry
+
+
+@dataclass
+class ManifestFilter:
+    """Each populated list is OR-ed internally; the lists are AND-ed together."""
+
+    seasons: List[int] = field(default_factory=list)
+    crops: List[str] = field(default_factory=list)
+    fields: List[str] = field(default_factory=list)
+    carts: List[str] = field(default_factory=list)
+
+    def is_empty(self) -> bool:
+        return not (self.seasons or self.crops or self.fields or self.carts)
+
+    def matches(self, entry: ManifestEntry) -> bool:
+        if self.seasons and entry.season not in self.seasons:
+            return False
+        if self.crops and _fold(entry.crop) not in {_fold(c) for c in self.crops}:
+            return False
+        if self.fields and _fold_field(entry.field) not in {_fold_field(f) for f in self.fields}:
+            return False
+        if self.carts and _fold(entry.cart) not in {_fold(c) for c in self.carts}:
+            return False
+        return True
+
+
+class GrcManifest:
+    def __init__(self, path: str | os.PathLike, entries: Optional[Dict[int, ManifestEntry]] = None) -> None:
+        self.path = Path(path)
+        self.entries: Dict[int, ManifestEntry] = entries or {}
+
+    @classmethod
+    def load(cls, path: Optional[str | os.PathLike] = None) -> "GrcManifest":
+        if path is None:
+            load_dotenv()
+            path = (os.getenv("RAVEN_MANIFEST") or DEFAULT_MANIFEST_PATH).strip()
+
+        manifest = cls(path)
+        try:
+            with manifest.path.open("r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except FileNotFoundError:
+            return manifest
+
+        for raw in data.get("files", []):
+            entry = ManifestEntry(**raw)
+            manifest.entries[entry.file_id] = entry
+        return manifest
+
+    def save(self) -> None:
+        payload = {"files": [asdict(entry) for _file_id, entry in sorted(self.entries.items())]}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f".{self.path.name}.tmp")
+        with tmp_path.open("w", encoding="utf-8") as handle:
+            json.dump(payload, handle, indent=1)
+        os.replace(tmp_path, self.path)
+
+    def add(self, file_id: int, name: str, last_modified: Optional[str] = None) -> ManifestEntry:
+        entry = ManifestEntry.from_name(file_id, name, last_modified)
+        self.entries[file_id] = entry
+        return entry
+
+    def add_summary(self, item: Dict[str, Any], file_id: int, last_modified: Optional[str]) -> ManifestEntry:
+        name = item.get("Name") or item.get("name") or f"GRC_{file_id}.grc"
+        return self.add(file_id, name, last_modified)
+
+    def add_names_file(self, path: str | os.PathLike = DEFAULT_NAMES_FILE) -> int:
+        """
+        Merge a "<ID>  <Name>" listing such as graincart_summary_names.txt.
+
+        Entries already known from a summary listing are kept, since those
+        also carry the last-modified value.
+        """
+        added = 0
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                for line in handle:
+                    parts = line.split(None, 1)
+                    if len(parts) != 2 or not parts[0].isdigit():
+                        continue
+                    file_id = int(parts[0])
+                    if file_id not in self.entries:
+                        self.add(file_id, parts[1].strip())
+                        added += 1
+        except FileNotFoundError:
+            pass
+        return added
+
+    def name_for(self, file_id: int) -> Optional[str]:
+        entry = self.entries.get(file_id)
+        return entry.name if entry else None
+
+    def select(self, selection: ManifestFilter) -> List[ManifestEntry]:
+        return [entry for _file_id, entry in sorted(self.entries.items()) if selection.matches(entry)]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterable[ManifestEntry]:
+        return iter(self.entries.values())
+
+
+def _fold(value: Optional[str]) -> str:
+    return (value or "").strip().casefold()
+
+
+def _fold_field(value: Optional[str]) -> str:
+    # Same spirit as import_grc.normalize_field_name: case, dots and spaces don't matter.
+    return _fold(value).replace(".", "-").replace(" ", "")
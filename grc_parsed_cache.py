@@ -0,0 +1,187 @@
+"""
+grc_parsed_cache.py
+
+On-disk cache of tokenized .grc files, so unchanged files are never run
+through the text parser twice.
+
+What this file does
+-------------------
+- Stores the result of parsing one .grc file (header rows, load columns
+  and the load cells) as a compressed NumPy .npz archive
+- Entries are keyed by the sha256 of the raw .grc bytes plus the parser
+  version, so the same content downloaded again, or read from an exported
+  file, hits the same entry
+- Every entry records the parser version it was written with; bumping
+  GRC_PARSER_VERSION in slingshot_client.py makes old entries misses
+- Load cells are stored column by column, dictionary-encoded (a table of
+  distinct strings plus int32 codes), which is compact for the repetitive
+  columns of a .grc file (dates, destinations, trucks, zeros)
+- Least-recently-used entries (by file modification time, refreshed on
+  every hit) are evicted once the cache exceeds its size budget, which
+  also clears out entries of old parser versions
+
+Normalization (numbers, dates, aliases) still runs on load, through the
+same per-layout plan as a fresh parse, so its output is identical.
+
+Needs numpy (installed with pandas).
+
+Optional .env variables
+-----------------------
+RAVEN_PARSED_CACHE_DIR=data/grc_cache/parsed   # "off" disables the cache
+RAVEN_PARSED_CACHE_MAX_MB=256
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from dotenv import load_dotenv
+
+
+DEFAULT_PARSED_CACHE_DIR = "data/grc_cache/parsed"
+DEFAULT_MAX_MB = 256
+
+# (header rows, load columns, one list of cells per load column)
+ParsedCells = Tuple[Dict[str, str], List[str], List[List[Optional[str]]]]
+
+
+class GrcParsedCache:
+    def __init__(self, directory: str | os.PathLike, max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        # Parser processes share the directory, so there is no index: each
+        # instance estimates the size from its own writes and rescans the
+        # directory only when the estimate goes over budget.
+        self._lock = threading.Lock()
+        self._stored_estimate: Optional[int] = None
+
+    @classmethod
+    def from_env(cls) -> Optional["GrcParsedCache"]:
+        load_dotenv()
+
+        directory = (os.getenv("RAVEN_PARSED_CACHE_DIR") or DEFAULT_PARSED_CACHE_DIR).strip()
+        if directory.lower() in {"", "0", "off", "false", "none"}:
+            return None
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            return None
+
+        max_mb = int((os.getenv("RAVEN_PARSED_CACHE_MAX_MB") or str(DEFAULT_MAX_MB)).strip())
+        return cls(directory, max_bytes=max_mb * 1024 * 1024)
+
+    def get(self, digest: str, parser_version: int) -> Optional[ParsedCells]:
+        """Return the cached parse for this content hash, or None if missing, stale or corrupt."""
+        import numpy as np
+
+        path = self._entry_path(digest, parser_version)
+        try:
+            with np.load(path, allow_pickle=False) as archive:
+                if int(archive["parser_version"]) != parser_version:
+                    return None
+                header_keys = archive["header_keys"].tolist()
+                header_values = archive["header_values"].tolist()
+                load_columns = archive["load_columns"].tolist()
+                column_data = [
+                    (archive[f"values_{index}"].tolist(), archive[f"codes_{index}"].tolist())
+                    for index in range(len(load_columns))
+                ]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError):
+            self._remove(path)
+            return None
+        self._touch(path)
+
+        columns = []
+        for values, codes in column_data:
+            values.append(None)  # code -1 marks a missing cell
+            columns.append([values[code] for code in codes])
+
+        return dict(zip(header_keys, header_values)), load_columns, columns
+
+    def put(
+        self,
+        digest: str,
+        parser_version: int,
+        header_map: Dict[str, str],
+        load_columns: Sequence[str],
+        columns: Sequence[Sequence[Optional[str]]],
+    ) -> None:
+        import numpy as np
+
+        arrays = {
+            "parser_version": np.array(parser_version, dtype=np.int32),
+            "header_keys": np.array(list(header_map.keys()), dtype=str),
+            "header_values": np.array(list(header_map.values()), dtype=str),
+            "load_columns": np.array(list(load_columns), dtype=str),
+        }
+        for index, column in enumerate(columns):
+            distinct: Dict[str, int] = {}
+            codes = [-1 if value is None else distinct.setdefault(value, len(distinct)) for value in column]
+            arrays[f"values_{index}"] = np.array(list(distinct), dtype=str)
+            arrays[f"codes_{index}"] = np.array(codes, dtype=np.int32)
+
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, **arrays)
+
+        path = self._entry_path(digest, parser_version)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        data = buffer.getvalue()
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            if self._stored_estimate is None:
+                self._stored_estimate = self._scan_bytes()
+            else:
+                self._stored_estimate += len(data)
+            if self._stored_estimate > self.max_bytes:
+                self._evict()
+
+    def _entry_path(self, digest: str, parser_version: int) -> Path:
+        return self.directory / digest[:2] / f"{digest}.p{parser_version}.npz"
+
+    def _entries(self) -> List[Tuple[float, int, Path]]:
+        entries = []
+        for path in self.directory.glob("*/*.npz"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue  # evicted by another process meanwhile
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _scan_bytes(self) -> int:
+        return sum(size for _mtime, size, _path in self._entries())
+
+    def _evict(self) -> None:
+        entries = sorted(self._entries())
+        total = sum(size for _mtime, size, _path in entries)
+        for _mtime, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+        self._stored_estimate = total
+
+    @staticmethod
+    def _touch(path: Path) -> None:
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,262 @@
+"""
+grc_synth.py
+
+Synthetic Raven Slingshot .grc files, for benchmarks and offline tests.
+
+What this file does
+-------------------
+- Builds .grc files in the observed format: key/value header rows, the
+  units row, the LoadNumber,Weight,... header and one row per load
+- Any size from a single load to tens of thousands of loads
+- Format variants seen (or plausible) in exports:
+    - encoding: utf-8, utf-8 with BOM, latin-1 (non-ASCII variety names)
+    - line endings: LF or CRLF
+    - trailing commas on load rows
+    - layout: the full 19-column layout (with Latitude/Longitude, optionally
+      filled with GPS values) or a minimal layout without the optional columns
+- Writes a corpus as <ID>_<Name>.grc, the same naming as data/grc, so the
+  files work with slingshot_mock_server.py and import_grc.py --dir
+
+Run
+---
+python grc_synth.py --out data/synthetic_grc --count 20 --loads 40
+python grc_synth.py --out data/synthetic_grc --loads 1,100,10000 --variants
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+
+# (column, units row label); the full layout matches exported files such as
+# data/grc/93123148_Corn_1793_106_2025-11-03_092643_15895.grc
+FULL_LAYOUT = [
+    ("LoadNumber", ""),
+    ("Weight", "Pounds"),
+    ("TruckID", ""),
+    ("Destination", ""),
+    ("MeasuredMoisture", "Percent"),
+    ("MoistureCorrection", "Percent"),
+    ("Moisture", "Percent"),
+    ("TestWeight", "Pounds/Bushel"),
+    ("WetBushels", "Bushels"),
+    ("DryBushels", "Bushels"),
+    ("Variety", ""),
+    ("LoadDate", "UTC Date"),
+    ("LoadTime", "UTC Time"),
+    ("Latitude", "Degrees"),
+    ("Longitude", "Degrees"),
+    ("LoadCellCAL", ""),
+    ("LocalDate", ""),
+    ("LocalTime", ""),
+    ("Comment", ""),
+]
+OPTIONAL_COLUMNS = {"MoistureCorrection", "Latitude", "Longitude", "LoadCellCAL"}
+MINIMAL_LAYOUT = [column for column in FULL_LAYOUT if column[0] not in OPTIONAL_COLUMNS]
+
+CROPS = [("Corn", 56.0), ("Soybeans", 60.0)]
+FIELDS = ["1793", "2016W", "1315-16", "Plots", "1330_31_3"]
+DESTINATIONS = ["Bin-13", "Bin-14", "Bin-15", "Feed Mill", "Beef Feedlot"]
+TRUCKS = ["460A", "461A", "496A"]
+CART_SUFFIXES = ["15895", "15588"]
+VARIETIES = ["", "", "P1185", "DKC62-08", "Pioneer® P0720"]
+
+
+@dataclass
+class GrcVariant:
+    encoding: str = "utf-8"          # "utf-8", "utf-8-sig" or "latin-1"
+    newline: str = "\n"
+    trailing_commas: bool = False    # append ",," to every load row
+    layout: str = "full"             # "full" or "minimal"
+    gps: bool = False                # fill Latitude/Longitude (full layout only)
+
+    @property
+    def label(self) -> str:
+        parts = [self.encoding, "crlf" if self.newline == "\r\n" else "lf", self.layout]
+        if self.trailing_commas:
+            parts.append("trailing-commas")
+        if self.gps:
+            parts.append("gps")
+        return "/".join(parts)
+
+
+# One of each variant the parser has to cope with, for --variants and benchmarks.
+STANDARD_VARIANTS = [
+    GrcVariant(),
+    GrcVariant(newline="\r\n"),
+    GrcVariant(encoding="utf-8-sig"),
+    GrcVariant(encoding="latin-1"),
+    GrcVariant(trailing_commas=True),
+    GrcVariant(layout="minimal"),
+    GrcVariant(gps=True),
+]
+
+
+@dataclass
+class SyntheticGrc:
+    graincart_id: int
+    name: str
+    content: bytes
+    date_last_modified: str
+    time_last_modified: str
+    loads: int
+
+
+def build_grc_file(
+    graincart_id: int,
+    loads: int,
+    variant: Optional[GrcVariant] = None,
+    index: int = 0,
+    seed: int = 1,
+) -> SyntheticGrc:
+    """
+    Build one synthetic .grc file.
+
+    index picks the crop, field, cart and creation time, so a corpus built
+    with increasing indexes looks like a season of jobs.
+    """
+    variant = variant or GrcVariant()
+    rng = random.Random(seed * 1_000_003 + index)
+    crop, test_weight = CROPS[index % len(CROPS)]
+    field_name = FIELDS[index % len(FIELDS)]
+    cart = CART_SUFFIXES[index % len(CART_SUFFIXES)]
+    job_number = 100 + index
+    created = datetime(2025, 9, 15, 8, 0, 0) + timedelta(hours=index * 7)
+    layout = FULL_LAYOUT if variant.layout == "full" else MINIMAL_LAYOUT
+    variety = rng.choice(VARIETIES)
+    if variant.encoding == "latin-1":
+        # Make sure the non-UTF-8 bytes are actually there.
+        variety = VARIETIES[-1]
+
+    load_lines = []
+    moment = created
+    total_pounds = 0.0
+    total_dry = 0.0
+    for load_number in range(1, loads + 1):
+        moment += timedelta(minutes=rng.randint(12, 35))
+        weight = round(rng.uniform(24000, 35000), 1)
+        bushels = round(weight / test_weight, 1)
+        total_pounds += weight
+        total_dry += bushels
+        time_text = grc_time(moment)
+        values = {
+            "LoadNumber": str(load_number),
+            "Weight": str(weight),
+            "TruckID": rng.choice(TRUCKS),
+            "Destination": rng.choice(DESTINATIONS),
+            "MeasuredMoisture": "0.0",
+            "MoistureCorrection": "0.0",
+            "Moisture": "0.0",
+            "TestWeight": str(test_weight),
+            "WetBushels": str(bushels),
+            "DryBushels": str(bushels),
+            "Variety": variety,
+            "LoadDate": f"{moment:%Y-%m-%d}",
+            "LoadTime": time_text,
+            "Latitude": f"{40.85 + rng.uniform(-0.01, 0.01):.6f}" if variant.gps else "",
+            "Longitude": f"{-96.47 + rng.uniform(-0.01, 0.01):.6f}" if variant.gps else "",
+            "LoadCellCAL": "23524",
+            "LocalDate": f"{moment:%Y-%m-%d}",
+            "LocalTime": time_text,
+            # Operators type the moisture reading into the comment field.
+            "Comment": str(round(rng.uniform(13.0, 16.5), 1)),
+        }
+        line = ",".join(values[column] for column, _units in layout)
+        if variant.trailing_commas:
+            line += ",,"
+        load_lines.append(line)
+
+    modified = moment
+    lines = [
+        "GrcVersion,1.6,",
+        "SoftwareVersion,24.1.0.4,",
+        f"JobNumber,{job_number},",
+        "Grower,UNL_ENREEC,",
+        "Farm,FarmOperations-1,",
+        f"Field,{field_name},",
+        f"Year,{created.year},",
+        f"Crop,{crop},",
+        f"BridgeId,00:00:00:00:{cart[:2]}:{cart[2:4]},",
+        f"DateCreated,{created:%Y-%m-%d},",
+        f"TimeCreated,{grc_time(created)},",
+        f"DateLastModified,{modified:%Y-%m-%d},",
+        f"TimeLastModified,{grc_time(modified)},",
+        f"TotalPounds,{int(total_pounds)},",
+        f"TotalDryBushels,{round(total_dry, 1)},",
+        "AverageMoisture,0.0,",
+        ",".join(units for _column, units in layout) + ",",
+        ",".join(column for column, _units in layout),
+    ] + load_lines
+
+    text = variant.newline.join(lines) + variant.newline
+    name = f"{crop}_{field_name}_{job_number}_{created:%Y-%m-%d_%H%M%S}_{cart}.grc"
+    return SyntheticGrc(
+        graincart_id=graincart_id,
+        name=name,
+        content=text.encode(variant.encoding),
+        date_last_modified=f"{modified:%Y-%m-%d}",
+        time_last_modified=grc_time(modified),
+        loads=loads,
+    )
+
+
+def build_corpus(
+    count: int,
+    loads_per_file: int,
+    first_id: int = 90000000,
+    seed: int = 1,
+    variants: Optional[Sequence[GrcVariant]] = None,
+) -> List[SyntheticGrc]:
+    """count files of loads_per_file loads each, cycling through variants."""
+    variants = list(variants or [GrcVariant()])
+    return [
+        build_grc_file(first_id + index, loads_per_file, variants[index % len(variants)], index=index, seed=seed)
+        for index in range(count)
+    ]
+
+
+def write_corpus(directory: str | Path, files: Sequence[SyntheticGrc]) -> List[Path]:
+    base = Path(directory)
+    base.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for synthetic in files:
+        path = base / f"{synthetic.graincart_id}_{synthetic.name}"
+        path.write_bytes(synthetic.content)
+        paths.append(path)
+    return paths
+
+
+def grc_time(moment: datetime) -> str:
+    # Slingshot writes HH:MM plus only the tens digit of the seconds, e.g. 09:26:4.
+    return f"{moment:%H:%M}:{moment.second // 10}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write synthetic Slingshot .grc files.")
+    parser.add_argument("--out", default="data/synthetic_grc")
+    parser.add_argument("--count", type=int, default=1, help="files per size (and per variant with --variants)")
+    parser.add_argument("--loads", default="40", help="loads per file; a comma list writes one set per size")
+    parser.add_argument("--variants", action="store_true", help="cycle through encoding, CRLF, trailing-comma and layout variants")
+    parser.add_argument("--first-id", type=int, default=90000000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    variants = STANDARD_VARIANTS if args.variants else [GrcVariant()]
+    next_id = args.first_id
+    written = 0
+    for loads in (int(part) for part in args.loads.split(",") if part.strip()):
+        count = args.count * len(variants)
+        files = build_corpus(count, loads, first_id=next_id, seed=args.seed, variants=variants)
+        written += len(write_corpus(args.out, files))
+        next_id += count
+
+    print(f"Wrote {written} synthetic .grc file(s) to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
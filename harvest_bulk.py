@@ -0,0 +1,508 @@
+"""
+harvest_bulk.py
+
+Bulk Harvest writer for season backfills: staging table + LOAD DATA.
+
+What this file does
+-------------------
+- Collects normalized loads (import_grc.prepare_harvest_load) from many
+  files and sends them to a temporary staging table in one go, with
+  LOAD DATA LOCAL INFILE, or multi-row INSERTs when the server or client
+  does not allow LOCAL INFILE
+- Resolves dimension IDs set-based in SQL: missing Grower, Department,
+  Field, Crop and Cart rows are created with one INSERT ... SELECT each,
+  then every staged row gets its IDs with one UPDATE per table
+- Finds the existing Harvest row of every staged load the same way
+  insert_harvest_load does: External_Load_Key first, else the same date,
+  cart, field, crop and load number; rows with MC win ties, then the
+  lowest Harvest_ID
+- Merges with one UPDATE ... JOIN and one INSERT ... SELECT; a key that
+  appears more than once ends up as its last occurrence, as it would row
+  by row
+- Reports imported/updated counts per file
+
+Skip rules (missing grower, farm, field, crop or cart) are applied before
+staging by prepare_harvest_load, so they are exactly those of the per-row
+importer.
+
+Everything staged since the last flush is committed together: a failed
+flush rolls back every file in it.
+
+LOAD DATA LOCAL INFILE must be enabled on the server (local_infile=1);
+the importer's connection enables it on the client side.
+
+Local MySQL for testing
+-----------------------
+docker run -d --name gms-mysql -p 3307:3306 \
+    -e MYSQL_ROOT_PASSWORD=root -e MYSQL_DATABASE=gms_db \
+    -e MYSQL_USER=gms_user -e MYSQL_PASSWORD=StrongPassword123! \
+    mysql:8.0 --local-infile=1
+(then create the GMS schema and run import_grc.py --bulk against DB_PORT=3307)
+
+HARVEST_CHECK_DB=gms_check python harvest_bulk_check.py checks this writer
+against the batched upsert on that server: same rows, same counts.
+
+Run
+---
+python import_grc.py --dir data/grc --bulk
+python import_grc.py --archive backups/2025.zip --bulk --bulk-flush-loads 100000
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, List, Sequence, Tuple
+
+import pymysql
+
+from dimension_cache import CROP_DEFAULTS, DEFAULT_CROP_VALUES
+
+
+# Loads staged before the writer flushes on its own accord (see should_flush).
+DEFAULT_FLUSH_LOADS = 50000
+STAGE_TABLE = "grc_harvest_stage"
+STAGE_FINAL_TABLE = "grc_harvest_stage_final"
+# Rows per INSERT when LOAD DATA LOCAL INFILE is not available.
+STAGE_INSERT_ROWS = 1000
+
+# pymysql / server error codes meaning LOCAL INFILE is switched off
+LOCAL_INFILE_DISABLED_ERRORS = {1148, 2068, 3948}
+
+# Staged columns, in the order of _stage_values(); the natural keys first,
+# then the Harvest values.
+STAGE_COLUMNS = (
+    "Row_Seq",
+    "Grower_Name",
+    "Dpt_Name",
+    "Field_Name",
+    "Crop_Year",
+    "Crop_Name",
+    "Cart_Code",
+    "Destination",
+    "Load_Num",
+    "Harvest_Date",
+    "MC",
+    "Gross_Weight",
+    "Bushels",
+    "WetBushels",
+    "DryBushels",
+    "JobNumber",
+    "Truck_ID",
+    "Test_Weight",
+    "Variety",
+    "Load_Cell",
+    "Source_File_Name",
+    "Source_File_ID",
+    "External_Load_Key",
+)
+
+STAGE_DDL = f"""
+CREATE TEMPORARY TABLE {STAGE_TABLE} (
+    Row_Seq INT UNSIGNED NOT NULL PRIMARY KEY,
+    Grower_Name VARCHAR(255) NOT NULL,
+    Dpt_Name VARCHAR(255) NOT NULL,
+    Field_Name VARCHAR(255) NOT NULL,
+    Crop_Year INT NOT NULL,
+    Crop_Name VARCHAR(120) NOT NULL,
+    Cart_Code VARCHAR(100) NOT NULL,
+    Destination VARCHAR(255) NULL,
+    Load_Num VARCHAR(50) NOT NULL,
+    Harvest_Date DATE NULL,
+    MC DOUBLE NULL,
+    Gross_Weight DOUBLE NULL,
+    Bushels DOUBLE NULL,
+    WetBushels DOUBLE NULL,
+    DryBushels DOUBLE NULL,
+    JobNumber BIGINT NULL,
+    Truck_ID VARCHAR(100) NULL,
+    Test_Weight DOUBLE NULL,
+    Variety VARCHAR(120) NULL,
+    Load_Cell VARCHAR(100) NULL,
+    Source_File_Name VARCHAR(255) NULL,
+    Source_File_ID BIGINT UNSIGNED NULL,
+    External_Load_Key VARCHAR(255) NOT NULL,
+    Grower_ID BIGINT UNSIGNED NULL,
+    Dpt_ID BIGINT UNSIGNED NULL,
+    Field_ID BIGINT UNSIGNED NULL,
+    Crop_ID BIGINT UNSIGNED NULL,
+    Cart_ID BIGINT UNSIGNED NULL,
+    StorLoc_ID BIGINT UNSIGNED NULL,
+    Match_ID BIGINT UNSIGNED NULL,
+    KEY ix_stage_key (External_Load_Key)
+)
+"""
+
+# Harvest column <- staged expression, for the merge.
+MERGE_COLUMNS = (
+    ("Cart_ID", "s.Cart_ID"),
+    ("Field_ID", "s.Field_ID"),
+    ("Crop_ID", "s.Crop_ID"),
+    ("Dpt_ID", "s.Dpt_ID"),
+    ("StorLoc_ID", "s.StorLoc_ID"),
+    ("Load_Num", "s.Load_Num"),
+    ("Harvest_Date", "s.Harvest_Date"),
+    ("MC", "s.MC"),
+    ("Gross_Weight", "s.Gross_Weight"),
+    ("Tare_Weight", "NULL"),
+    ("Bushels", "s.Bushels"),
+    ("WetBushels", "s.WetBushels"),
+    ("DryBushels", "s.DryBushels"),
+    ("JobNumber", "s.JobNumber"),
+    ("Note", "NULL"),
+    ("Truck_ID", "s.Truck_ID"),
+    ("Destination", "s.Destination"),
+    ("Test_Weight", "s.Test_Weight"),
+    ("Variety", "s.Variety"),
+    ("Load_Cell", "s.Load_Cell"),
+    ("Source_File_Name", "s.Source_File_Name"),
+    ("Source_File_ID", "s.Source_File_ID"),
+    ("External_Load_Key", "s.External_Load_Key"),
+)
+
+
+@dataclass
+class _StagedFile:
+    key: Hashable
+    first_row: int
+    rows: int = 0
+
+
+@dataclass
+class BulkHarvestWriter:
+    """
+    Stages prepared loads and merges them into Harvest on flush().
+
+    read_table / write_table are the importer's Harvest tables (dedup reads
+    one, rows are written to the other; see import_grc.py).
+    """
+
+    conn: Any
+    read_table: str
+    write_table: str
+    flush_loads: int = DEFAULT_FLUSH_LOADS
+    use_local_infile: bool = True
+    _rows: List[Tuple[Any, ...]] = field(default_factory=list)
+    _files: List[_StagedFile] = field(default_factory=list)
+
+    @property
+    def pending_loads(self) -> int:
+        return len(self._rows)
+
+    def should_flush(self) -> bool:
+        return len(self._rows) >= self.flush_loads
+
+    def add_file(self, key: Hashable, loads: Sequence[Any]) -> None:
+        """Stage the prepared loads (import_grc.HarvestLoad) of one file; key identifies it in flush()."""
+        staged = _StagedFile(key=key, first_row=len(self._rows), rows=len(loads))
+        for load in loads:
+            self._rows.append(_stage_values(len(self._rows) + 1, load))
+        self._files.append(staged)
+
+    def flush(self) -> Dict[Hashable, Dict[str, int]]:
+        """
+        Merge everything staged into Harvest and commit.
+
+        Returns {file key: {"imported": n, "updated": n}}. On error the
+        transaction is rolled back, the staged rows are dropped and the
+        exception propagates.
+        """
+        files, rows = self._files, self._rows
+        self._files, self._rows = [], []
+        if not files:
+            return {}
+
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute(f"DROP TEMPORARY TABLE IF EXISTS {STAGE_TABLE}")
+                cur.execute(STAGE_DDL)
+                if rows:
+                    self._stage(cur, rows)
+                    self._resolve_dimensions(cur)
+                    self._match_existing(cur)
+                    outcomes = self._pick_final(cur)
+                    self._merge(cur)
+                else:
+                    outcomes = []
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+
+        results: Dict[Hashable, Dict[str, int]] = {}
+        for staged in files:
+            counts = results.setdefault(staged.key, {"imported": 0, "updated": 0})
+            for imported in outcomes[staged.first_row:staged.first_row + staged.rows]:
+                counts["imported" if imported else "updated"] += 1
+        return results
+
+    # ------------------------------------------------------------------
+    # Steps
+    # ------------------------------------------------------------------
+    def _stage(self, cur, rows: List[Tuple[Any, ...]]) -> None:
+        if self.use_local_infile:
+            try:
+                self._stage_local_infile(cur, rows)
+                return
+            except (pymysql.err.OperationalError, pymysql.err.InternalError, pymysql.err.ProgrammingError) as exc:
+                if not exc.args or exc.args[0] not in LOCAL_INFILE_DISABLED_ERRORS:
+                    raise
+                print("LOAD DATA LOCAL INFILE is not enabled; staging with multi-row INSERTs instead")
+                self.use_local_infile = False
+
+        placeholders = "(" + ", ".join(["%s"] * len(STAGE_COLUMNS)) + ")"
+        for start in range(0, len(rows), STAGE_INSERT_ROWS):
+            chunk = rows[start:start + STAGE_INSERT_ROWS]
+            cur.execute(
+                f"INSERT INTO {STAGE_TABLE} ({', '.join(STAGE_COLUMNS)}) VALUES {', '.join([placeholders] * len(chunk))}",
+                [value for row in chunk for value in row],
+            )
+
+    def _stage_local_infile(self, cur, rows: List[Tuple[Any, ...]]) -> None:
+        handle = tempfile.NamedTemporaryFile("w", encoding="utf-8", newline="\n", suffix=".tsv", delete=False)
+        try:
+            with handle:
+                for row in rows:
+                    handle.write("\t".join(_tsv_value(value) for value in row))
+                    handle.write("\n")
+            cur.execute(
+                f"LOAD DATA LOCAL INFILE %s INTO TABLE {STAGE_TABLE} CHARACTER SET utf8mb4 "
+                "FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' "
+                f"({', '.join(STAGE_COLUMNS)})",
+                (handle.name,),
+            )
+        finally:
+            os.unlink(handle.name)
+
+    def _resolve_dimensions(self, cur) -> None:
+        # Each level creates what is missing, then hands its IDs down; MIN()
+        # picks the oldest row when a natural key is duplicated.
+        cur.execute(
+            f"""
+            INSERT INTO Grower (Grower_Name)
+            SELECT DISTINCT s.Grower_Name FROM {STAGE_TABLE} s
+            WHERE NOT EXISTS (SELECT 1 FROM Grower g WHERE g.Grower_Name = s.Grower_Name)
+            """
+        )
+        cur.execute(
+            f"""
+            UPDATE {STAGE_TABLE} s
+            SET s.Grower_ID = (SELECT MIN(g.Grower_ID) FROM Grower g WHERE g.Grower_Name = s.Grower_Name)
+            """
+        )
+
+        cur.execute(
+            f"""
+            INSERT INTO Department (Dpt_Name, Contact, Manager, Grower_ID)
+            SELECT DISTINCT s.Dpt_Name, 'Unknown', 'Unknown', s.Grower_ID FROM {STAGE_TABLE} s
+            WHERE NOT EXISTS (
+                SELECT 1 FROM Department d WHERE d.Dpt_Name = s.Dpt_Name AND d.Grower_ID = s.Grower_ID
+            )
+            """
+        )
+        cur.execute(
+            f"""
+            UPDATE {STAGE_TABLE} s
+            SET s.Dpt_ID = (
+                SELECT MIN(d.Dpt_ID) FROM Department d WHERE d.Dpt_Name = s.Dpt_Name AND d.Grower_ID = s.Grower_ID
+            )
+            """
+        )
+
+        cur.execute(
+            f"""
+            INSERT INTO Field (Field_Name, Crop_Year, Dpt_ID)
+            SELECT DISTINCT s.Field_Name, s.Crop_Year, s.Dpt_ID FROM {STAGE_TABLE} s
+            WHERE NOT EXISTS (
+                SELECT 1 FROM Field f
+                WHERE f.Field_Name = s.Field_Name AND f.Crop_Year = s.Crop_Year AND f.Dpt_ID = s.Dpt_ID
+            )
+            """
+        )
+        cur.execute(
+            f"""
+            UPDATE {STAGE_TABLE} s
+            SET s.Field_ID = (
+                SELECT MIN(f.Field_ID) FROM Field f
+                WHERE f.Field_Name = s.Field_Name AND f.Crop_Year = s.Crop_Year AND f.Dpt_ID = s.Dpt_ID
+            )
+            """
+        )
+
+        # BINARY: CROP_DEFAULTS is matched exactly, as dimension_cache does.
+        crop_cases = " ".join("WHEN %s THEN %s" for _name in CROP_DEFAULTS)
+        crop_params: List[Any] = []
+        for position in range(3):
+            for name, defaults in CROP_DEFAULTS.items():
+                crop_params.extend((name, defaults[position]))
+            crop_params.append(DEFAULT_CROP_VALUES[position])
+        cur.execute(
+            f"""
+            INSERT INTO Crop (Crop_Code, Crop_Name, Weight_PerBushel, Base_MC)
+            SELECT
+                CASE BINARY c.Crop_Name {crop_cases} ELSE %s END,
+                c.Crop_Name,
+                CASE BINARY c.Crop_Name {crop_cases} ELSE %s END,
+                CASE BINARY c.Crop_Name {crop_cases} ELSE %s END
+            FROM (SELECT DISTINCT s.Crop_Name FROM {STAGE_TABLE} s) c
+            WHERE NOT EXISTS (SELECT 1 FROM Crop k WHERE k.Crop_Name = c.Crop_Name)
+            """,
+            crop_params,
+        )
+        cur.execute(
+            f"""
+            UPDATE {STAGE_TABLE} s
+            SET s.Crop_ID = (SELECT MIN(k.Crop_ID) FROM Crop k WHERE k.Crop_Name = s.Crop_Name)
+            """
+        )
+
+        cur.execute(
+            f"""
+            INSERT INTO Cart (Cart_Code, Cart_Name)
+            SELECT c.Cart_Code, CONCAT('Cart ', c.Cart_Code)
+            FROM (SELECT DISTINCT s.Cart_Code FROM {STAGE_TABLE} s) c
+            WHERE NOT EXISTS (SELECT 1 FROM Cart k WHERE k.Cart_Code = c.Cart_Code)
+            """
+        )
+        cur.execute(
+            f"""
+            UPDATE {STAGE_TABLE} s
+            SET s.Cart_ID = (SELECT MIN(k.Cart_ID) FROM Cart k WHERE k.Cart_Code = s.Cart_Code)
+            """
+        )
+
+        cur.execute(
+            f"""
+            UPDATE {STAGE_TABLE} s
+            SET s.StorLoc_ID = (SELECT MIN(l.StorLoc_ID) FROM Storage_Location l WHERE l.Bin_Code = s.Destination)
+            WHERE s.Destination IS NOT NULL
+            """
+        )
+
+    def _match_existing(self, cur) -> None:
+        cur.execute(
+            f"""
+            UPDATE {STAGE_TABLE} s
+            SET s.Match_ID = (
+                SELECT h.Harvest_ID FROM {self.read_table} h
+                WHERE h.External_Load_Key = s.External_Load_Key
+                ORDER BY CASE WHEN h.MC IS NOT NULL THEN 0 ELSE 1 END, h.Harvest_ID
+                LIMIT 1
+            )
+            """
+        )
+        cur.execute(
+            f"""
+            UPDATE {STAGE_TABLE} s
+            SET s.Match_ID = (
+                SELECT h.Harvest_ID FROM {self.read_table} h
+                WHERE h.Harvest_Date <=> s.Harvest_Date
+                  AND h.Cart_ID = s.Cart_ID
+                  AND h.Field_ID = s.Field_ID
+                  AND h.Crop_ID = s.Crop_ID
+                  AND h.Load_Num = s.Load_Num
+                ORDER BY CASE WHEN h.MC IS NOT NULL THEN 0 ELSE 1 END, h.Harvest_ID
+                LIMIT 1
+            )
+            WHERE s.Match_ID IS NULL
+            """
+        )
+
+    def _pick_final(self, cur) -> List[bool]:
+        """
+        Keep the last staged row per target (existing row, or new key),
+        with the position of the target's first row, and return per staged
+        row whether it counts as imported: the first occurrence of a key
+        that matched nothing.
+        """
+        cur.execute(f"DROP TEMPORARY TABLE IF EXISTS {STAGE_FINAL_TABLE}")
+        cur.execute(
+            f"CREATE TEMPORARY TABLE {STAGE_FINAL_TABLE} "
+            "(Row_Seq INT UNSIGNED NOT NULL PRIMARY KEY, First_Seq INT UNSIGNED NOT NULL)"
+        )
+        cur.execute(
+            f"""
+            INSERT INTO {STAGE_FINAL_TABLE} (Row_Seq, First_Seq)
+            SELECT MAX(s.Row_Seq), MIN(s.Row_Seq) FROM {STAGE_TABLE} s
+            GROUP BY IF(s.Match_ID IS NULL, CONCAT('k:', s.External_Load_Key), CONCAT('h:', s.Match_ID))
+            """
+        )
+
+        cur.execute(f"SELECT Row_Seq, External_Load_Key, Match_ID FROM {STAGE_TABLE} ORDER BY Row_Seq")
+        seen = set()
+        outcomes = []
+        for row in cur.fetchall():
+            target = ("h", row["Match_ID"]) if row["Match_ID"] is not None else ("k", row["External_Load_Key"].casefold())
+            outcomes.append(row["Match_ID"] is None and target not in seen)
+            seen.add(target)
+        return outcomes
+
+    def _merge(self, cur) -> None:
+        assignments = ", ".join(f"h.{column} = {expression}" for column, expression in MERGE_COLUMNS)
+        cur.execute(
+            f"""
+            UPDATE {self.write_table} h
+            JOIN {STAGE_TABLE} s ON s.Match_ID = h.Harvest_ID
+            JOIN {STAGE_FINAL_TABLE} f ON f.Row_Seq = s.Row_Seq
+            SET {assignments}, h.Updated_At = CURRENT_TIMESTAMP
+            """
+        )
+
+        columns = ", ".join(column for column, _expression in MERGE_COLUMNS)
+        expressions = ", ".join(expression for _column, expression in MERGE_COLUMNS)
+        # New rows go in in first-seen order, so Harvest_IDs follow the
+        # files as they would row by row. Target columns are qualified:
+        # unqualified names would be ambiguous with the staging table's.
+        updates = ", ".join(
+            f"{self.write_table}.{column} = VALUES({column})" for column, _expression in MERGE_COLUMNS
+        )
+        cur.execute(
+            f"""
+            INSERT INTO {self.write_table} ({columns})
+            SELECT {expressions}
+            FROM {STAGE_TABLE} s
+            JOIN {STAGE_FINAL_TABLE} f ON f.Row_Seq = s.Row_Seq
+            WHERE s.Match_ID IS NULL
+            ORDER BY f.First_Seq
+            ON DUPLICATE KEY UPDATE {updates}, {self.write_table}.Updated_At = CURRENT_TIMESTAMP
+            """
+        )
+
+
+def _stage_values(row_seq: int, load: Any) -> Tuple[Any, ...]:
+    return (
+        row_seq,
+        load.grower_name,
+        load.farm_name,
+        load.field_name,
+        load.crop_year,
+        load.crop_name,
+        load.cart_code,
+        load.destination_code,
+        load.load_num,
+        load.harvest_date,
+        load.mc,
+        load.gross_weight,
+        load.bushels,
+        load.wet_bushels,
+        load.dry_bushels,
+        load.job_number,
+        load.truck_id,
+        load.test_weight,
+        load.variety,
+        load.load_cell,
+        load.source_file_name,
+        load.source_file_id,
+        load.external_load_key,
+    )
+
+
+def _tsv_value(value: Any) -> str:
+    # LOAD DATA defaults: \N is NULL, backslash escapes tab/newline/itself.
+    if value is None:
+        return "\\N"
+    if isinstance(value, float):
+        return repr(value)
+    text = value.isoformat() if hasattr(value, "isoformat") else str(value)
+    return text.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
@@ -0,0 +1,397 @@
+"""
+harvest_bulk_check.py
+
+Parity check of the bulk Harvest writer (harvest_bulk.py) against the
+batched upsert the importer uses file by file (import_grc.write_parsed_file).
+
+What this file does
+-------------------
+- Creates scratch copies of the tables the importer touches (Grower,
+  Department, Field, Crop, Cart, Storage_Location, harvest_backup1 and a
+  Harvest view of it) in a separate database on the MySQL server from .env
+- Seeds harvest_backup1 with the existing rows the loads must find:
+    - a row with a load's External_Load_Key (in other letter case)
+    - two keyless legacy rows for one load, the older without MC: the one
+      with MC must win
+    - two keyless legacy rows for another load, both with MC: the lowest
+      Harvest_ID must win
+- Imports the same synthetic files (grc_synth.py) from that seeded start
+  through both paths: a file with one load twice, another file, and the
+  first file again with changed values, so keys repeat within a file and
+  within one flush
+- The bulk path runs twice: everything in one flush, and one flush per file
+- Compares the harvest_backup1 rows, the dimension rows and every file's
+  imported/updated counts with the batched path; exits 1 on a difference
+
+Skip rules are applied by prepare_harvest_load before either path writes,
+so the files are the same loads on both sides.
+
+Dimension IDs are compared as their natural keys, and rows the run
+inserted without their Harvest_ID: both paths may create rows in a
+different order, and InnoDB can leave AUTO_INCREMENT gaps on duplicate
+keys. Harvest is a view of harvest_backup1, so both paths read the rows
+they wrote earlier in the run.
+
+Without HARVEST_CHECK_DB the check is skipped. It drops and re-creates
+its tables in that database (created if missing), so it refuses to run
+against DB_NAME.
+
+Optional .env variables
+-----------------------
+HARVEST_CHECK_DB=gms_check   # scratch database on the server of DB_HOST/DB_PORT
+
+Run
+---
+python harvest_bulk_check.py
+python harvest_bulk_check.py --loads 200 --batch-size 7
+(local MySQL: see harvest_bulk.py)
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from dataclasses import replace
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pymysql
+from dotenv import load_dotenv
+
+from dimension_cache import DimensionResolver
+from grc_synth import build_corpus
+from harvest_bulk import BulkHarvestWriter
+from import_grc import (
+    DB_CONFIG,
+    HARVEST_COLUMNS,
+    HARVEST_READ_TABLE,
+    HARVEST_WRITE_TABLE,
+    HarvestLoad,
+    harvest_values,
+    prepare_parsed_loads,
+    write_parsed_file,
+)
+from slingshot_client import SlingshotClientBase
+
+
+SCHEMA = [
+    f"DROP VIEW IF EXISTS {HARVEST_READ_TABLE}",
+    f"DROP TABLE IF EXISTS {HARVEST_WRITE_TABLE}, Storage_Location, Cart, Crop, Field, Department, Grower",
+    """
+    CREATE TABLE Grower (
+        Grower_ID BIGINT UNSIGNED NOT NULL AUTO_INCREMENT PRIMARY KEY,
+        Grower_Name VARCHAR(255) NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE Department (
+        Dpt_ID BIGINT UNSIGNED NOT NULL AUTO_INCREMENT PRIMARY KEY,
+        Dpt_Name VARCHAR(255) NOT NULL,
+        Contact VARCHAR(255) NULL,
+        Manager VARCHAR(255) NULL,
+        Grower_ID BIGINT UNSIGNED NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE Field (
+        Field_ID BIGINT UNSIGNED NOT NULL AUTO_INCREMENT PRIMARY KEY,
+        Field_Name VARCHAR(255) NOT NULL,
+        Crop_Year INT NOT NULL,
+        Dpt_ID BIGINT UNSIGNED NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE Crop (
+        Crop_ID BIGINT UNSIGNED NOT NULL AUTO_INCREMENT PRIMARY KEY,
+        Crop_Code VARCHAR(20) NULL,
+        Crop_Name VARCHAR(120) NOT NULL,
+        Weight_PerBushel DECIMAL(8,2) NULL,
+        Base_MC DECIMAL(6,2) NULL
+    )
+    """,
+    """
+    CREATE TABLE Cart (
+        Cart_ID BIGINT UNSIGNED NOT NULL AUTO_INCREMENT PRIMARY KEY,
+        Cart_Code VARCHAR(100) NOT NULL,
+        Cart_Name VARCHAR(255) NULL
+    )
+    """,
+    """
+    CREATE TABLE Storage_Location (
+        StorLoc_ID BIGINT UNSIGNED NOT NULL AUTO_INCREMENT PRIMARY KEY,
+        Bin_Code VARCHAR(100) NOT NULL
+    )
+    """,
+    f"""
+    CREATE TABLE {HARVEST_WRITE_TABLE} (
+        Harvest_ID BIGINT UNSIGNED NOT NULL AUTO_INCREMENT PRIMARY KEY,
+        Cart_ID BIGINT UNSIGNED NOT NULL,
+        Field_ID BIGINT UNSIGNED NOT NULL,
+        Crop_ID BIGINT UNSIGNED NOT NULL,
+        Dpt_ID BIGINT UNSIGNED NOT NULL,
+        StorLoc_ID BIGINT UNSIGNED NULL,
+        Load_Num VARCHAR(80) NULL,
+        Harvest_Date DATE NULL,
+        MC DECIMAL(6,2) NULL,
+        Test_Weight DECIMAL(8,2) NULL,
+        Gross_Weight DECIMAL(12,2) NULL,
+        Tare_Weight DECIMAL(12,2) NULL,
+        Bushels DECIMAL(12,2) NULL,
+        WetBushels DECIMAL(12,2) NULL,
+        DryBushels DECIMAL(12,2) NULL,
+        Variety VARCHAR(120) NULL,
+        Load_Cell VARCHAR(100) NULL,
+        Source_File_Name VARCHAR(255) NULL,
+        Source_File_ID BIGINT UNSIGNED NULL,
+        External_Load_Key VARCHAR(255) NULL,
+        JobNumber INT NULL,
+        Note VARCHAR(255) NULL,
+        Created_At TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        Updated_At TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+        Truck_ID VARCHAR(100) NULL,
+        Destination VARCHAR(255) NULL,
+        UNIQUE KEY uq_harvest_external_load (External_Load_Key),
+        KEY ix_harvest_dedup (Field_ID, Cart_ID, Crop_ID)
+    )
+    """,
+    f"CREATE VIEW {HARVEST_READ_TABLE} AS SELECT * FROM {HARVEST_WRITE_TABLE}",
+    "INSERT INTO Storage_Location (Bin_Code) VALUES ('Bin-13'), ('Bin-14'), ('Bin-15')",
+]
+
+# Harvest columns compared as they are; the dimension IDs are compared as
+# their natural keys instead.
+DIMENSION_ID_COLUMNS = ("Cart_ID", "Field_ID", "Crop_ID", "Dpt_ID", "StorLoc_ID")
+VALUE_COLUMNS = tuple(column for column in HARVEST_COLUMNS if column not in DIMENSION_ID_COLUMNS)
+
+SNAPSHOT_SQL = f"""
+SELECT h.Harvest_ID, g.Grower_Name, d.Dpt_Name, f.Field_Name, f.Crop_Year, k.Crop_Name, c.Cart_Code,
+       l.Bin_Code, {', '.join(f'h.{column}' for column in VALUE_COLUMNS)}
+FROM {HARVEST_WRITE_TABLE} h
+JOIN Department d ON d.Dpt_ID = h.Dpt_ID
+JOIN Grower g ON g.Grower_ID = d.Grower_ID
+JOIN Field f ON f.Field_ID = h.Field_ID
+JOIN Crop k ON k.Crop_ID = h.Crop_ID
+JOIN Cart c ON c.Cart_ID = h.Cart_ID
+LEFT JOIN Storage_Location l ON l.StorLoc_ID = h.StorLoc_ID
+"""
+
+DIMENSION_SNAPSHOT_SQL = [
+    "SELECT Grower_Name FROM Grower",
+    "SELECT d.Dpt_Name, g.Grower_Name FROM Department d JOIN Grower g ON g.Grower_ID = d.Grower_ID",
+    "SELECT f.Field_Name, f.Crop_Year, d.Dpt_Name FROM Field f JOIN Department d ON d.Dpt_ID = f.Dpt_ID",
+    "SELECT Crop_Code, Crop_Name, Weight_PerBushel, Base_MC FROM Crop",
+    "SELECT Cart_Code, Cart_Name FROM Cart",
+]
+
+# (file key, graincart ID, file name, header, raw load rows)
+CheckFile = Tuple[str, int, str, Dict[str, Any], List[Dict[str, Any]]]
+
+# Seeded rows: label -> whether the batched path must update it. Seeds
+# carry single-digit bushels, so an updated row is easy to tell apart.
+SEED_CASES = {
+    "key match": True,
+    "legacy, no MC": False,
+    "legacy, MC": True,
+    "legacy tie, lowest ID": True,
+    "legacy tie, higher ID": False,
+}
+
+
+def build_files(loads_per_file: int) -> List[CheckFile]:
+    parser = SlingshotClientBase()
+    first, second = build_corpus(2, loads_per_file)
+    parsed = {
+        synthetic.graincart_id: parser.parse_grc_bytes(
+            synthetic.content, graincart_id=synthetic.graincart_id, file_name=synthetic.name
+        )
+        for synthetic in (first, second)
+    }
+    first_header, first_loads = parsed[first.graincart_id]["header"], parsed[first.graincart_id]["loads"]
+    second_header, second_loads = parsed[second.graincart_id]["header"], parsed[second.graincart_id]["loads"]
+
+    # One load twice in a file, the later copy with other bushels.
+    repeated = first_loads + [dict(first_loads[5], dry=float(first_loads[5]["dry"]) + 5.0)]
+    # The whole first file again with changed values.
+    changed = [dict(row, dry=float(row["dry"]) + 1.0, comment="19.5") for row in first_loads]
+    return [
+        ("first", first.graincart_id, first.name, first_header, repeated),
+        ("second", second.graincart_id, second.name, second_header, second_loads),
+        ("first again", first.graincart_id, first.name, first_header, changed),
+    ]
+
+
+def reset_schema(conn) -> None:
+    with conn.cursor() as cur:
+        for statement in SCHEMA:
+            cur.execute(statement)
+    conn.commit()
+
+
+def seed_existing_rows(conn, files: Sequence[CheckFile]) -> Dict[str, int]:
+    """Insert the rows the loads must match (see SEED_CASES); returns their Harvest_IDs."""
+    _key, file_id, file_name, header, rows = files[0]
+    loads = list(prepare_parsed_loads(header, rows[:4], file_id, file_name, _new_counts()))
+    by_key, mc_first, lowest_id = loads[1], loads[2], loads[3]
+
+    seeds: List[Tuple[str, HarvestLoad]] = [
+        ("key match", replace(by_key, external_load_key=by_key.external_load_key.lower(), mc=None, bushels=1.0)),
+        ("legacy, no MC", replace(mc_first, external_load_key=None, mc=None, bushels=2.0)),
+        ("legacy, MC", replace(mc_first, external_load_key=None, mc=17.5, bushels=3.0)),
+        ("legacy tie, lowest ID", replace(lowest_id, external_load_key=None, mc=16.0, bushels=4.0)),
+        ("legacy tie, higher ID", replace(lowest_id, external_load_key=None, mc=16.5, bushels=5.0)),
+    ]
+    resolver = DimensionResolver()
+    seeded: Dict[str, int] = {}
+    with conn.cursor() as cur:
+        for label, load in seeds:
+            ids = resolver.resolve(conn, [load])[0]
+            cur.execute(
+                f"INSERT INTO {HARVEST_WRITE_TABLE} ({', '.join(HARVEST_COLUMNS)}) "
+                f"VALUES ({', '.join(['%s'] * len(HARVEST_COLUMNS))})",
+                harvest_values(load, ids),
+            )
+            seeded[label] = cur.lastrowid
+    conn.commit()
+    return seeded
+
+
+def run_batched(conn, files: Sequence[CheckFile], batch_size: int) -> Dict[str, Dict[str, int]]:
+    resolver = DimensionResolver.preload(conn)
+    results = {}
+    for key, file_id, file_name, header, rows in files:
+        counts = write_parsed_file(conn, header, rows, file_id, file_name, resolver=resolver, batch_size=batch_size)
+        conn.commit()
+        resolver.commit()
+        results[key] = {"imported": counts["imported"], "updated": counts["updated"]}
+    return results
+
+
+def run_bulk(conn, files: Sequence[CheckFile], flush_per_file: bool) -> Dict[str, Dict[str, int]]:
+    writer = BulkHarvestWriter(conn, HARVEST_READ_TABLE, HARVEST_WRITE_TABLE)
+    results: Dict[str, Dict[str, int]] = {}
+    for key, file_id, file_name, header, rows in files:
+        writer.add_file(key, list(prepare_parsed_loads(header, rows, file_id, file_name, _new_counts())))
+        if flush_per_file:
+            results.update(writer.flush())
+    results.update(writer.flush())
+    return results
+
+
+def snapshot(conn, seeded_max_id: int) -> Tuple[List[Tuple[Any, ...]], List[List[Tuple[Any, ...]]]]:
+    with conn.cursor() as cur:
+        cur.execute(SNAPSHOT_SQL)
+        rows = sorted(
+            (
+                tuple(
+                    (value if value is None or value <= seeded_max_id else None) if column == "Harvest_ID" else _plain(value)
+                    for column, value in row.items()
+                )
+                for row in cur.fetchall()
+            ),
+            key=repr,
+        )
+        dimensions = []
+        for sql in DIMENSION_SNAPSHOT_SQL:
+            cur.execute(sql)
+            dimensions.append(sorted((tuple(_plain(value) for value in row.values()) for row in cur.fetchall()), key=repr))
+    return rows, dimensions
+
+
+def check_seeded_matches(conn, seeded: Dict[str, int]) -> List[str]:
+    """The batched run must have updated the expected seeded rows, or the cases test nothing."""
+    problems = []
+    with conn.cursor() as cur:
+        for label, should_update in SEED_CASES.items():
+            cur.execute(f"SELECT Bushels FROM {HARVEST_WRITE_TABLE} WHERE Harvest_ID = %s", (seeded[label],))
+            row = cur.fetchone()
+            was_updated = row is not None and float(row["Bushels"]) >= 10
+            if was_updated != should_update:
+                problems.append(f"seeded row '{label}' was {'not ' if should_update else ''}updated by the batched path")
+    return problems
+
+
+def compare(label: str, expected: Any, actual: Any) -> List[str]:
+    if expected == actual:
+        return []
+    if isinstance(expected, list) and isinstance(actual, list):
+        missing = [row for row in expected if row not in actual][:3]
+        extra = [row for row in actual if row not in expected][:3]
+        return [f"{label} differ: missing {missing}, unexpected {extra}"]
+    return [f"{label} differ: expected {expected}, got {actual}"]
+
+
+def check_database() -> Optional[str]:
+    load_dotenv()
+    database = (os.getenv("HARVEST_CHECK_DB") or "").strip()
+    if not database:
+        return None
+    if database == DB_CONFIG["database"]:
+        raise SystemExit("HARVEST_CHECK_DB must not be DB_NAME: the check drops and re-creates its tables")
+    return database
+
+
+def connect(database: str):
+    server = {**DB_CONFIG, "database": None}
+    conn = pymysql.connect(**server)
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"CREATE DATABASE IF NOT EXISTS `{database}`")
+    finally:
+        conn.close()
+    return pymysql.connect(**{**DB_CONFIG, "database": database}, local_infile=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check that bulk Harvest loads match the batched upsert.")
+    parser.add_argument("--loads", type=int, default=40, help="loads per synthetic file (at least 6)")
+    parser.add_argument("--batch-size", type=int, default=7, help="batch size of the batched path")
+    args = parser.parse_args()
+
+    database = check_database()
+    if database is None:
+        print("HARVEST_CHECK_DB is not set; skipping the bulk writer parity check.")
+        return
+
+    files = build_files(max(6, args.loads))
+    conn = connect(database)
+    problems: List[str] = []
+    try:
+        reset_schema(conn)
+        seeded = seed_existing_rows(conn, files)
+        seeded_max_id = max(seeded.values())
+        expected_counts = run_batched(conn, files, args.batch_size)
+        problems += check_seeded_matches(conn, seeded)
+        expected_rows, expected_dimensions = snapshot(conn, seeded_max_id)
+        print(f"batched: {expected_counts}")
+
+        for flush_per_file in (False, True):
+            label = "bulk, one flush per file" if flush_per_file else "bulk, one flush"
+            reset_schema(conn)
+            seed_existing_rows(conn, files)
+            counts = run_bulk(conn, files, flush_per_file)
+            rows, dimensions = snapshot(conn, seeded_max_id)
+            print(f"{label}: {counts}")
+            problems += compare(f"{label}: counts", expected_counts, counts)
+            problems += compare(f"{label}: {HARVEST_WRITE_TABLE} rows", expected_rows, rows)
+            problems += compare(f"{label}: dimension rows", expected_dimensions, dimensions)
+    finally:
+        conn.close()
+
+    if problems:
+        for problem in problems:
+            print(f"FAIL {problem}")
+        sys.exit(1)
+    print(f"OK: {len(expected_rows)} {HARVEST_WRITE_TABLE} rows and every file's counts match.")
+
+
+def _new_counts() -> Dict[str, int]:
+    return {"loads": 0, "imported": 0, "updated": 0, "skipped": 0}
+
+
+def _plain(value: Any) -> Any:
+    # DECIMAL and DATE values compare as text, the same way on both sides.
+    return value if value is None or isinstance(value, (int, str)) else str(value)
+
+
+if __name__ == "__main__":
+    main()
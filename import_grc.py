@@ -31,6 +31,12 @@ RAVEN_SHARED_SECRET=...
 RAVEN_ACCESS_KEY=...
 RAVEN_BASE_URL=https://api.ravenslingshot.com
 
+Optional:
+IMPORT_BATCH_SIZE=500      # loads per multi-row upsert (--batch-size)
+IMPORT_PARSE_WORKERS=4     # parser processes (--parse-workers), see import_pipeline.py
+IMPORT_QUEUE_SIZE=8        # downloaded files waiting for a parser (--queue-size)
+IMPORT_JOURNAL=data/import_journal.sqlite   # run journal for --resume and unchanged-file skips
+
 Before running
 --------------
 Make sure Harvest has these added columns:
@@ -51,25 +57,64 @@ ALTER TABLE Harvest
 ALTER TABLE Harvest
   ADD UNIQUE KEY uq_harvest_external_load (External_Load_Key);
 
+ALTER TABLE Harvest
+  ADD KEY ix_harvest_dedup (Field_ID, Cart_ID, Crop_ID, Load_Num, Harvest_Date);
+
+--bulk also needs LOAD DATA LOCAL INFILE enabled on the server:
+
+SET GLOBAL local_infile = 1;
+
+(without it the staging table is filled with multi-row INSERTs instead)
+
 Run
 ---
 python import_grc.py
+python import_grc.py --incremental      # only new/modified files (and only their new loads) since the last run
+python import_grc.py --stream           # parse while downloading; flat memory for huge files
+python import_grc.py --workers 16 --parse-workers 6   # download threads / parser processes
+python import_grc.py --season 2025 --crop Corn
+python import_grc.py --field 1793 --no-refresh   # select from the local manifest only
+python import_grc.py --dir data/grc     # offline: parse exported files, no API credentials
+python import_grc.py --dir "backups/2025/*.grc" --workers 16
+python import_grc.py --archive backups/2025.zip      # zip/tar bundle, read without extracting
+python import_grc.py --archive site_b.tar.gz --force   # also members imported before
+python import_grc.py --dir data/grc --batch-size 2000
+python import_grc.py --dir "backups/2025/*.grc" --bulk   # season backfill: staging table + LOAD DATA (harvest_bulk.py)
 python import_grc.py 93438245
 python import_grc.py 93438245 93438246 93438247
 python import_grc.py 93438245-93438260
+python import_grc.py --resume           # finish the last interrupted run (see import_journal.py)
+python import_grc.py --resume 12 --force
 """
 
 from __future__ import annotations
 
+import argparse
+import glob
+import hashlib
+import itertools
 import os
-import sys
-from datetime import datetime
-from typing import Any, Dict, Iterable, List, Optional
+import re
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import date as date_type, datetime
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import pymysql
 from dotenv import load_dotenv
 
-from slingshot_client import SlingshotClient
+from dimension_cache import CROP_DEFAULTS, DEFAULT_CROP_VALUES, DimensionIds, DimensionKeys, DimensionResolver
+from grc_archive import count_grc_members, iter_grc_archive
+from grc_manifest import GrcManifest, ManifestFilter
+from grc_parsed_cache import GrcParsedCache
+from harvest_bulk import DEFAULT_FLUSH_LOADS, BulkHarvestWriter
+from import_journal import FILE_DONE, FILE_ERROR, FILE_UNCHANGED, RUN_INTERRUPTED, ImportJournal
+from import_pipeline import PipelineJob, PipelineStats, iter_pipeline
+from slingshot_client import GrcLoad, GrcLoadCursor, SlingshotClient, SlingshotClientBase
+from sync_state import SyncState
 
 
 load_dotenv()
@@ -99,23 +144,36 @@ def safe_decimal(value: Any) -> Optional[float]:
         return None
 
 
+DATE_FORMATS = (
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%d",
+    "%m/%d/%Y %H:%M:%S",
+    "%m/%d/%Y %H:%M",
+    "%m/%d/%Y",
+)
+# Files use one format throughout, so the last format that matched is tried first.
+_last_date_format = DATE_FORMATS[0]
+
+
 def safe_date(value: Any) -> Optional[datetime.date]:
+    global _last_date_format
+
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date_type):
+        return value
     if value in (None, "", "null"):
         return None
 
     text = str(value).strip()
-    for fmt in (
-        "%Y-%m-%d %H:%M:%S",
-        "%Y-%m-%d %H:%M",
-        "%Y-%m-%d",
-        "%m/%d/%Y %H:%M:%S",
-        "%m/%d/%Y %H:%M",
-        "%m/%d/%Y",
-    ):
+    for fmt in (_last_date_format, *DATE_FORMATS):
         try:
-            return datetime.strptime(text, fmt).date()
+            parsed = datetime.strptime(text, fmt).date()
         except ValueError:
             continue
+        _last_date_format = fmt
+        return parsed
     return None
 
 
@@ -234,14 +292,8 @@ def get_or_create_crop(conn, crop_name: str) -> int:
         if row:
             return row["Crop_ID"]
 
-        defaults = {
-            "Corn": ("C", 56.00, 15.50),
-            "Soybeans": ("SB", 60.00, 13.00),
-            "Milo": ("M", 56.00, 14.00),
-            "Unknown": ("UNK", 60.00, 13.00),
-        }
-        crop_code, weight_per_bushel, base_mc = defaults.get(
-            crop_name, ("UNK", 60.00, 13.00)
+        crop_code, weight_per_bushel, base_mc = CROP_DEFAULTS.get(
+            crop_name, DEFAULT_CROP_VALUES
         )
 
         cur.execute(
@@ -318,14 +370,35 @@ def build_external_load_key(
     ])
 
 
-def insert_harvest_load(
-    conn,
+@dataclass
+class HarvestLoad(DimensionKeys):
+    """One load ready to write: its dimension keys plus the Harvest values."""
+
+    load_num: str = ""
+    harvest_date: Optional[date_type] = None
+    mc: Optional[float] = None
+    gross_weight: Optional[float] = None
+    bushels: Optional[float] = None
+    wet_bushels: Optional[float] = None
+    dry_bushels: Optional[float] = None
+    job_number: Optional[int] = None
+    truck_id: Optional[str] = None
+    test_weight: Optional[float] = None
+    variety: Optional[str] = None
+    load_cell: Optional[str] = None
+    source_file_name: Optional[str] = None
+    source_file_id: Optional[int] = None
+    external_load_key: str = ""
+
+
+def prepare_harvest_load(
     header: Dict[str, Any],
-    load_row: Dict[str, Any],
+    load_row: Dict[str, Any] | GrcLoad,
     source_file_id: int,
     source_file_name: str,
     row_num: int,
-) -> str:
+) -> HarvestLoad | str:
+    """Normalize one parsed load; returns a "SKIPPED: ..." status instead when it cannot be imported."""
     grower_name = (header.get("grower") or "").strip()
     farm_name = (header.get("farm") or "").strip()
     field_name = normalize_field_name(header.get("field"))
@@ -346,7 +419,8 @@ def insert_harvest_load(
 
     destination_code = normalize_destination(load_row.get("dest"))
 
-    harvest_date = safe_date(load_row.get("date"))
+    # load_date is pre-parsed by the client's per-file plan; "date" is the raw text fallback.
+    harvest_date = safe_date(load_row.get("load_date") or load_row.get("date"))
     mc = safe_decimal(load_row.get("comment"))
     gross_weight = safe_decimal(load_row.get("weight"))
     test_weight = safe_decimal(load_row.get("test_weight"))
@@ -382,13 +456,6 @@ def insert_harvest_load(
     if not cart_code:
         return "SKIPPED: missing cart code"
 
-    grower_id = get_or_create_grower(conn, grower_name)
-    dpt_id = get_or_create_department(conn, farm_name, grower_id)
-    field_id = get_or_create_field(conn, field_name, crop_year, dpt_id)
-    crop_id = get_or_create_crop(conn, crop_name)
-    cart_id = get_or_create_cart(conn, cart_code)
-    storloc_id = find_storage_location(conn, destination_code)
-
     external_load_key = build_external_load_key(
         harvest_date=harvest_date,
         cart_code=cart_code,
@@ -397,283 +464,1117 @@ def insert_harvest_load(
         load_num=load_num,
     )
 
-    with conn.cursor() as cur:
-        cur.execute(
-            """
-            SELECT Harvest_ID
-            FROM Harvest
-            WHERE External_Load_Key = %s
-               OR (
-                    Harvest_Date <=> %s
-                AND Cart_ID = %s
-                AND Field_ID = %s
-                AND Crop_ID = %s
-                AND Load_Num = %s
-               )
-            ORDER BY
-                CASE WHEN External_Load_Key = %s THEN 0 ELSE 1 END,
-                CASE WHEN MC IS NOT NULL THEN 0 ELSE 1 END,
-                Harvest_ID
-            LIMIT 1
-            """,
-            (
-                external_load_key,
-                harvest_date,
-                cart_id,
-                field_id,
-                crop_id,
-                load_num,
-                external_load_key,
-            )
-        )
-        existing = cur.fetchone()
-
-        values = (
-            cart_id,
-            field_id,
-            crop_id,
-            dpt_id,
-            storloc_id,
-            load_num,
-            harvest_date,
-            mc,
-            gross_weight,
-            None,
-            bushels,
-            wet_bushels,
-            dry_bushels,
-            job_number,
-            None,
-            truck_id,
-            destination_code,
-            test_weight,
-            variety,
-            load_cell,
-            source_file_name,
-            source_file_id,
-            external_load_key,
-        )
+    return HarvestLoad(
+        grower_name=grower_name,
+        farm_name=farm_name,
+        field_name=field_name,
+        crop_year=crop_year,
+        crop_name=crop_name,
+        cart_code=cart_code,
+        destination_code=destination_code,
+        load_num=load_num,
+        harvest_date=harvest_date,
+        mc=mc,
+        gross_weight=gross_weight,
+        bushels=bushels,
+        wet_bushels=wet_bushels,
+        dry_bushels=dry_bushels,
+        job_number=job_number,
+        truck_id=truck_id,
+        test_weight=test_weight,
+        variety=variety,
+        load_cell=load_cell,
+        source_file_name=source_file_name,
+        source_file_id=source_file_id,
+        external_load_key=external_load_key,
+    )
+
+
+def insert_harvest_load(
+    conn,
+    header: Dict[str, Any],
+    load_row: Dict[str, Any] | GrcLoad,
+    source_file_id: int,
+    source_file_name: str,
+    row_num: int,
+    resolver: Optional[DimensionResolver] = None,
+) -> str:
+    load = prepare_harvest_load(header, load_row, source_file_id, source_file_name, row_num)
+    if isinstance(load, str):
+        return load
+    ids = (resolver or DimensionResolver()).resolve(conn, [load])[0]
+    return upsert_harvest_load(conn, load, ids)
+
+
+# Dedup lookups read Harvest; rows are written to harvest_backup1.
+HARVEST_READ_TABLE = "Harvest"
+HARVEST_WRITE_TABLE = "harvest_backup1"
+
+# Written columns, in the order of harvest_values().
+HARVEST_COLUMNS = (
+    "Cart_ID",
+    "Field_ID",
+    "Crop_ID",
+    "Dpt_ID",
+    "StorLoc_ID",
+    "Load_Num",
+    "Harvest_Date",
+    "MC",
+    "Gross_Weight",
+    "Tare_Weight",
+    "Bushels",
+    "WetBushels",
+    "DryBushels",
+    "JobNumber",
+    "Note",
+    "Truck_ID",
+    "Destination",
+    "Test_Weight",
+    "Variety",
+    "Load_Cell",
+    "Source_File_Name",
+    "Source_File_ID",
+    "External_Load_Key",
+)
+
+HARVEST_UPDATE_SQL = (
+    f"UPDATE {HARVEST_WRITE_TABLE} SET "
+    + ", ".join(f"{column} = %s" for column in HARVEST_COLUMNS)
+    + ", Updated_At = CURRENT_TIMESTAMP WHERE Harvest_ID = %s"
+)
+# Multi-row form: the VALUES rows are appended per batch. A duplicate
+# External_Load_Key (uq_harvest_external_load) updates that row instead.
+HARVEST_UPSERT_PREFIX = f"INSERT INTO {HARVEST_WRITE_TABLE} ({', '.join(HARVEST_COLUMNS)}) VALUES "
+HARVEST_UPSERT_SUFFIX = (
+    " ON DUPLICATE KEY UPDATE "
+    + ", ".join(f"{column} = VALUES({column})" for column in HARVEST_COLUMNS)
+    + ", Updated_At = CURRENT_TIMESTAMP"
+)
+
+# Values per IN (...) list of the dedup prefetch queries.
+DEDUP_LOOKUP_CHUNK_SIZE = 1000
+
+# Run kinds in the import journal
+JOURNAL_KIND_API = "api"
+JOURNAL_KIND_IDS = "ids"
+
+# Loads resolved and written per batch (one multi-row upsert each); also
+# bounds how much of a streamed file is held at once.
+WRITE_BATCH_SIZE = int((os.getenv("IMPORT_BATCH_SIZE") or "500").strip())
+
+
+def harvest_values(load: HarvestLoad, ids: DimensionIds) -> Tuple[Any, ...]:
+    return (
+        ids.cart_id,
+        ids.field_id,
+        ids.crop_id,
+        ids.dpt_id,
+        ids.storloc_id,
+        load.load_num,
+        load.harvest_date,
+        load.mc,
+        load.gross_weight,
+        None,
+        load.bushels,
+        load.wet_bushels,
+        load.dry_bushels,
+        load.job_number,
+        None,
+        load.truck_id,
+        load.destination_code,
+        load.test_weight,
+        load.variety,
+        load.load_cell,
+        load.source_file_name,
+        load.source_file_id,
+        load.external_load_key,
+    )
+
 
-        if existing:
+def upsert_harvest_load(conn, load: HarvestLoad, ids: DimensionIds) -> str:
+    """Update the matching Harvest row, or insert a new one; returns "UPDATED" or "IMPORTED"."""
+    counts = upsert_harvest_batch(conn, [load], [ids])
+    return "IMPORTED" if counts["imported"] else "UPDATED"
+
+
+class HarvestDedupIndex:
+    """
+    The existing Harvest rows the loads of one file may update, fetched a
+    few statements per file instead of one per load.
+
+    A load updates the row with its External_Load_Key; failing that, a row
+    with the same date, cart, field, crop and load number (rows written
+    before External_Load_Key existed), preferring rows with MC, then the
+    lowest Harvest_ID. Keys are looked up with IN lists on
+    uq_harvest_external_load, and the legacy candidates of every
+    (Field_ID, Cart_ID, Crop_ID) the file uses with one query on
+    ix_harvest_dedup; the matching itself happens here.
+
+    Pass the same index for every batch of a file: groups are fetched once,
+    and rows the file writes are tracked in memory.
+    """
+
+    def __init__(self) -> None:
+        # casefolded External_Load_Key values that exist (or were written)
+        self.known_keys: set = set()
+        self.queries = 0
+        self._checked_keys: set = set()
+        self._groups: set = set()
+        # (Field_ID, Cart_ID, Crop_ID, Load_Num, Harvest_Date) -> candidate rows
+        self._legacy: Dict[Tuple[Any, ...], List[Dict[str, Any]]] = {}
+
+    def prefetch(self, cur, loads: List[HarvestLoad], ids: List[DimensionIds]) -> None:
+        keys = {}
+        for load in loads:
+            folded = load.external_load_key.casefold()
+            if folded not in self._checked_keys:
+                keys.setdefault(folded, load.external_load_key)
+        key_list = list(keys.values())
+        for start in range(0, len(key_list), DEDUP_LOOKUP_CHUNK_SIZE):
+            chunk = key_list[start:start + DEDUP_LOOKUP_CHUNK_SIZE]
             cur.execute(
-                """
-                UPDATE harvest_backup1
-                SET
-                    Cart_ID = %s,
-                    Field_ID = %s,
-                    Crop_ID = %s,
-                    Dpt_ID = %s,
-                    StorLoc_ID = %s,
-                    Load_Num = %s,
-                    Harvest_Date = %s,
-                    MC = %s,
-                    Gross_Weight = %s,
-                    Tare_Weight = %s,
-                    Bushels = %s,
-                    WetBushels = %s,
-                    DryBushels = %s,
-                    JobNumber = %s,
-                    Note = %s,
-                    Truck_ID = %s,
-                    Destination = %s,
-                    Test_Weight = %s,
-                    Variety = %s,
-                    Load_Cell = %s,
-                    Source_File_Name = %s,
-                    Source_File_ID = %s,
-                    External_Load_Key = %s,
-                    Updated_At = CURRENT_TIMESTAMP
-                WHERE Harvest_ID = %s
+                f"SELECT External_Load_Key FROM {HARVEST_READ_TABLE} "
+                f"WHERE External_Load_Key IN ({', '.join(['%s'] * len(chunk))})",
+                chunk,
+            )
+            self.queries += 1
+            # The key column compares case-insensitively, like the per-row lookup did.
+            self.known_keys.update(row["External_Load_Key"].casefold() for row in cur.fetchall())
+        self._checked_keys.update(keys)
+
+        # Legacy candidates are only needed for loads without a key match.
+        groups = sorted({
+            (load_ids.field_id, load_ids.cart_id, load_ids.crop_id)
+            for load, load_ids in zip(loads, ids)
+            if load.external_load_key.casefold() not in self.known_keys
+        } - self._groups)
+        for start in range(0, len(groups), DEDUP_LOOKUP_CHUNK_SIZE):
+            chunk = groups[start:start + DEDUP_LOOKUP_CHUNK_SIZE]
+            cur.execute(
+                f"""
+                SELECT Harvest_ID, Field_ID, Cart_ID, Crop_ID, Load_Num, Harvest_Date, MC
+                FROM {HARVEST_READ_TABLE}
+                WHERE (Field_ID, Cart_ID, Crop_ID) IN ({', '.join(['(%s, %s, %s)'] * len(chunk))})
                 """,
-                values + (existing["Harvest_ID"],)
+                [value for group in chunk for value in group],
             )
-            return "UPDATED"
+            self.queries += 1
+            for row in cur.fetchall():
+                key = _legacy_key(row["Field_ID"], row["Cart_ID"], row["Crop_ID"], row["Load_Num"], row["Harvest_Date"])
+                self._legacy.setdefault(key, []).append(row)
+        self._groups.update(groups)
+
+    def is_known(self, load: HarvestLoad) -> bool:
+        return load.external_load_key.casefold() in self.known_keys
+
+    def legacy_match(self, load: HarvestLoad, ids: DimensionIds) -> Optional[Dict[str, Any]]:
+        candidates = self._legacy.get(
+            _legacy_key(ids.field_id, ids.cart_id, ids.crop_id, load.load_num, load.harvest_date)
+        )
+        if not candidates:
+            return None
+        return min(candidates, key=lambda row: (row["MC"] is None, row["Harvest_ID"]))
 
-        cur.execute(
-            """
-            INSERT INTO harvest_backup1 (
-                Cart_ID,
-                Field_ID,
-                Crop_ID,
-                Dpt_ID,
-                StorLoc_ID,
-                Load_Num,
-                Harvest_Date,
-                MC,
-                Gross_Weight,
-                Tare_Weight,
-                Bushels,
-                WetBushels,
-                DryBushels,
-                JobNumber,
-                Note,
-                Truck_ID,
-                Destination,
-                Test_Weight,
-                Variety,
-                Load_Cell,
-                Source_File_Name,
-                Source_File_ID,
-                External_Load_Key
-            )
-            VALUES (
-                %s, %s, %s, %s, %s,
-                %s, %s, %s, %s, %s,
-                %s, %s, %s, %s, %s,
-                %s, %s, %s, %s, %s,
-                %s, %s, %s
+    def mark_written(self, load: HarvestLoad, legacy_row: Optional[Dict[str, Any]] = None) -> None:
+        # A repeat of this key later in the file updates the row written now.
+        self.known_keys.add(load.external_load_key.casefold())
+        if legacy_row is not None:
+            legacy_row["MC"] = load.mc
+
+
+def _legacy_key(field_id: Any, cart_id: Any, crop_id: Any, load_num: Any, harvest_date: Any) -> Tuple[Any, ...]:
+    # Load_Num compares case-insensitively in the DB; Harvest_Date is
+    # matched NULL-safely (<=>), so None matches None.
+    date_key = harvest_date.isoformat() if hasattr(harvest_date, "isoformat") else harvest_date
+    return int(field_id), int(cart_id), int(crop_id), str(load_num).strip().casefold(), date_key
+
+
+def upsert_harvest_batch(
+    conn,
+    loads: List[HarvestLoad],
+    ids: List[DimensionIds],
+    dedup: Optional[HarvestDedupIndex] = None,
+) -> Dict[str, int]:
+    """
+    Write a batch of loads, each updating its existing Harvest row (see
+    HarvestDedupIndex) or inserting a new one, in a handful of statements.
+
+    Loads whose External_Load_Key exists and new loads go out as one
+    multi-row INSERT ... ON DUPLICATE KEY UPDATE; loads matching an older
+    keyless row update that row by Harvest_ID. Pass the file's dedup index
+    when writing a file in several batches. Returns imported/updated
+    counts.
+    """
+    counts = {"imported": 0, "updated": 0}
+    if not loads:
+        return counts
+    dedup = dedup if dedup is not None else HarvestDedupIndex()
+
+    with conn.cursor() as cur:
+        dedup.prefetch(cur, loads, ids)
+
+        upsert_rows: List[Tuple[Any, ...]] = []
+        legacy_rows: List[Tuple[Any, ...]] = []
+        for load, load_ids in zip(loads, ids):
+            values = harvest_values(load, load_ids)
+            if dedup.is_known(load):
+                counts["updated"] += 1
+                upsert_rows.append(values)
+                continue
+
+            existing = dedup.legacy_match(load, load_ids)
+            if existing:
+                counts["updated"] += 1
+                legacy_rows.append(values + (existing["Harvest_ID"],))
+            else:
+                counts["imported"] += 1
+                upsert_rows.append(values)
+            dedup.mark_written(load, existing)
+
+        if legacy_rows:
+            cur.executemany(HARVEST_UPDATE_SQL, legacy_rows)
+        if upsert_rows:
+            placeholders = "(" + ", ".join(["%s"] * len(HARVEST_COLUMNS)) + ")"
+            cur.execute(
+                HARVEST_UPSERT_PREFIX + ", ".join([placeholders] * len(upsert_rows)) + HARVEST_UPSERT_SUFFIX,
+                [value for values in upsert_rows for value in values],
             )
-            """,
-            values
-        )
 
-    return "IMPORTED"
+    return counts
+
+
+def prepare_parsed_loads(
+    header: Dict[str, Any],
+    loads: Iterable[Dict[str, Any] | GrcLoad],
+    file_id: int,
+    file_name: str,
+    counts: Dict[str, int],
+    first_row_num: int = 1,
+) -> Iterator[HarvestLoad]:
+    """
+    Yield the loads of one parsed file that can be imported, counting
+    "loads" and "skipped" in counts and printing every skipped row.
+    """
+    for row_num, load_row in enumerate(loads, start=first_row_num):
+        counts["loads"] += 1
+        load = prepare_harvest_load(header, load_row, file_id, file_name, row_num)
+        if isinstance(load, str):
+            counts["skipped"] += 1
+            print(f"  row {row_num}: {load}")
+            continue
+        yield load
+
+
+def write_parsed_file(
+    conn,
+    header: Dict[str, Any],
+    loads: Iterable[Dict[str, Any] | GrcLoad],
+    file_id: int,
+    file_name: str,
+    first_row_num: int = 1,
+    resolver: Optional[DimensionResolver] = None,
+    batch_size: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Insert/update every load of one parsed .grc file.
+
+    loads may be a list or a lazy iterator (GrcStream.loads), of load dicts
+    or of the lean GrcLoad records the importers parse into. Does not
+    commit; the caller owns the per-file commit/rollback (and should pass
+    it on to resolver). first_row_num is the row number of the first load,
+    for when only appended loads are written (row numbers stand in for a
+    missing LoadNumber).
+
+    Loads are written batch_size (default WRITE_BATCH_SIZE) at a time: the
+    dimension IDs of a batch are resolved together through resolver (see
+    dimension_cache.py; pass the run's preloaded resolver so files share
+    it) and the batch is written by upsert_harvest_batch. Existing rows
+    are looked up through one HarvestDedupIndex for the whole file, so the
+    dedup queries grow with the number of files, not loads.
+    """
+    resolver = resolver or DimensionResolver()
+    dedup = HarvestDedupIndex()
+    batch_size = max(1, batch_size or WRITE_BATCH_SIZE)
+    counts = {"loads": 0, "imported": 0, "updated": 0, "skipped": 0}
+    prepared = prepare_parsed_loads(header, loads, file_id, file_name, counts, first_row_num)
+    while True:
+        batch = list(itertools.islice(prepared, batch_size))
+        if not batch:
+            break
+
+        written = upsert_harvest_batch(conn, batch, resolver.resolve(conn, batch), dedup)
+        counts["imported"] += written["imported"]
+        counts["updated"] += written["updated"]
+
+    return counts
+
+
+def _iter_file_loaders(
+    client: SlingshotClient,
+    file_names: Dict[int, str],
+    versions: Dict[int, Optional[str]],
+    max_workers: Optional[int],
+    stream: bool,
+    state: Optional[SyncState] = None,
+    parse_workers: Optional[int] = None,
+    queue_size: Optional[int] = None,
+    stats: Optional[PipelineStats] = None,
+):
+    """
+    Yield (file_id, load, timings) triples; load() returns (header, loads,
+    skipped, cursor, content_sha256) for the file, and timings holds the download/parse
+    seconds already spent on it by the pipeline (empty in stream mode).
+
+    Calling load() inside the importer's per-file try block means download
+    and parse failures are isolated to that file.
+
+    With a sync state, files that only had loads appended since their last
+    import yield just the new loads; skipped is how many were left out and
+    cursor is the load cursor to save once the file is committed. Stream
+    mode always yields every load (and no cursor or content_sha256).
+    """
+    if stream:
+        # One file at a time, read and parsed in chunks while it is written.
+        for file_id, file_name in file_names.items():
+            def load(file_id=file_id, file_name=file_name):
+                stream_ = client.stream_parsed_graincart_file(
+                    file_id, file_name=file_name, version=versions[file_id], lean=True
+                )
+                return stream_.header, stream_.loads, 0, None, None
 
+            yield file_id, load, {}
+        return
 
-def import_all_graincart_files():
+    # Downloads (client threads) and parsing (worker processes) run ahead
+    # of the caller, which only writes; see import_pipeline.py.
+    jobs = (
+        PipelineJob(file_id, (file_id, file_names[file_id], state is not None, state.cursor_for(file_id) if state else None))
+        for file_id in file_names
+    )
+    results = iter_pipeline(
+        jobs,
+        download=lambda job: client.download_graincart_bin(job.file_id, version=versions[job.file_id]),
+        parse=_parse_downloaded_grc,
+        download_workers=max_workers or client.config.max_workers,
+        parse_workers=parse_workers,
+        queue_size=queue_size,
+        stats=stats,
+    )
+    for result in results:
+        client.metrics.record_stage("parse", result.parse_seconds)
+
+        def load(result=result):
+            if not result.ok:
+                raise result.error
+            return result.result
+
+        yield result.job.file_id, load, {"download": result.download_seconds, "parse": result.parse_seconds}
+
+
+def _parse_downloaded_grc(
+    raw: bytes,
+    file_id: int,
+    file_name: str,
+    incremental: bool,
+    saved_cursor: Optional[Dict[str, Any]],
+) -> Tuple[Dict[str, Any], List[GrcLoad], int, Optional[GrcLoadCursor], str]:
+    # Runs in a pipeline parser process; returns what a loader's load() does.
+    parser = _local_grc_parser()
+    digest = hashlib.sha256(raw).hexdigest()
+    if incremental:
+        stream_, cursor, skipped = parser.stream_grc_appended(
+            raw,
+            GrcLoadCursor(**saved_cursor) if saved_cursor else None,
+            graincart_id=file_id,
+            file_name=file_name,
+            lean=True,
+        )
+        return stream_.header, list(stream_.loads), skipped, cursor, digest
+
+    parsed = parser.parse_grc_bytes(raw, graincart_id=file_id, file_name=file_name, lean=True)
+    return parsed["header"], parsed["loads"], 0, None, digest
+
+
+def import_all_graincart_files(
+    max_workers: Optional[int] = None,
+    incremental: bool = False,
+    stream: bool = False,
+    selection: Optional[ManifestFilter] = None,
+    refresh: bool = True,
+    batch_size: Optional[int] = None,
+    parse_workers: Optional[int] = None,
+    queue_size: Optional[int] = None,
+    resume: bool | int = False,
+    force: bool = False,
+):
+    """
+    Import every Slingshot grain cart file, or only those matching selection.
+
+    Files go through a pipeline (import_pipeline.py): max_workers download
+    threads, parse_workers parser processes and this thread as the single
+    DB writer, on bounded queues (queue_size), so downloading, parsing and
+    writing overlap. Each file is still written and committed (or rolled
+    back) on its own.
+
+    With incremental=True only files that are new or modified since the
+    last incremental run are downloaded (see sync_state.py), and the sync
+    cursor is saved as files are committed. A modified file whose earlier
+    loads are unchanged (a job still in progress) only has its new
+    trailing loads parsed and written.
+
+    With stream=True files are imported one at a time and parsed while
+    they download, so memory stays flat regardless of file size; the
+    pipeline holds a bounded number of whole files in memory.
+
+    selection filters on the crop/field/season/cart encoded in the file
+    names (see grc_manifest.py); only matching files are downloaded. The
+    summary listing refreshes the local manifest as it goes. With
+    refresh=False the listing is skipped and files are selected from the
+    manifest alone.
+
+    Every run and file is recorded in the import journal
+    (import_journal.py). Files whose last successful import (here or by
+    ID) had the same last-modified value are skipped before downloading,
+    unless force=True.
+    resume=True picks up the last API run that did not complete (or
+    resume=<run ID> that run), importing only its files not yet done,
+    without listing Slingshot again.
+    """
     client = SlingshotClient()
     conn = pymysql.connect(**DB_CONFIG)
+    resolver = DimensionResolver.preload(conn)
+    state = SyncState.load() if incremental else None
+    manifest = GrcManifest.load()
+    journal = ImportJournal.open()
+    run_id: Optional[int] = None
+    finished = False
+    pipeline_stats = PipelineStats()
+    if selection is not None and selection.is_empty():
+        selection = None
 
     file_count = 0
     load_count = 0
+    updated_count = 0
     skipped_count = 0
     error_count = 0
 
     try:
-        for item in client.iter_all_graincart_summaries(pagesize=25):
-            file_id_raw = item.get("ID") or item.get("Id") or item.get("id")
-            file_name = item.get("Name") or item.get("name") or f"GRC_{file_id_raw}.grc"
-
-            if not file_id_raw:
-                print("Skipping file with missing ID")
-                skipped_count += 1
-                continue
-
-            file_id = int(file_id_raw)
+        file_names: Dict[int, str] = {}
+        versions: Dict[int, Optional[str]] = {}
+        if resume:
+            run_id = journal.resumable_run(JOURNAL_KIND_API, None if resume is True else int(resume))
+            if run_id is None:
+                print("No unfinished API import run to resume.")
+                finished = True
+                return
+            for file_id, file_name, version in journal.remaining_files(run_id):
+                file_names[file_id] = file_name or f"GRC_{file_id}.grc"
+                versions[file_id] = version
+            journal.reopen_run(run_id)
+            print(f"Resuming import run {run_id}: {len(file_names)} file(s) left")
+        elif not refresh:
+            manifest.add_names_file()
+            for entry in manifest.select(selection or ManifestFilter()):
+                if state is not None and state.is_unchanged(entry.file_id, entry.last_modified):
+                    continue
+                file_names[entry.file_id] = entry.name
+                versions[entry.file_id] = entry.last_modified
+        else:
+            if state is not None:
+                summaries = client.iter_changed_graincart_summaries(state, pagesize=25)
+            else:
+                summaries = client.iter_all_graincart_summaries(pagesize=25)
 
-            try:
-                parsed = client.get_parsed_graincart_file(file_id, file_name=file_name)
-                header = parsed["header"]
-                loads = parsed["loads"]
+            for item in summaries:
+                file_id = client.summary_file_id(item)
 
-                if not loads:
-                    print(f"{file_name} -> no loads found")
+                if file_id is None:
+                    print("Skipping file with missing ID")
                     skipped_count += 1
                     continue
 
-                imported_this_file = 0
-                skipped_this_file = 0
-
-                for row_num, load_row in enumerate(loads, start=1):
-                    status = insert_harvest_load(
-                        conn=conn,
-                        header=header,
-                        load_row=load_row,
-                        source_file_id=file_id,
-                        source_file_name=file_name,
-                        row_num=row_num,
-                    )
+                version = client.summary_last_modified(item)
+                entry = manifest.add_summary(item, file_id, version)
+                if selection is not None and not selection.matches(entry):
+                    continue
+
+                file_names[file_id] = entry.name
+                versions[file_id] = version
+
+            manifest.save()
+
+        if state is not None:
+            print(f"Incremental sync: {len(file_names)} new or modified file(s)")
+        if selection is not None:
+            print(f"Selected {len(file_names)} file(s) matching the filters")
+
+        if run_id is None:
+            if not force:
+                unchanged = [
+                    file_id for file_id in file_names if journal.is_unchanged(file_id, version=versions[file_id])
+                ]
+                for file_id in unchanged:
+                    del file_names[file_id]
+                if unchanged:
+                    print(f"Skipping {len(unchanged)} file(s) unchanged since their last import (use --force to re-import)")
+            run_id = journal.start_run(
+                JOURNAL_KIND_API,
+                {"incremental": incremental, "stream": stream, "selection": asdict(selection) if selection else None},
+            )
+            journal.plan_files(run_id, [(file_id, name, versions[file_id]) for file_id, name in file_names.items()])
+            print(f"Import run {run_id}: {len(file_names)} file(s)")
+
+        loaders = _iter_file_loaders(
+            client, file_names, versions, max_workers, stream, state,
+            parse_workers=parse_workers, queue_size=queue_size, stats=pipeline_stats,
+        )
+        for file_id, load, timings in loaders:
+            file_name = file_names[file_id]
 
-                    if status == "IMPORTED":
-                        imported_this_file += 1
-                        load_count += 1
-                    else:
-                        skipped_this_file += 1
-                        skipped_count += 1
-                        print(f"  row {row_num}: {status}")
+            try:
+                started = time.monotonic()
+                header, loads, already_imported, cursor, content_sha256 = load()
+                parsed_at = time.monotonic()
+                counts = write_parsed_file(
+                    conn, header, loads, file_id, file_name,
+                    first_row_num=already_imported + 1, resolver=resolver, batch_size=batch_size,
+                )
 
                 conn.commit()
+                resolver.commit()
+                if stream:
+                    # Parsing of iterator loads happens lazily inside the write.
+                    client.metrics.record_stage("parse", parsed_at - started)
+                client.metrics.record_stage("db_write", time.monotonic() - parsed_at)
+                if state is not None:
+                    state.mark_imported(file_id, file_name, versions[file_id], asdict(cursor) if cursor else None)
+                journal.record_file(
+                    run_id, file_id, file_name, FILE_DONE,
+                    version=versions[file_id], content_sha256=content_sha256, counts=counts,
+                    timings={
+                        "download": timings.get("download"),
+                        "parse": timings.get("parse", parsed_at - started),
+                        "write": time.monotonic() - parsed_at,
+                    },
+                )
+
+                if already_imported:
+                    print(f"{file_name} -> {already_imported} load(s) already imported, appended: {counts['loads']}")
+                if not counts["loads"]:
+                    if not already_imported:
+                        print(f"{file_name} -> no loads found")
+                    skipped_count += 1
+                    continue
+
                 file_count += 1
+                load_count += counts["imported"]
+                updated_count += counts["updated"]
+                skipped_count += counts["skipped"]
                 print(
-                    f"{file_name} -> loads found: {len(loads)} | "
-                    f"imported={imported_this_file}, skipped={skipped_this_file}"
+                    f"{file_name} -> loads found: {counts['loads']} | "
+                    f"imported={counts['imported']}, updated={counts['updated']}, skipped={counts['skipped']}"
                 )
 
             except Exception as exc:
                 conn.rollback()
+                resolver.rollback()
                 error_count += 1
+                journal.record_file(run_id, file_id, file_name, FILE_ERROR, version=versions[file_id], error=str(exc))
                 print(f"ERROR importing {file_name} (ID={file_id}): {exc}")
 
         print("\nDone.")
         print(f"Files processed: {file_count}")
         print(f"Loads imported: {load_count}")
+        print(f"Loads updated: {updated_count}")
         print(f"Loads skipped: {skipped_count}")
         print(f"Files errored: {error_count}")
+        print(f"Dimension queries: {resolver.queries}")
+        if not stream:
+            print(pipeline_stats.format_summary())
+        print(client.metrics.format_summary())
+        finished = True
 
     finally:
+        if state is not None:
+            state.save()
+        if run_id is not None:
+            status = journal.finish_run(run_id, None if finished else RUN_INTERRUPTED)
+            print(f"Import run {run_id}: {status}")
+        journal.close()
+        client.metrics.close()
         conn.close()
 
 
-def import_graincart_file_by_id(file_id: int):
+def import_graincart_file_by_id(
+    file_id: int,
+    stream: bool = False,
+    file_name: Optional[str] = None,
+    batch_size: Optional[int] = None,
+    journal: Optional[ImportJournal] = None,
+    run_id: Optional[int] = None,
+    force: bool = False,
+):
+    """
+    Import one file by ID.
+
+    When the name is known (passed in or found in the local manifest) the
+    detail request is skipped. The download then bypasses the raw .grc
+    cache, since without a fresh last-modified value a cached copy could
+    be stale.
+
+    With a journal the file is recorded under run_id with its version (when
+    the detail request was made) and the sha256 of its content. Unless
+    force=True, a file whose last successful import (by ID or from an API
+    run) had the same version is not downloaded, and one with the same
+    content is not written again (stream mode writes while downloading, so
+    it is only skipped on the version).
+    """
     client = SlingshotClient()
     conn = pymysql.connect(**DB_CONFIG)
+    version = None
+    content_sha256 = None
+    timings: Dict[str, float] = {}
 
     try:
-        detail = client.get_graincart_detail(file_id)
-        items = detail.get("GrainCart") or []
-        file_name = f"GRC_{file_id}.grc"
-        if items:
-            file_name = items[0].get("Name") or file_name
+        if file_name is None:
+            file_name = GrcManifest.load().name_for(file_id)
+        if file_name is None:
+            detail = client.get_graincart_detail(file_id)
+            items = detail.get("GrainCart") or []
+            file_name = f"GRC_{file_id}.grc"
+            if items:
+                file_name = items[0].get("Name") or file_name
+                version = client.summary_last_modified(items[0])
+
+        if journal is not None and not force and journal.is_unchanged(file_id, version=version):
+            journal.record_file(run_id, file_id, file_name, FILE_UNCHANGED, version=version)
+            print(f"{file_name} -> unchanged since its last import, skipped")
+            return
+
+        started = time.monotonic()
+        if stream:
+            parsed_stream = client.stream_parsed_graincart_file(file_id, file_name=file_name, version=version, lean=True)
+            header, loads = parsed_stream.header, parsed_stream.loads
+        else:
+            raw = client.download_graincart_bin(file_id, version=version)
+            timings["download"] = time.monotonic() - started
+            content_sha256 = hashlib.sha256(raw).hexdigest()
+            if journal is not None and not force and journal.is_unchanged(file_id, content_sha256=content_sha256):
+                journal.record_file(
+                    run_id, file_id, file_name, FILE_UNCHANGED,
+                    version=version, content_sha256=content_sha256, timings=timings,
+                )
+                print(f"{file_name} -> unchanged since its last import, skipped")
+                return
+            started = time.monotonic()
+            parsed = client.parse_grc_bytes(raw, graincart_id=file_id, file_name=file_name, lean=True)
+            header, loads = parsed["header"], parsed["loads"]
+            timings["parse"] = time.monotonic() - started
 
-        parsed = client.get_parsed_graincart_file(file_id, file_name=file_name)
-        header = parsed["header"]
-        loads = parsed["loads"]
+        started = time.monotonic()
+        counts = write_parsed_file(conn, header, loads, file_id, file_name, batch_size=batch_size)
 
-        if not loads:
+        conn.commit()
+        timings["write"] = time.monotonic() - started
+        if journal is not None:
+            journal.record_file(
+                run_id, file_id, file_name, FILE_DONE,
+                version=version, content_sha256=content_sha256, counts=counts, timings=timings,
+            )
+        if not counts["loads"]:
             print(f"{file_name} -> no loads found")
             return
 
-        imported_this_file = 0
-        updated_this_file = 0
-        skipped_this_file = 0
-
-        for row_num, load_row in enumerate(loads, start=1):
-            status = insert_harvest_load(
-                conn=conn,
-                header=header,
-                load_row=load_row,
-                source_file_id=file_id,
-                source_file_name=file_name,
-                row_num=row_num,
+        print(
+            f"{file_name} -> loads found: {counts['loads']} | "
+            f"imported={counts['imported']}, updated={counts['updated']}, skipped={counts['skipped']}"
+        )
+    except Exception as exc:
+        conn.rollback()
+        if journal is not None:
+            journal.record_file(
+                run_id, file_id, file_name, FILE_ERROR, version=version, content_sha256=content_sha256, error=str(exc)
             )
+        raise
+    finally:
+        conn.close()
 
-            if status == "IMPORTED":
-                imported_this_file += 1
-            elif status == "UPDATED":
-                updated_this_file += 1
-            else:
-                skipped_this_file += 1
-                print(f"  row {row_num}: {status}")
 
-        conn.commit()
+def import_graincart_files_by_ids(
+    file_ids: Iterable[int],
+    stream: bool = False,
+    batch_size: Optional[int] = None,
+    resume: bool | int = False,
+    force: bool = False,
+):
+    """
+    Import specific files by ID, recording the run in the import journal.
+
+    A file that fails is reported and the rest are still imported; the run
+    then stays incomplete. resume=True (or a run ID) imports the files of
+    the last incomplete by-ID run that are not done yet, e.g. after a
+    crash; file_ids are not needed then. Files unchanged since their last
+    import are skipped unless force=True.
+    """
+    journal = ImportJournal.open()
+    run_id: Optional[int] = None
+    finished = False
+    errors = 0
+
+    try:
+        if resume:
+            run_id = journal.resumable_run(JOURNAL_KIND_IDS, None if resume is True else int(resume))
+            if run_id is None:
+                print("No unfinished by-ID import run to resume.")
+                finished = True
+                return
+            unique_ids = [file_id for file_id, _file_name, _version in journal.remaining_files(run_id)]
+            journal.reopen_run(run_id)
+            print(f"Resuming import run {run_id}: {len(unique_ids)} file(s) left")
+        else:
+            unique_ids = list(dict.fromkeys(file_ids))
+            if not unique_ids:
+                print("No file IDs provided.")
+                finished = True
+                return
+            run_id = journal.start_run(JOURNAL_KIND_IDS, {"stream": stream})
+
+        manifest = GrcManifest.load()
+        manifest.add_names_file()
+        journal.plan_files(run_id, [(file_id, manifest.name_for(file_id), None) for file_id in unique_ids])
+
+        total = len(unique_ids)
+        print(f"Importing {total} specific Slingshot file(s)...")
+        for index, file_id in enumerate(unique_ids, start=1):
+            print(f"[{index}/{total}] Importing file ID {file_id}")
+            try:
+                import_graincart_file_by_id(
+                    file_id, stream=stream, file_name=manifest.name_for(file_id), batch_size=batch_size,
+                    journal=journal, run_id=run_id, force=force,
+                )
+            except Exception as exc:
+                errors += 1
+                print(f"ERROR importing file ID {file_id}: {exc}")
+        finished = True
+
+    finally:
+        if run_id is not None:
+            status = journal.finish_run(run_id, None if finished else RUN_INTERRUPTED)
+            print(f"Import run {run_id}: {status}" + (f", {errors} file(s) failed" if errors else ""))
+        journal.close()
+
+
+# Exported files are saved as "<graincart ID>_<Slingshot file name>", e.g.
+# 93123148_Corn_1793_106_2025-11-03_092643_15895.grc
+LOCAL_FILE_NAME_PATTERN = re.compile(r"^(\d+)_(.+)$")
+
+
+def local_grc_file_id(path: str | os.PathLike) -> Tuple[Optional[int], str]:
+    """Return (graincart ID, Slingshot file name) for an exported .grc file."""
+    base_name = Path(path).name
+    match = LOCAL_FILE_NAME_PATTERN.match(base_name)
+    if not match:
+        return None, base_name
+    return int(match.group(1)), match.group(2)
+
+
+def find_local_grc_files(source: str) -> List[str]:
+    """source is a directory (searched recursively for *.grc) or a glob pattern."""
+    if os.path.isdir(source):
+        return sorted(str(path) for path in Path(source).rglob("*.grc"))
+    return sorted(glob.glob(source, recursive=True))
+
+
+_local_parser: Optional[SlingshotClientBase] = None
+
+
+def _local_grc_parser() -> SlingshotClientBase:
+    # Runs in a worker process. SlingshotClientBase parses without any
+    # Slingshot configuration, so no API credentials are needed.
+    global _local_parser
+    if _local_parser is None:
+        _local_parser = SlingshotClientBase()
+        _local_parser.parsed_cache = GrcParsedCache.from_env()
+    return _local_parser
+
+
+def _parse_local_grc_file(path: str) -> Dict[str, Any]:
+    file_id, file_name = local_grc_file_id(path)
+    with open(path, "rb") as handle:
+        raw = handle.read()
+    # Lean records: far less to pickle back to the writer process than load dicts.
+    return _local_grc_parser().parse_grc_bytes(raw, graincart_id=file_id, file_name=file_name, lean=True)
+
+
+def _parse_grc_member(raw: bytes, file_id: int, file_name: str) -> Dict[str, Any]:
+    return _local_grc_parser().parse_grc_bytes(raw, graincart_id=file_id, file_name=file_name, lean=True)
+
+
+@dataclass
+class LocalGrcTask:
+    """One exported file to parse in the process pool and write."""
+
+    label: str                     # path, or "bundle.zip:member" for archive members
+    file_id: int
+    file_name: str
+    parse: Callable[..., Dict[str, Any]]
+    args: Tuple[Any, ...]
+    digest: Optional[str] = None   # sha256 of the content (archive members)
+
+
+def _import_local_grc_tasks(
+    tasks: Iterable[LocalGrcTask],
+    workers: int,
+    total: Optional[int] = None,
+    on_committed: Optional[Callable[[LocalGrcTask], None]] = None,
+    batch_size: Optional[int] = None,
+    bulk: bool = False,
+    bulk_flush_loads: Optional[int] = None,
+) -> None:
+    """
+    Parse tasks in a process pool and write them in order over a single DB
+    connection, one commit per file, printing progress as files complete.
+    on_committed is called for each file once its loads are committed.
+
+    bulk=True stages the prepared loads of many files and writes them with
+    BulkHarvestWriter (harvest_bulk.py) every bulk_flush_loads loads, one
+    commit per flush; files are reported once their flush is committed,
+    and a failed flush fails every file in it.
+    """
+    conn = pymysql.connect(**DB_CONFIG, local_infile=True) if bulk else pymysql.connect(**DB_CONFIG)
+    resolver = None if bulk else DimensionResolver.preload(conn)
+    writer = (
+        BulkHarvestWriter(
+            conn, HARVEST_READ_TABLE, HARVEST_WRITE_TABLE, flush_loads=bulk_flush_loads or DEFAULT_FLUSH_LOADS
+        )
+        if bulk
+        else None
+    )
+    # staged file key -> (task, counts, progress label), until the flush
+    staged: Dict[int, Tuple[LocalGrcTask, Dict[str, int], str]] = {}
+
+    done = 0
+    totals = {"files": 0, "imported": 0, "updated": 0, "skipped": 0, "errors": 0}
+    parse_wait_seconds = 0.0
+    db_seconds = 0.0
+    run_started = time.monotonic()
+
+    def report(progress: str, task: LocalGrcTask, counts: Dict[str, int]) -> None:
+        if on_committed is not None:
+            on_committed(task)
+
+        if not counts["loads"]:
+            print(f"{progress} {task.file_name} -> no loads found")
+            totals["skipped"] += 1
+            return
+
+        totals["files"] += 1
+        totals["imported"] += counts["imported"]
+        totals["updated"] += counts["updated"]
+        totals["skipped"] += counts["skipped"]
         print(
-            f"{file_name} -> loads found: {len(loads)} | "
-            f"imported={imported_this_file}, updated={updated_this_file}, skipped={skipped_this_file}"
+            f"{progress} {task.file_name} -> loads found: {counts['loads']} | "
+            f"imported={counts['imported']}, updated={counts['updated']}, skipped={counts['skipped']}"
         )
-    except Exception:
-        conn.rollback()
-        raise
+
+    def flush_staged() -> float:
+        if not staged:
+            return 0.0
+        started = time.monotonic()
+        try:
+            results = writer.flush()
+        except Exception as exc:
+            totals["errors"] += len(staged)
+            print(f"ERROR writing {len(staged)} staged file(s), all rolled back: {exc}")
+            for task, _counts, progress in staged.values():
+                print(f"{progress} ERROR importing {task.label} (ID={task.file_id}): not written")
+            staged.clear()
+            return time.monotonic() - started
+        for key, (task, counts, progress) in staged.items():
+            counts.update(results.get(key, {}))
+            report(progress, task, counts)
+        staged.clear()
+        return time.monotonic() - started
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Keep a bounded window of parses ahead of the writer so parsed
+            # files never pile up in memory when the DB is the bottleneck.
+            pending: Deque[Tuple[LocalGrcTask, Future]] = deque()
+            queue = iter(tasks)
+
+            def submit_next() -> None:
+                task = next(queue, None)
+                if task is not None:
+                    pending.append((task, pool.submit(task.parse, *task.args)))
+
+            for _ in range(workers * 2):
+                submit_next()
+
+            while pending:
+                task, future = pending.popleft()
+                submit_next()
+                done += 1
+                progress = f"[{done}/{total}]" if total else f"[{done}]"
+
+                try:
+                    started = time.monotonic()
+                    parsed = future.result()
+                    parsed_at = time.monotonic()
+                    if writer is not None:
+                        counts = {"loads": 0, "imported": 0, "updated": 0, "skipped": 0}
+                        writer.add_file(done, list(prepare_parsed_loads(
+                            parsed["header"], parsed["loads"], task.file_id, task.file_name, counts,
+                        )))
+                        staged[done] = (task, counts, progress)
+                        parse_wait_seconds += parsed_at - started
+                        if writer.should_flush():
+                            db_seconds += flush_staged()
+                        continue
+
+                    counts = write_parsed_file(
+                        conn, parsed["header"], parsed["loads"], task.file_id, task.file_name,
+                        resolver=resolver, batch_size=batch_size,
+                    )
+                    conn.commit()
+                    resolver.commit()
+                    parse_wait_seconds += parsed_at - started
+                    db_seconds += time.monotonic() - parsed_at
+                    report(progress, task, counts)
+
+                except Exception as exc:
+                    if resolver is not None:
+                        conn.rollback()
+                        resolver.rollback()
+                    totals["errors"] += 1
+                    print(f"{progress} ERROR importing {task.label} (ID={task.file_id}): {exc}")
+
+            if writer is not None:
+                db_seconds += flush_staged()
+
+        elapsed = time.monotonic() - run_started
+        print("\nDone.")
+        print(f"Files processed: {totals['files']}")
+        print(f"Loads imported: {totals['imported']}")
+        print(f"Loads updated: {totals['updated']}")
+        print(f"Loads skipped: {totals['skipped']}")
+        print(f"Files errored: {totals['errors']}")
+        print(f"Waiting on parsers: {parse_wait_seconds:.1f}s, DB writes: {db_seconds:.1f}s, total: {elapsed:.1f}s")
+        if resolver is not None:
+            print(f"Dimension queries: {resolver.queries}")
+
     finally:
         conn.close()
 
 
-def import_graincart_files_by_ids(file_ids: Iterable[int]):
-    unique_ids: List[int] = []
-    seen = set()
-    for file_id in file_ids:
-        if file_id not in seen:
-            unique_ids.append(file_id)
-            seen.add(file_id)
+def import_grc_directory(
+    source: str,
+    workers: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    bulk: bool = False,
+    bulk_flush_loads: Optional[int] = None,
+):
+    """
+    Import exported .grc files from disk, e.g. to restore a season after a
+    DB rebuild.
+
+    Files are parsed in a process pool (one worker per core by default,
+    reusing the parsed cache for files seen before, see grc_parsed_cache.py) and
+    written in order by this process over a single DB connection, one
+    commit per file. The graincart ID is taken from the file name prefix,
+    so Source_File_ID and External_Load_Key dedup work exactly as for API
+    imports, and re-importing a directory updates rather than duplicates.
+
+    bulk=True writes through the staging table instead (harvest_bulk.py),
+    for season backfills; same rows, far fewer round trips.
+    """
+    tasks = []
+    for path in find_local_grc_files(source):
+        file_id, file_name = local_grc_file_id(path)
+        if file_id is None:
+            print(f"Skipping {path}: name does not start with a graincart ID")
+            continue
+        tasks.append(LocalGrcTask(path, file_id, file_name, _parse_local_grc_file, (path,)))
+
+    if not tasks:
+        print(f"No .grc files found for {source}")
+        return
+
+    workers = workers or os.cpu_count() or 1
+    print(f"Importing {len(tasks)} local .grc file(s) with {workers} parser process(es)...")
+    _import_local_grc_tasks(
+        tasks, workers, total=len(tasks), batch_size=batch_size, bulk=bulk, bulk_flush_loads=bulk_flush_loads,
+    )
+
 
-    total = len(unique_ids)
-    if total == 0:
-        print("No file IDs provided.")
+def import_grc_archive(
+    archive_path: str,
+    workers: Optional[int] = None,
+    force: bool = False,
+    batch_size: Optional[int] = None,
+    bulk: bool = False,
+    bulk_flush_loads: Optional[int] = None,
+):
+    """
+    Import the exported .grc files inside a zip or tar bundle without
+    extracting it (see grc_archive.py).
+
+    Members are read in one pass over the bundle and parsed in a process
+    pool like import_grc_directory; member names carry the graincart ID
+    prefix the same way. The sha256 of every committed member is recorded
+    in the sync state, so importing the same (or an overlapping) bundle
+    again skips members already imported. force=True imports them anyway,
+    e.g. after a DB rebuild. bulk / bulk_flush_loads as for
+    import_grc_directory.
+    """
+    if not os.path.isfile(archive_path):
+        print(f"Archive not found: {archive_path}")
         return
 
-    print(f"Importing {total} specific Slingshot file(s)...")
-    for index, file_id in enumerate(unique_ids, start=1):
-        print(f"[{index}/{total}] Importing file ID {file_id}")
-        import_graincart_file_by_id(file_id)
+    state = SyncState.load()
+    workers = workers or os.cpu_count() or 1
+    total = count_grc_members(archive_path)
+    skipped = {"imported": 0, "unnamed": 0, "unreadable": 0}
+    print(
+        f"Importing {total if total is not None else 'the'} .grc member(s) of {archive_path} "
+        f"with {workers} parser process(es)..."
+    )
+
+    def tasks() -> Iterator[LocalGrcTask]:
+        seen = set()  # the same file twice in one bundle
+        for member in iter_grc_archive(archive_path):
+            label = f"{archive_path}:{member.name}"
+            if not member.ok:
+                print(f"Skipping {label}: {member.error}")
+                skipped["unreadable"] += 1
+                continue
+            file_id, file_name = local_grc_file_id(member.base_name)
+            if file_id is None:
+                print(f"Skipping {label}: name does not start with a graincart ID")
+                skipped["unnamed"] += 1
+                continue
+            digest = hashlib.sha256(member.content).hexdigest()
+            if digest in seen or (not force and state.is_content_imported(digest)):
+                skipped["imported"] += 1
+                continue
+            seen.add(digest)
+            yield LocalGrcTask(label, file_id, file_name, _parse_grc_member, (member.content, file_id, file_name), digest)
+
+    def record(task: LocalGrcTask) -> None:
+        state.mark_content_imported(task.digest, task.file_id)
+
+    try:
+        _import_local_grc_tasks(
+            tasks(), workers, on_committed=record, batch_size=batch_size,
+            bulk=bulk, bulk_flush_loads=bulk_flush_loads,
+        )
+    finally:
+        state.save()
+
+    print(
+        f"Members skipped: {skipped['imported']} already imported, "
+        f"{skipped['unnamed']} without a graincart ID, {skipped['unreadable']} unreadable"
+    )
 
 
 def parse_file_id_tokens(tokens: List[str]) -> List[int]:
@@ -703,7 +1604,74 @@ def parse_file_id_tokens(tokens: List[str]) -> List[int]:
 
 
 if __name__ == "__main__":
-    if len(sys.argv) > 1:
-        import_graincart_files_by_ids(parse_file_id_tokens(sys.argv[1:]))
+    parser = argparse.ArgumentParser(description="Import Slingshot grain cart (.grc) files into Harvest.")
+    parser.add_argument("file_ids", nargs="*", help="file IDs, comma lists or ranges such as 93438245-93438260")
+    parser.add_argument("--incremental", action="store_true", help="only import files new or modified since the last incremental run")
+    parser.add_argument("--workers", type=int, default=None, help="concurrent downloads (default RAVEN_MAX_WORKERS), or parser processes with --dir/--archive (default: all cores)")
+    parser.add_argument("--stream", action="store_true", help="parse files while they download, one at a time, with flat memory")
+    parser.add_argument("--season", type=int, action="append", default=[], help="only files created in this year (repeatable)")
+    parser.add_argument("--crop", action="append", default=[], help="only files for this crop, e.g. Corn (repeatable)")
+    parser.add_argument("--field", action="append", default=[], help="only files for this field, e.g. 1793 (repeatable)")
+    parser.add_argument("--cart", action="append", default=[], help="only files from this cart/bridge suffix, e.g. 15895 (repeatable)")
+    parser.add_argument("--no-refresh", action="store_true", help="select files from the local manifest without listing Slingshot")
+    parser.add_argument("--dir", dest="source", default=None, help="import exported .grc files from a directory or glob instead of the API")
+    parser.add_argument("--archive", action="append", default=[], help="import exported .grc files from a zip/tar bundle (repeatable)")
+    parser.add_argument("--force", action="store_true", help="also import files unchanged since their last import (import journal, --archive hash ledger)")
+    parser.add_argument("--resume", nargs="?", type=int, const=True, default=False, metavar="RUN_ID", help="resume the last unfinished import run (or this run), importing only its files not yet done")
+    parser.add_argument("--batch-size", type=int, default=None, help="loads per multi-row upsert (default IMPORT_BATCH_SIZE or 500)")
+    parser.add_argument("--parse-workers", type=int, default=None, help="parser processes for API imports (default IMPORT_PARSE_WORKERS or cores, at most 8)")
+    parser.add_argument("--queue-size", type=int, default=None, help="downloaded files waiting for a parser (default IMPORT_QUEUE_SIZE or 8)")
+    parser.add_argument("--bulk", action="store_true", help="with --dir/--archive, write through a staging table with LOAD DATA (season backfills)")
+    parser.add_argument("--bulk-flush-loads", type=int, default=None, help=f"with --bulk, loads staged per flush/commit (default {DEFAULT_FLUSH_LOADS})")
+    args = parser.parse_args()
+
+    if args.resume:
+        journal = ImportJournal.open()
+        run_id = journal.resumable_run(run_id=None if args.resume is True else args.resume)
+        run = journal.run_info(run_id) if run_id is not None else None
+        journal.close()
+        if run is None:
+            print("No unfinished import run to resume.")
+        elif run["kind"] == JOURNAL_KIND_IDS:
+            import_graincart_files_by_ids(
+                [], stream=run["options"].get("stream", args.stream), batch_size=args.batch_size,
+                resume=run_id, force=args.force,
+            )
+        else:
+            import_all_graincart_files(
+                max_workers=args.workers,
+                incremental=run["options"].get("incremental", args.incremental),
+                stream=run["options"].get("stream", args.stream),
+                batch_size=args.batch_size,
+                parse_workers=args.parse_workers,
+                queue_size=args.queue_size,
+                resume=run_id,
+                force=args.force,
+            )
+    elif args.archive:
+        for archive_path in args.archive:
+            import_grc_archive(
+                archive_path, workers=args.workers, force=args.force, batch_size=args.batch_size,
+                bulk=args.bulk, bulk_flush_loads=args.bulk_flush_loads,
+            )
+    elif args.source:
+        import_grc_directory(
+            args.source, workers=args.workers, batch_size=args.batch_size,
+            bulk=args.bulk, bulk_flush_loads=args.bulk_flush_loads,
+        )
+    elif args.file_ids:
+        import_graincart_files_by_ids(
+            parse_file_id_tokens(args.file_ids), stream=args.stream, batch_size=args.batch_size, force=args.force,
+        )
     else:
-        import_all_graincart_files()
+        import_all_graincart_files(
+            max_workers=args.workers,
+            incremental=args.incremental,
+            stream=args.stream,
+            selection=ManifestFilter(seasons=args.season, crops=args.crop, fields=args.field, carts=args.cart),
+            refresh=not args.no_refresh,
+            batch_size=args.batch_size,
+            parse_workers=args.parse_workers,
+            queue_size=args.queue_size,
+            force=args.force,
+        )
@@ -0,0 +1,345 @@
+"""
+import_journal.py
+
+Journal of importer runs, for checkpoint/resume and skipping unchanged files.
+
+What this file does
+-------------------
+- Records every run of import_grc.py (API or by-ID): when it started and
+  finished, its status and the files it planned to import
+- Records every file of a run as it is committed or fails: graincart ID,
+  name, Slingshot version, content sha256, status, load counts,
+  download/parse/write seconds and the error message
+- Finds the last run that did not complete (crashed, interrupted or with
+  failed files) and the files it still has to import, so that run can be
+  resumed instead of started over
+- Answers whether a file was already imported successfully with the same
+  version or content, so unchanged files are neither downloaded again nor
+  re-upserted
+
+Each successful import stores both the Slingshot last-modified value
+(when known) and the sha256 of the downloaded content, and a check only
+compares a value with the same kind of value: the version is known before
+downloading, so API runs skip on it; imports by ID often have no version
+and compare the content instead. Either way, a file imported by one path
+is recognised as unchanged by the other.
+
+A file is recorded only after its commit (or rollback), so after a crash
+the file that was being written is imported again on resume.
+
+Optional .env variables
+-----------------------
+IMPORT_JOURNAL=data/import_journal.sqlite
+
+Run
+---
+python import_journal.py              # recent runs
+python import_journal.py --run 12     # the files of run 12
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+
+DEFAULT_JOURNAL_PATH = "data/import_journal.sqlite"
+
+# Run statuses; only "completed" runs are never resumed.
+RUN_RUNNING = "running"
+RUN_COMPLETED = "completed"
+RUN_INCOMPLETE = "incomplete"   # finished, but some files failed
+RUN_INTERRUPTED = "interrupted"  # stopped by an exception or Ctrl+C
+
+# File statuses; "done" and "unchanged" are final, the others are retried on resume.
+FILE_PENDING = "pending"
+FILE_DONE = "done"
+FILE_UNCHANGED = "unchanged"
+FILE_ERROR = "error"
+FILE_FINAL_STATUSES = (FILE_DONE, FILE_UNCHANGED)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    options TEXT,
+    started_at TEXT NOT NULL,
+    finished_at TEXT
+);
+CREATE TABLE IF NOT EXISTS run_files (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+    file_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    file_name TEXT,
+    version TEXT,
+    content_sha256 TEXT,
+    status TEXT NOT NULL,
+    loads INTEGER,
+    imported INTEGER,
+    updated INTEGER,
+    skipped INTEGER,
+    download_seconds REAL,
+    parse_seconds REAL,
+    write_seconds REAL,
+    error TEXT,
+    finished_at TEXT,
+    PRIMARY KEY (run_id, file_id)
+);
+CREATE INDEX IF NOT EXISTS ix_run_files_file ON run_files (file_id, status);
+"""
+
+
+class ImportJournal:
+    def __init__(self, path: str | os.PathLike) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path))
+        self._db.row_factory = sqlite3.Row
+        self._db.executescript(SCHEMA)
+
+    @classmethod
+    def open(cls, path: Optional[str | os.PathLike] = None) -> "ImportJournal":
+        if path is None:
+            load_dotenv()
+            path = (os.getenv("IMPORT_JOURNAL") or DEFAULT_JOURNAL_PATH).strip()
+        return cls(path)
+
+    def close(self) -> None:
+        self._db.close()
+
+    # ------------------------------------------------------------------
+    # Runs
+    # ------------------------------------------------------------------
+    def start_run(self, kind: str, options: Optional[Dict[str, Any]] = None) -> int:
+        with self._db:
+            cursor = self._db.execute(
+                "INSERT INTO runs (kind, status, options, started_at) VALUES (?, ?, ?, ?)",
+                (kind, RUN_RUNNING, json.dumps(options or {}, default=str), _now()),
+            )
+        return int(cursor.lastrowid)
+
+    def resumable_run(self, kind: Optional[str] = None, run_id: Optional[int] = None) -> Optional[int]:
+        """
+        run_id if given and not completed, else the latest run that did not
+        complete; kind limits either to runs of that kind.
+        """
+        sql = "SELECT run_id FROM runs WHERE status <> ?"
+        params: List[Any] = [RUN_COMPLETED]
+        if kind is not None:
+            sql += " AND kind = ?"
+            params.append(kind)
+        if run_id:
+            sql += " AND run_id = ?"
+            params.append(run_id)
+        row = self._db.execute(sql + " ORDER BY run_id DESC LIMIT 1", params).fetchone()
+        return int(row["run_id"]) if row else None
+
+    def run_info(self, run_id: int) -> Optional[Dict[str, Any]]:
+        """kind, status and the options the run was started with."""
+        row = self._db.execute("SELECT kind, status, options FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        if row is None:
+            return None
+        return {"kind": row["kind"], "status": row["status"], "options": json.loads(row["options"] or "{}")}
+
+    def reopen_run(self, run_id: int) -> None:
+        with self._db:
+            self._db.execute(
+                "UPDATE runs SET status = ?, finished_at = NULL WHERE run_id = ?", (RUN_RUNNING, run_id)
+            )
+
+    def finish_run(self, run_id: int, status: Optional[str] = None) -> str:
+        """Close the run; without a status it is completed unless a file is still pending or failed."""
+        if status is None:
+            open_files = self._db.execute(
+                f"SELECT COUNT(*) FROM run_files WHERE run_id = ? AND status NOT IN ({_marks(FILE_FINAL_STATUSES)})",
+                (run_id, *FILE_FINAL_STATUSES),
+            ).fetchone()[0]
+            status = RUN_INCOMPLETE if open_files else RUN_COMPLETED
+        with self._db:
+            self._db.execute(
+                "UPDATE runs SET status = ?, finished_at = ? WHERE run_id = ?", (status, _now(), run_id)
+            )
+        return status
+
+    # ------------------------------------------------------------------
+    # Files
+    # ------------------------------------------------------------------
+    def plan_files(self, run_id: int, files: Iterable[Tuple[int, Optional[str], Optional[str]]]) -> None:
+        """Add (file ID, name, version) to the run as pending, keeping files already recorded."""
+        start = self._db.execute(
+            "SELECT COALESCE(MAX(position), 0) FROM run_files WHERE run_id = ?", (run_id,)
+        ).fetchone()[0]
+        with self._db:
+            self._db.executemany(
+                "INSERT OR IGNORE INTO run_files (run_id, file_id, position, file_name, version, status) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (run_id, int(file_id), start + index, file_name, version, FILE_PENDING)
+                    for index, (file_id, file_name, version) in enumerate(files, start=1)
+                ],
+            )
+
+    def remaining_files(self, run_id: int) -> List[Tuple[int, Optional[str], Optional[str]]]:
+        """(file ID, name, version) of the run's files not yet done, in planned order."""
+        rows = self._db.execute(
+            f"SELECT file_id, file_name, version FROM run_files "
+            f"WHERE run_id = ? AND status NOT IN ({_marks(FILE_FINAL_STATUSES)}) ORDER BY position",
+            (run_id, *FILE_FINAL_STATUSES),
+        ).fetchall()
+        return [(int(row["file_id"]), row["file_name"], row["version"]) for row in rows]
+
+    def is_unchanged(
+        self, file_id: int, version: Optional[str] = None, content_sha256: Optional[str] = None
+    ) -> bool:
+        """
+        True when the file's latest successful import had this version or
+        this content; a value the import did not record never matches.
+        """
+        if not version and not content_sha256:
+            return False
+        row = self._db.execute(
+            "SELECT version, content_sha256 FROM run_files WHERE file_id = ? AND status = ? "
+            "ORDER BY finished_at DESC, run_id DESC LIMIT 1",
+            (int(file_id), FILE_DONE),
+        ).fetchone()
+        if row is None:
+            return False
+        return bool(
+            (version and row["version"] == version)
+            or (content_sha256 and row["content_sha256"] == content_sha256)
+        )
+
+    def record_file(
+        self,
+        run_id: int,
+        file_id: int,
+        file_name: Optional[str],
+        status: str,
+        version: Optional[str] = None,
+        content_sha256: Optional[str] = None,
+        counts: Optional[Dict[str, int]] = None,
+        timings: Optional[Dict[str, float]] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        counts = counts or {}
+        timings = timings or {}
+        values = (
+            file_name,
+            version,
+            content_sha256,
+            status,
+            counts.get("loads"),
+            counts.get("imported"),
+            counts.get("updated"),
+            counts.get("skipped"),
+            _round(timings.get("download")),
+            _round(timings.get("parse")),
+            _round(timings.get("write")),
+            error,
+            _now(),
+        )
+        with self._db:
+            updated = self._db.execute(
+                """
+                UPDATE run_files SET
+                    file_name = COALESCE(?, file_name), version = COALESCE(?, version),
+                    content_sha256 = ?, status = ?,
+                    loads = ?, imported = ?, updated = ?, skipped = ?,
+                    download_seconds = ?, parse_seconds = ?, write_seconds = ?,
+                    error = ?, finished_at = ?
+                WHERE run_id = ? AND file_id = ?
+                """,
+                values + (run_id, int(file_id)),
+            ).rowcount
+            if not updated:
+                position = self._db.execute(
+                    "SELECT COALESCE(MAX(position), 0) + 1 FROM run_files WHERE run_id = ?", (run_id,)
+                ).fetchone()[0]
+                self._db.execute(
+                    """
+                    INSERT INTO run_files (
+                        file_name, version, content_sha256, status, loads, imported, updated, skipped,
+                        download_seconds, parse_seconds, write_seconds, error, finished_at,
+                        run_id, file_id, position
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    values + (run_id, int(file_id), position),
+                )
+
+    # ------------------------------------------------------------------
+    # Reports
+    # ------------------------------------------------------------------
+    def recent_runs(self, limit: int = 20) -> List[Dict[str, Any]]:
+        rows = self._db.execute(
+            """
+            SELECT r.run_id, r.kind, r.status, r.started_at, r.finished_at,
+                   COUNT(f.file_id) AS files,
+                   SUM(f.status = 'done') AS done,
+                   SUM(f.status = 'unchanged') AS unchanged,
+                   SUM(f.status = 'error') AS errors,
+                   SUM(f.status = 'pending') AS pending,
+                   SUM(f.imported) AS imported,
+                   SUM(f.updated) AS updated
+            FROM runs r LEFT JOIN run_files f ON f.run_id = r.run_id
+            GROUP BY r.run_id ORDER BY r.run_id DESC LIMIT ?
+            """,
+            (limit,),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def run_files(self, run_id: int) -> List[Dict[str, Any]]:
+        rows = self._db.execute("SELECT * FROM run_files WHERE run_id = ? ORDER BY position", (run_id,)).fetchall()
+        return [dict(row) for row in rows]
+
+
+def _marks(values: Tuple[Any, ...]) -> str:
+    return ", ".join("?" for _value in values)
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 3) if value is not None else None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Show the importer's run journal.")
+    parser.add_argument("--run", type=int, default=None, help="list the files of this run")
+    parser.add_argument("--limit", type=int, default=20, help="runs to list")
+    args = parser.parse_args()
+
+    journal = ImportJournal.open()
+    try:
+        if args.run is not None:
+            for row in journal.run_files(args.run):
+                seconds = sum(row[key] or 0 for key in ("download_seconds", "parse_seconds", "write_seconds"))
+                print(
+                    f"{row['file_id']:>10}  {row['status']:<9}  imported={row['imported'] or 0:<6} "
+                    f"updated={row['updated'] or 0:<6} {seconds:7.2f}s  {row['file_name'] or ''}"
+                    + (f"  ERROR: {row['error']}" if row["error"] else "")
+                )
+            return
+
+        for row in journal.recent_runs(args.limit):
+            print(
+                f"run {row['run_id']:>4}  {row['kind']:<4} {row['status']:<11} {row['started_at']} -> "
+                f"{row['finished_at'] or '...'}  files={row['files']} done={row['done'] or 0} "
+                f"unchanged={row['unchanged'] or 0} errors={row['errors'] or 0} pending={row['pending'] or 0} "
+                f"imported={row['imported'] or 0} updated={row['updated'] or 0}"
+            )
+    finally:
+        journal.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""
+import_pipeline.py
+
+Staged download -> parse -> write pipeline for the Slingshot importer.
+
+What this file does
+-------------------
+- Download threads fetch files into a bounded queue
+- A dispatcher hands downloaded files to a pool of parser processes
+- The caller's thread is the single DB writer: iter_pipeline() yields each
+  parsed file as soon as it is ready (completion order)
+- Every stage blocks when the stage after it is full, so a slow database
+  holds back parsing and downloads instead of letting files pile up in
+  memory; at most queue_size downloaded files and download_workers +
+  parse_workers + queue_size parsed files are held at any time
+- A failed download or parse is yielded as that file's error, so the
+  writer handles it like any other per-file failure and the rest of the
+  run carries on
+
+With all three stages busy at once, a run takes about as long as its
+slowest stage instead of the sum of all of them. PipelineStats tells
+which stage that is: a writer that spends most of its time waiting is fed
+too slowly (more download or parser workers help); a writer that never
+waits is the bottleneck itself.
+
+Optional .env variables
+-----------------------
+IMPORT_PARSE_WORKERS=4     # parser processes (default: cores, at most 8)
+IMPORT_QUEUE_SIZE=8        # downloaded files waiting for a parser
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple
+
+from dotenv import load_dotenv
+
+
+load_dotenv()
+
+DEFAULT_PARSE_WORKERS = max(1, min(8, os.cpu_count() or 1))
+PARSE_WORKERS = int((os.getenv("IMPORT_PARSE_WORKERS") or str(DEFAULT_PARSE_WORKERS)).strip())
+QUEUE_SIZE = int((os.getenv("IMPORT_QUEUE_SIZE") or "8").strip())
+
+# How often blocked stages look up to see whether the run was stopped.
+_POLL_SECONDS = 0.2
+_DONE = object()
+
+
+@dataclass
+class PipelineJob:
+    """One file to import; args are passed to the parse function after the file's bytes."""
+
+    file_id: int
+    args: Tuple[Any, ...] = ()
+
+
+@dataclass
+class PipelineResult:
+    """One file out of the pipeline; exactly one of result/error is set."""
+
+    job: PipelineJob
+    result: Any = None
+    error: Optional[BaseException] = None
+    download_seconds: float = 0.0
+    parse_seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class PipelineStats:
+    download_seconds: float = 0.0
+    parse_seconds: float = 0.0
+    writer_wait_seconds: float = 0.0
+    files: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add_download(self, seconds: float) -> None:
+        with self._lock:
+            self.download_seconds += seconds
+
+    def format_summary(self) -> str:
+        return (
+            f"Pipeline: {self.files} file(s); download {self.download_seconds:.1f}s, "
+            f"parse {self.parse_seconds:.1f}s (summed over workers), "
+            f"writer waiting {self.writer_wait_seconds:.1f}s"
+        )
+
+
+def iter_pipeline(
+    jobs: Iterable[PipelineJob],
+    download: Callable[[PipelineJob], bytes],
+    parse: Callable[..., Any],
+    download_workers: int,
+    parse_workers: Optional[int] = None,
+    queue_size: Optional[int] = None,
+    stats: Optional[PipelineStats] = None,
+) -> Iterator[PipelineResult]:
+    """
+    Run jobs through download threads and parser processes; yield results
+    to the caller (the writer) as files finish parsing.
+
+    download(job) runs on a thread and returns the file's bytes.
+    parse(content, *job.args) runs in a worker process, so it must be a
+    picklable module-level function returning a picklable result.
+
+    Closing the iterator early (or an exception in the caller's loop)
+    stops the downloads and cancels queued parses.
+    """
+    download_workers = max(1, download_workers)
+    parse_workers = max(1, parse_workers or PARSE_WORKERS)
+    queue_size = max(1, queue_size or QUEUE_SIZE)
+    stats = stats if stats is not None else PipelineStats()
+
+    job_iter = iter(jobs)
+    job_lock = threading.Lock()
+    stop = threading.Event()
+    downloaded: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+    results: "queue.Queue[Any]" = queue.Queue()
+    # Parsed files in flight or waiting for the writer; released as the
+    # writer takes them, which is what pushes back on the parsers.
+    parse_slots = threading.Semaphore(parse_workers + queue_size)
+
+    def put(target: "queue.Queue[Any]", item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                target.put(item, timeout=_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def download_worker() -> None:
+        try:
+            while not stop.is_set():
+                with job_lock:
+                    job = next(job_iter, None)
+                if job is None:
+                    break
+                started = time.monotonic()
+                try:
+                    content = download(job)
+                except Exception as exc:
+                    item = PipelineResult(job, error=exc, download_seconds=time.monotonic() - started)
+                else:
+                    item = (job, content, time.monotonic() - started)
+                stats.add_download(time.monotonic() - started)
+                if not put(downloaded, item):
+                    break
+        except BaseException as exc:
+            # e.g. the jobs iterable itself failing; ends the run.
+            results.put(exc)
+        finally:
+            put(downloaded, _DONE)
+
+    pool = ProcessPoolExecutor(max_workers=parse_workers)
+    state_lock = threading.Lock()
+    outstanding = 0
+    dispatch_done = False
+
+    def finish_one() -> None:
+        nonlocal outstanding
+        with state_lock:
+            outstanding -= 1
+            finished = dispatch_done and outstanding == 0
+        if finished:
+            results.put(_DONE)
+
+    def on_parsed(future: Future, job: PipelineJob, download_seconds: float) -> None:
+        if future.cancelled():
+            item = PipelineResult(job, error=RuntimeError("parse cancelled"), download_seconds=download_seconds)
+        elif future.exception() is not None:
+            item = PipelineResult(job, error=future.exception(), download_seconds=download_seconds)
+        else:
+            result, parse_seconds = future.result()
+            item = PipelineResult(job, result=result, download_seconds=download_seconds, parse_seconds=parse_seconds)
+        results.put(item)
+        finish_one()
+
+    def dispatcher() -> None:
+        nonlocal outstanding, dispatch_done
+        running = download_workers
+        try:
+            while running and not stop.is_set():
+                try:
+                    item = downloaded.get(timeout=_POLL_SECONDS)
+                except queue.Empty:
+                    continue
+                if item is _DONE:
+                    running -= 1
+                    continue
+
+                while not parse_slots.acquire(timeout=_POLL_SECONDS):
+                    if stop.is_set():
+                        return
+                if isinstance(item, PipelineResult):
+                    # A failed download goes straight to the writer.
+                    results.put(item)
+                    continue
+
+                job, content, download_seconds = item
+                with state_lock:
+                    outstanding += 1
+                try:
+                    future = pool.submit(_timed_parse, parse, content, *job.args)
+                except Exception as exc:
+                    results.put(PipelineResult(job, error=exc, download_seconds=download_seconds))
+                    finish_one()
+                    continue
+                future.add_done_callback(
+                    lambda done, job=job, seconds=download_seconds: on_parsed(done, job, seconds)
+                )
+        except BaseException as exc:
+            results.put(exc)
+        finally:
+            with state_lock:
+                dispatch_done = True
+                finished = outstanding == 0
+            if finished:
+                results.put(_DONE)
+
+    threads = [
+        threading.Thread(target=download_worker, name=f"pipeline-download-{index}", daemon=True)
+        for index in range(download_workers)
+    ]
+    threads.append(threading.Thread(target=dispatcher, name="pipeline-dispatch", daemon=True))
+    for thread in threads:
+        thread.start()
+
+    try:
+        while True:
+            started = time.monotonic()
+            item = results.get()
+            stats.writer_wait_seconds += time.monotonic() - started
+            if item is _DONE:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            parse_slots.release()
+            stats.files += 1
+            stats.parse_seconds += item.parse_seconds
+            yield item
+    finally:
+        stop.set()
+        pool.shutdown(wait=True, cancel_futures=True)
+        for thread in threads:
+            thread.join()
+
+
+def _timed_parse(parse: Callable[..., Any], content: bytes, *args: Any) -> Tuple[Any, float]:
+    # Runs in a worker process.
+    started = time.monotonic()
+    result = parse(content, *args)
+    return result, time.monotonic() - started
@@ -0,0 +1,258 @@
+"""
+slingshot_async_client.py
+
+asyncio variant of the Raven Slingshot API client.
+
+What this file does
+-------------------
+- Same public methods as SlingshotClient, as coroutines
+- Same SlingshotConfig, request signing and GRC parser (SlingshotClientBase)
+- One aiohttp connection pool per client, so hundreds of downloads and
+  summary page fetches can be in flight from a single process
+- Shares the RateLimiter / SlingshotMetrics types with the blocking client
+
+Usage
+-----
+    async with AsyncSlingshotClient() as client:
+        async for item in client.iter_all_graincart_summaries():
+            ...
+        raw = await client.download_graincart_bin(93123148)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Tuple
+
+import aiohttp
+
+from grc_cache import GrcFileCache
+from grc_parsed_cache import GrcParsedCache
+from slingshot_client import (
+    GraincartDownload,
+    RateLimiter,
+    SlingshotAuthError,
+    SlingshotClientBase,
+    SlingshotConfig,
+    SlingshotHTTPError,
+)
+from slingshot_metrics import SlingshotMetrics, endpoint_label
+
+
+class AsyncSlingshotClient(SlingshotClientBase):
+    def __init__(
+        self,
+        config: Optional[SlingshotConfig] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        metrics: Optional[SlingshotMetrics] = None,
+        max_connections: int = 100,
+        cache: Optional[GrcFileCache] = None,
+        parsed_cache: Optional[GrcParsedCache] = None,
+    ) -> None:
+        self.config = config or SlingshotConfig.from_env()
+        self.cache = cache if cache is not None else GrcFileCache.from_env()
+        self.parsed_cache = parsed_cache if parsed_cache is not None else GrcParsedCache.from_env()
+        self.rate_limiter = rate_limiter or RateLimiter.for_config(self.config)
+        self.metrics = metrics or SlingshotMetrics(trace_path=self.config.trace_file)
+        self.max_connections = max_connections
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> "AsyncSlingshotClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    async def get_access_key_summary(self) -> Dict[str, Any]:
+        return await self._get_json("/accesskey")
+
+    async def list_graincart_files(self, page: int = 0, pagesize: int = 100) -> Dict[str, Any]:
+        return await self._get_json("/graincart", params={"page": page, "pagesize": pagesize})
+
+    async def get_graincart_detail(self, graincart_id: int) -> Dict[str, Any]:
+        return await self._get_json(f"/graincart/{graincart_id}")
+
+    async def download_graincart_bin(self, graincart_id: int, version: Optional[str] = None) -> bytes:
+        # Cache reads/writes are small blocking file operations; keep them off the loop.
+        if self.cache is not None and version:
+            cached = await asyncio.to_thread(self.cache.get, graincart_id, version)
+            self.metrics.record_cache(cached is not None)
+            if cached is not None:
+                return cached
+
+        raw = await self._get_bytes(f"/graincart/{graincart_id}", params={"format": "bin"})
+
+        if self.cache is not None and version:
+            await asyncio.to_thread(self.cache.put, graincart_id, version, raw)
+        return raw
+
+    async def download_graincart_text(self, graincart_id: int, version: Optional[str] = None) -> str:
+        return self.decode_grc_bytes(await self.download_graincart_bin(graincart_id, version=version))
+
+    async def iter_graincart_downloads(
+        self,
+        graincart_ids: Iterable[int],
+        max_in_flight: Optional[int] = None,
+        versions: Optional[Dict[int, Optional[str]]] = None,
+    ) -> AsyncIterator[GraincartDownload]:
+        """
+        Download many .grc files concurrently and yield them as they finish.
+
+        Async counterpart of SlingshotClient.iter_graincart_downloads; at most
+        max_in_flight requests (default: the connection pool size) are open
+        at once.
+        """
+        unique_ids = list(dict.fromkeys(int(graincart_id) for graincart_id in graincart_ids))
+        if not unique_ids:
+            return
+
+        versions = versions or {}
+        semaphore = asyncio.Semaphore(max(1, max_in_flight or self.max_connections))
+
+        async def download_one(graincart_id: int) -> GraincartDownload:
+            async with semaphore:
+                started = time.monotonic()
+                try:
+                    content = await self.download_graincart_bin(graincart_id, version=versions.get(graincart_id))
+                except Exception as exc:
+                    return GraincartDownload(graincart_id=graincart_id, error=exc, seconds=time.monotonic() - started)
+                return GraincartDownload(graincart_id=graincart_id, content=content, seconds=time.monotonic() - started)
+
+        tasks = [asyncio.ensure_future(download_one(graincart_id)) for graincart_id in unique_ids]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Reached early when the caller stops iterating; wait for the
+            # cancelled downloads so none is left pending.
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def get_parsed_graincart_file(
+        self,
+        graincart_id: int,
+        file_name: Optional[str] = None,
+        version: Optional[str] = None,
+        lean: bool = False,
+    ) -> Dict[str, Any]:
+        raw = await self.download_graincart_bin(graincart_id, version=version)
+        # Parsing is CPU-bound and reads/writes the parsed cache; keep it off the loop.
+        return await asyncio.to_thread(
+            self.parse_grc_bytes, raw, graincart_id=graincart_id, file_name=file_name, lean=lean
+        )
+
+    async def iter_all_graincart_summaries(self, pagesize: int = 100) -> AsyncIterator[Dict[str, Any]]:
+        page = 0
+        while True:
+            payload = await self.list_graincart_files(page=page, pagesize=pagesize)
+            items = self._extract_summary_items(payload)
+
+            if not items:
+                break
+
+            for item in items:
+                yield item
+
+            if not payload.get("IsNextPage"):
+                break
+
+            page += 1
+
+    # ------------------------------------------------------------------
+    # HTTP helpers
+    # ------------------------------------------------------------------
+    def _get_session(self) -> aiohttp.ClientSession:
+        # Created lazily so the session binds to the running event loop.
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                ssl=None if self.config.verify_ssl else False,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.config.timeout),
+            )
+        return self._session
+
+    async def _get_json(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        status, body = await self._request("GET", path, params=params, accept="application/json")
+        try:
+            return json.loads(body)
+        except Exception as exc:
+            raise SlingshotHTTPError(
+                f"Expected JSON response from {path}, but parsing failed. "
+                f"HTTP {status}. Body starts with: {body[:500]!r}"
+            ) from exc
+
+    async def _get_bytes(self, path: str, params: Optional[Dict[str, Any]] = None) -> bytes:
+        _status, body = await self._request("GET", path, params=params, accept="*/*")
+        return body
+
+    async def _wait_for_request_budget(self) -> None:
+        wait_seconds = self.rate_limiter.reserve()
+        if wait_seconds > 0:
+            self.metrics.record_wait(wait_seconds)
+            await asyncio.sleep(wait_seconds)
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        accept: str = "application/json",
+    ) -> Tuple[int, bytes]:
+        method = method.upper()
+        path = self._normalize_path(path)
+
+        url = f"{self.config.base_url}{path}"
+        query = {key: str(value) for key, value in (params or {}).items()}
+        endpoint = endpoint_label(path, params)
+        session = self._get_session()
+
+        for attempt in range(self.config.max_retries):
+            await self._wait_for_request_budget()
+
+            headers = self._signed_headers(method=method, path=path, accept=accept)
+
+            started = time.monotonic()
+            async with session.request(method, url, params=query, headers=headers) as response:
+                body = await response.read()
+                self.metrics.record_response(
+                    method, endpoint, response.status, time.monotonic() - started, len(body), attempt
+                )
+
+                if response.status == 401:
+                    raise SlingshotAuthError(
+                        "Slingshot returned 401 Unauthorized.\n"
+                        f"Signed path: {path}\n"
+                        f"Response body: {body[:1000].decode('utf-8', errors='replace')}"
+                    )
+
+                if response.status == 429:
+                    self.rate_limiter.on_throttled(self._parse_retry_after(response.headers.get("Retry-After")))
+                    continue
+
+                if response.status >= 400:
+                    raise SlingshotHTTPError(
+                        f"Slingshot request failed: {method} {url} -> HTTP {response.status}\n"
+                        f"Response body: {body[:2000].decode('utf-8', errors='replace')}"
+                    )
+
+                self.rate_limiter.on_success()
+                return response.status, body
+
+        raise SlingshotHTTPError(
+            f"Slingshot request failed after {self.config.max_retries} attempts: {method} {url} -> HTTP 429\n"
+            "Response body: Exceeded maximum requests."
+        )
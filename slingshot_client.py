@@ -11,6 +11,7 @@ What this file does
 - Parses the text-based .grc file into:
     - header
     - loads
+  or, with parse_grc_columns(), typed column arrays (needs numpy/pandas)
 
 Required .env variables
 -----------------------
@@ -22,23 +23,53 @@ RAVEN_BASE_URL=https://api.ravenslingshot.com
 Optional:
 RAVEN_TIMEOUT=120
 RAVEN_VERIFY_SSL=true
+RAVEN_MAX_WORKERS=8
+RAVEN_RATE_LIMIT=5          # requests per second, shared by all threads; 0 = no client-side limit
+RAVEN_RATE_BURST=10
+RAVEN_MAX_RETRIES=12        # attempts per request while throttled (HTTP 429)
+RAVEN_GRC_CACHE_DIR=data/grc_cache   # see grc_cache.py; "off" disables
+RAVEN_GRC_CACHE_MAX_MB=512
+RAVEN_PARSED_CACHE_DIR=data/grc_cache/parsed   # see grc_parsed_cache.py; "off" disables
+RAVEN_PARSED_CACHE_MAX_MB=256
+RAVEN_TRACE_FILE=slingshot_trace.jsonl   # JSON-lines request trace, see slingshot_metrics.py
 """
 
 from __future__ import annotations
 
 import base64
+import codecs
 import csv
 import hashlib
 import hmac
+import io
 import json
 import os
+import random
+import threading
 import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from datetime import date, datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Any, BinaryIO, Deque, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
 from urllib.parse import urlparse
 
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+from grc_cache import GrcFileCache
+from grc_parsed_cache import GrcParsedCache
+from slingshot_metrics import SlingshotMetrics, endpoint_label
+from sync_state import SyncState
+
+
+GRC_STREAM_CHUNK_SIZE = 64 * 1024
+# Bump whenever tokenizing or header/load detection changes; it invalidates
+# every entry in the parsed cache (grc_parsed_cache.py).
+GRC_PARSER_VERSION = 2
 
 
 class SlingshotClientError(Exception):
@@ -61,6 +92,11 @@ class SlingshotConfig:
     base_url: str = "https://api.ravenslingshot.com"
     timeout: int = 120
     verify_ssl: bool = True
+    max_workers: int = 8
+    rate_limit: float = 5.0
+    rate_burst: int = 10
+    max_retries: int = 12
+    trace_file: Optional[str] = None
 
     @classmethod
     def from_env(cls) -> "SlingshotConfig":
@@ -72,6 +108,11 @@ class SlingshotConfig:
         base_url = (os.getenv("RAVEN_BASE_URL") or "https://api.ravenslingshot.com").strip().rstrip("/")
         timeout = int((os.getenv("RAVEN_TIMEOUT") or "120").strip())
         verify_ssl = (os.getenv("RAVEN_VERIFY_SSL") or "true").strip().lower() in {"1", "true", "yes", "y"}
+        max_workers = max(1, int((os.getenv("RAVEN_MAX_WORKERS") or "8").strip()))
+        rate_limit = float((os.getenv("RAVEN_RATE_LIMIT") or "5").strip())
+        rate_burst = max(1, int((os.getenv("RAVEN_RATE_BURST") or "10").strip()))
+        max_retries = max(1, int((os.getenv("RAVEN_MAX_RETRIES") or "12").strip()))
+        trace_file = (os.getenv("RAVEN_TRACE_FILE") or "").strip() or None
 
         missing = []
         if not api_key:
@@ -93,150 +134,583 @@ class SlingshotConfig:
             base_url=base_url,
             timeout=timeout,
             verify_ssl=verify_ssl,
+            max_workers=max_workers,
+            rate_limit=rate_limit,
+            rate_burst=rate_burst,
+            max_retries=max_retries,
+            trace_file=trace_file,
         )
 
 
-class SlingshotClient:
-    def __init__(self, config: Optional[SlingshotConfig] = None) -> None:
-        self.config = config or SlingshotConfig.from_env()
-        self.session = requests.Session()
+class RateLimiter:
+    """
+    Client-side request budget shared by every thread using a client.
 
-    # ------------------------------------------------------------------
-    # Public API
-    # ------------------------------------------------------------------
-    def get_access_key_summary(self) -> Dict[str, Any]:
-        return self._get_json("/accesskey")
+    reserve() claims one request slot and returns how many seconds the
+    caller must wait before sending it. It never sleeps itself, so the same
+    limiter works for blocking and asyncio callers.
 
-    def list_graincart_files(self, page: int = 0, pagesize: int = 100) -> Dict[str, Any]:
-        return self._get_json("/graincart", params={"page": page, "pagesize": pagesize})
+    This base class sets no budget of its own (RAVEN_RATE_LIMIT=0); it only
+    holds every caller back while the server asks it to after an HTTP 429.
+    """
 
-    def get_graincart_detail(self, graincart_id: int) -> Dict[str, Any]:
-        return self._get_json(f"/graincart/{graincart_id}")
+    def __init__(self, throttle_backoff: float = 1.0) -> None:
+        self.throttle_backoff = throttle_backoff
+        self._blocked_until = 0.0
+
+    @classmethod
+    def for_config(cls, config: "SlingshotConfig") -> "RateLimiter":
+        """Token bucket for config.rate_limit, or no client-side limit when it is 0 or less."""
+        if config.rate_limit <= 0:
+            return cls()
+        return TokenBucketRateLimiter(rate=config.rate_limit, capacity=config.rate_burst)
+
+    def reserve(self) -> float:
+        return max(0.0, self._blocked_until - time.monotonic())
+
+    def on_success(self) -> None:
+        pass
 
-    def download_graincart_bin(self, graincart_id: int) -> bytes:
-        return self._get_bytes(f"/graincart/{graincart_id}", params={"format": "bin"})
-    
-    def _extract_cart_code_from_bridge_id_or_file(self, row: Dict[str, Any]) -> Any:
+    def on_throttled(self, retry_after: Optional[float] = None) -> float:
+        """Record an HTTP 429 and return the wait applied to every caller."""
+        wait_seconds = retry_after if retry_after is not None else self.throttle_backoff
+        self._blocked_until = max(self._blocked_until, time.monotonic() + wait_seconds)
+        return wait_seconds
+
+
+class TokenBucketRateLimiter(RateLimiter):
+    """
+    Token bucket sized to the API quota, adapting to 429 responses.
+
+    A 429 halves the refill rate and blocks the bucket until Retry-After
+    (or a short backoff when the server gives no hint). Each success then
+    recovers a slice of the configured rate until it is back at full speed.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        min_rate: float = 0.2,
+        recovery: float = 0.05,
+        max_backoff: float = 60.0,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be greater than zero")
+
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self.min_rate = min(float(min_rate), self.max_rate)
+        self.recovery = recovery
+        self.max_backoff = max_backoff
+
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._consecutive_throttles = 0
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1.0
+
+            # _updated is in the future while the bucket is blocked by a 429.
+            wait_seconds = max(0.0, self._updated - now)
+            if self._tokens < 0:
+                wait_seconds += -self._tokens / self.rate
+            return wait_seconds
+
+    def on_success(self) -> None:
+        with self._lock:
+            self._consecutive_throttles = 0
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * self.recovery)
+
+    def on_throttled(self, retry_after: Optional[float] = None) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._consecutive_throttles += 1
+            self.rate = max(self.min_rate, self.rate / 2.0)
+
+            # The server's hint is honoured as given; max_backoff only caps
+            # the client's own backoff.
+            if retry_after is not None:
+                wait_seconds = max(0.0, retry_after)
+            else:
+                backoff = min(self.max_backoff, 2.0 ** (self._consecutive_throttles - 1))
+                wait_seconds = backoff * (0.5 + random.random() / 2.0)
+
+            # Nothing refills and nobody sends until the wait is over.
+            self._tokens = min(self._tokens, 0.0)
+            self._updated = max(self._updated, now + wait_seconds)
+            return wait_seconds
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+
+@dataclass
+class GraincartDownload:
+    """Result of one file in a bulk download; exactly one of content/error is set."""
+
+    graincart_id: int
+    content: Optional[bytes] = None
+    error: Optional[Exception] = None
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+# Logical load fields and the .grc column names they are read from, in order
+# of preference: the first alias with a non-empty value wins.
+LOAD_FIELD_ALIASES: Dict[str, List[str]] = {
+    "load_num": ["LoadNumber"],
+    # GRC load rows normally have no cart column; the importer then falls
+    # back to the header's BridgeId (00:00:00:00:58:95 -> cart code 58:95).
+    "cart_id": ["Cart ID", "CartID", "Cart"],
+    "weight": ["Weight"],
+    "truck": ["TruckID", "Truck"],
+    "dest": ["Destination", "Dest"],
+    "moisture": ["Moisture", "MeasuredMoisture"],
+    "comment": ["Comment", "Comments"],
+    "test_weight": ["TestWeight", "Test Weight"],
+    "wet": ["WetBushels", "Wet"],
+    "dry": ["DryBushels", "Dry"],
+    "variety": ["Variety"],
+    "load_cell": ["LoadCellCAL", "LoadCell", "Load Cell"],
+    "date": ["LocalDate", "LoadDate"],
+    "time": ["LocalTime", "LoadTime"],
+}
+NUMERIC_LOAD_FIELDS = ("weight", "moisture", "test_weight", "wet", "dry")
+LOAD_DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y")
+
+
+class GrcLoad:
+    """
+    Compact load record returned by the lean parse mode (lean=True).
+
+    Holds the same fields as the normalized load dicts in __slots__ instead
+    of a per-load dict; raw (the {column: value} dict) is only filled when
+    keep_raw=True. get(), [] and "in" work as on the dicts, so code such as
+    insert_harvest_load takes either form.
+    """
+
+    # Positional order used by LoadRowPlan: text fields, numeric fields, then dates.
+    __slots__ = (
+        "load_num", "cart_id", "truck", "dest", "comment", "variety", "load_cell",
+        "weight", "moisture", "test_weight", "wet", "dry",
+        "date", "load_date", "raw",
+    )
+
+    load_num: Optional[str]
+    cart_id: Optional[str]
+    truck: Optional[str]
+    dest: Optional[str]
+    comment: Optional[str]
+    variety: Optional[str]
+    load_cell: Optional[str]
+    weight: Optional[float]
+    moisture: Optional[float]
+    test_weight: Optional[float]
+    wet: Optional[float]
+    dry: Optional[float]
+    date: Optional[str]
+    load_date: Optional[date]
+    raw: Optional[Dict[str, Optional[str]]]
+
+    def __init__(
+        self,
+        load_num: Optional[str] = None,
+        cart_id: Optional[str] = None,
+        truck: Optional[str] = None,
+        dest: Optional[str] = None,
+        comment: Optional[str] = None,
+        variety: Optional[str] = None,
+        load_cell: Optional[str] = None,
+        weight: Optional[float] = None,
+        moisture: Optional[float] = None,
+        test_weight: Optional[float] = None,
+        wet: Optional[float] = None,
+        dry: Optional[float] = None,
+        date: Optional[str] = None,
+        load_date: Optional[date] = None,
+        raw: Optional[Dict[str, Optional[str]]] = None,
+    ) -> None:
+        self.load_num = load_num
+        self.cart_id = cart_id
+        self.truck = truck
+        self.dest = dest
+        self.comment = comment
+        self.variety = variety
+        self.load_cell = load_cell
+        self.weight = weight
+        self.moisture = moisture
+        self.test_weight = test_weight
+        self.wet = wet
+        self.dry = dry
+        self.date = date
+        self.load_date = load_date
+        self.raw = raw
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in self.__slots__:
+            return default
+        value = getattr(self, key)
+        if key == "raw" and value is None:
+            return default
+        return value
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__ or (key == "raw" and self.raw is None):
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.__slots__ and (key != "raw" or self.raw is not None)
+
+    def __getstate__(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state: Tuple[Any, ...]) -> None:
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, GrcLoad):
+            return NotImplemented
+        return self.__getstate__() == other.__getstate__()
+
+    def __repr__(self) -> str:
+        return f"GrcLoad(load_num={self.load_num!r}, weight={self.weight!r}, date={self.date!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The equivalent normalized load dict ("raw" only if it was kept)."""
+        values = {name: getattr(self, name) for name in self.__slots__}
+        if values["raw"] is None:
+            del values["raw"]
+        return values
+
+
+class LoadRowPlan:
+    """
+    Column positions for one load-column layout, compiled once per header
+    signature (see compile_load_row_plan) and applied to every row.
+
+    normalize() produces the same dict as the old per-row alias lookups,
+    plus "load_date": the load's date as a datetime.date (or None), parsed
+    with the date format detected on the first row. normalize_lean()
+    produces the same values as a GrcLoad.
+    """
+
+    def __init__(self, load_columns: Tuple[str, ...]) -> None:
+        self.load_columns = load_columns
+        # A repeated column name keeps the last one, as dict(zip(...)) would.
+        positions = {name: index for index, name in enumerate(load_columns)}
+        self.indexes: Dict[str, Tuple[int, ...]] = {
+            field: tuple(positions[alias] for alias in aliases if alias in positions)
+            for field, aliases in LOAD_FIELD_ALIASES.items()
+        }
+        self.text_fields = [
+            (field, self.indexes[field])
+            for field in LOAD_FIELD_ALIASES
+            if field not in NUMERIC_LOAD_FIELDS and field not in ("date", "time")
+        ]
+        self.numeric_fields = [(field, self.indexes[field]) for field in NUMERIC_LOAD_FIELDS]
+        self.date_format: Optional[str] = None
+        # A file holds loads from only a handful of days, so parsed dates are memoized.
+        self._dates: Dict[str, Optional[date]] = {}
+
+    def normalize(self, cells: List[Optional[str]]) -> Dict[str, Any]:
+        """cells must have one entry per load column (pad short rows with None)."""
+        pick = self._pick
+        load: Dict[str, Any] = {}
+        for field, indexes in self.text_fields:
+            load[field] = pick(cells, indexes)
+        to_float = self._to_float
+        for field, indexes in self.numeric_fields:
+            load[field] = to_float(pick(cells, indexes))
+
+        load_date = pick(cells, self.indexes["date"])
+        load_time = pick(cells, self.indexes["time"])
+        load["date"] = f"{load_date} {load_time}" if load_date and load_time else load_date
+        if load_date is None:
+            load["load_date"] = None
+        else:
+            parsed = self._dates.get(load_date, False)
+            load["load_date"] = parsed if parsed is not False else self.parse_date(load_date)
+        load["raw"] = dict(zip(self.load_columns, cells))
+        return load
+
+    def normalize_lean(self, cells: List[Optional[str]], keep_raw: bool = False) -> GrcLoad:
+        """Like normalize(), but returns a GrcLoad; raw is only built when keep_raw is set."""
+        pick = self._pick
+        to_float = self._to_float
+        values: List[Any] = [pick(cells, indexes) for _field, indexes in self.text_fields]
+        values.extend(to_float(pick(cells, indexes)) for _field, indexes in self.numeric_fields)
+
+        load_date = pick(cells, self.indexes["date"])
+        load_time = pick(cells, self.indexes["time"])
+        values.append(f"{load_date} {load_time}" if load_date and load_time else load_date)
+        if load_date is None:
+            values.append(None)
+        else:
+            parsed = self._dates.get(load_date, False)
+            values.append(parsed if parsed is not False else self.parse_date(load_date))
+        values.append(dict(zip(self.load_columns, cells)) if keep_raw else None)
+        return GrcLoad(*values)
+
+    def normalize_columns(
+        self,
+        columns: List[List[Optional[str]]],
+        lean: bool = False,
+        keep_raw: bool = True,
+    ) -> List[Any]:
         """
-        GRC load rows do not have a Cart ID column.
-        The cart identifier is usually represented by BridgeId in the file header,
-        such as 00:00:00:00:58:95 -> cart code 58:95.
+        Same result as normalize() for every row, computed column by column.
 
-        Since _normalize_load_row only receives the row, this returns None here.
-        The importer should fall back to header['bridge_id'] when cart_id is missing.
+        columns holds one equally long cell list per load column. Used when
+        all loads are at hand anyway (parse_grc_bytes with the parsed
+        cache), where one pass per field beats one pass per row. With lean
+        the loads are GrcLoad records, and raw is only built if keep_raw.
         """
-        return self._get_first(row, ["Cart ID", "CartID", "Cart"])
+        count = len(columns[0]) if columns else 0
+
+        def pick(indexes: Tuple[int, ...]) -> List[Optional[str]]:
+            if not indexes:
+                return [None] * count
+            picked = [value or None for value in columns[indexes[0]]]
+            for index in indexes[1:]:
+                picked = [first or value or None for first, value in zip(picked, columns[index])]
+            return picked
+
+        keys: List[str] = []
+        fields: List[List[Any]] = []
+        for field, indexes in self.text_fields:
+            keys.append(field)
+            fields.append(pick(indexes))
+        to_float = self._to_float
+        for field, indexes in self.numeric_fields:
+            keys.append(field)
+            fields.append([to_float(value) for value in pick(indexes)])
+
+        load_dates = pick(self.indexes["date"])
+        load_times = pick(self.indexes["time"])
+        keys.append("date")
+        fields.append([f"{day} {time_}" if day and time_ else day for day, time_ in zip(load_dates, load_times)])
+        dates = {text: self.parse_date(text) for text in set(load_dates) if text is not None}
+        dates[None] = None
+        keys.append("load_date")
+        fields.append([dates[text] for text in load_dates])
+
+        if lean:
+            # GrcLoad takes its fields positionally in exactly this order.
+            raws = [dict(zip(self.load_columns, cells)) for cells in zip(*columns)] if keep_raw else [None] * count
+            return [GrcLoad(*values) for values in zip(*fields, raws)]
+
+        keys.append("raw")
+        fields.append([dict(zip(self.load_columns, cells)) for cells in zip(*columns)])
+        return [dict(zip(keys, values)) for values in zip(*fields)]
+
+    def parse_date(self, text: Optional[str]) -> Optional[date]:
+        if text is None:
+            return None
+        if len(self._dates) > 4096:
+            self._dates.clear()
+
+        formats = LOAD_DATE_FORMATS
+        if self.date_format is not None:
+            formats = (self.date_format,) + tuple(fmt for fmt in LOAD_DATE_FORMATS if fmt != self.date_format)
 
-    def download_graincart_text(self, graincart_id: int) -> str:
-        raw = self.download_graincart_bin(graincart_id)
-        for encoding in ("utf-8", "utf-8-sig", "latin-1"):
+        parsed = None
+        for fmt in formats:
             try:
-                return raw.decode(encoding)
-            except UnicodeDecodeError:
+                parsed = datetime.strptime(text, fmt).date()
+            except ValueError:
                 continue
-        return raw.decode("utf-8", errors="replace")
+            self.date_format = fmt
+            break
 
-    def get_parsed_graincart_file(self, graincart_id: int, file_name: Optional[str] = None) -> Dict[str, Any]:
-        text = self.download_graincart_text(graincart_id)
-        return self.parse_grc_text(text=text, graincart_id=graincart_id, file_name=file_name)
+        self._dates[text] = parsed
+        return parsed
 
-    def iter_all_graincart_summaries(self, pagesize: int = 100):
-        page = 0
-        while True:
-            payload = self.list_graincart_files(page=page, pagesize=pagesize)
-            items = self._extract_summary_items(payload)
+    @staticmethod
+    def _pick(cells: List[Optional[str]], indexes: Tuple[int, ...]) -> Optional[str]:
+        for index in indexes:
+            value = cells[index]
+            if value:
+                return value
+        return None
 
-            if not items:
-                break
+    @staticmethod
+    def _to_float(value: Optional[str]) -> Optional[float]:
+        if value is None:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            return SlingshotClientBase._safe_decimal(value)
 
-            for item in items:
-                yield item
 
-            if not payload.get("IsNextPage"):
-                break
+@lru_cache(maxsize=64)
+def compile_load_row_plan(load_columns: Tuple[str, ...], grc_version: Optional[str] = None) -> LoadRowPlan:
+    """
+    Return the (cached) plan for a load-column layout.
 
-            page += 1
+    Keyed by the column list plus GrcVersion, so every file written with
+    the same layout shares one plan.
+    """
+    return LoadRowPlan(load_columns)
 
-    # ------------------------------------------------------------------
-    # HTTP helpers
-    # ------------------------------------------------------------------
-    def _get_json(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        response = self._request("GET", path, params=params, accept="application/json")
-        try:
-            return response.json()
-        except Exception as exc:
-            raise SlingshotHTTPError(
-                f"Expected JSON response from {path}, but parsing failed. "
-                f"HTTP {response.status_code}. Body starts with: {response.text[:500]}"
-            ) from exc
 
-    def _get_bytes(self, path: str, params: Optional[Dict[str, Any]] = None) -> bytes:
-        response = self._request("GET", path, params=params, accept="*/*")
-        return response.content
+@dataclass
+class GrcStream:
+    """A parsed .grc header plus a lazy iterator over its normalized loads (dicts, or GrcLoad when lean)."""
 
-    def _request(
-        self,
-        method: str,
-        path: str,
-        params: Optional[Dict[str, Any]] = None,
-        accept: str = "application/json",
-    ) -> requests.Response:
-        method = method.upper()
-        path = self._normalize_path(path)
+    graincart_id: Optional[int]
+    header: Dict[str, Any]
+    raw_header: Dict[str, str]
+    load_columns: List[str]
+    loads: Iterator[Any]
 
-        url = f"{self.config.base_url}{path}"
+    def to_parsed(self) -> Dict[str, Any]:
+        """Materialize into the dict shape returned by parse_grc_text."""
+        return {
+            "graincart_id": self.graincart_id,
+            "header": self.header,
+            "loads": list(self.loads),
+            "raw_header": self.raw_header,
+            "load_columns": self.load_columns,
+        }
 
-        max_attempts = 6
-        for attempt in range(max_attempts):
-            timestamp = self._unix_timestamp()
-            signature = self._build_signature(method=method, path=path, timestamp=timestamp)
 
-            headers = {
-                "X-SS-APIKey": self.config.api_key,
-                "X-SS-AccessKey": self.config.access_key,
-                "X-SS-TimeStamp": timestamp,
-                "X-SS-Signature": signature,
-                "Accept": accept,
-            }
+@dataclass
+class GrcLoadCursor:
+    """
+    How much of a .grc file's load section has been imported.
 
-            response = self.session.request(
-                method=method,
-                url=url,
-                params=params,
-                headers=headers,
-                timeout=self.config.timeout,
-                verify=self.config.verify_ssl,
-            )
+    fingerprint covers the identifying header values, the load columns and
+    the first load_lines load lines, so a file that only had loads appended
+    still matches while an edited or rewritten one does not.
+    """
 
-            if response.status_code == 401:
-                raise SlingshotAuthError(
-                    "Slingshot returned 401 Unauthorized.\n"
-                    f"Signed path: {path}\n"
-                    f"Response body: {response.text[:1000]}"
-                )
+    load_lines: int = 0
+    fingerprint: Optional[str] = None
+    last_load_number: Optional[str] = None
 
-            if response.status_code == 429:
-                wait_seconds = min(60, 5 * (attempt + 1))
-                print(f"Slingshot throttled {method} {path}. Waiting {wait_seconds}s and retrying...")
-                time.sleep(wait_seconds)
-                continue
 
-            if not response.ok:
-                raise SlingshotHTTPError(
-                    f"Slingshot request failed: {method} {url} -> HTTP {response.status_code}\n"
-                    f"Response body: {response.text[:2000]}"
-                )
+@dataclass
+class GrcColumns:
+    """
+    A parsed .grc file with its load section as typed column arrays.
 
-            return response
+    columns uses the same keys as the normalized load dicts (weight, dry,
+    truck, ...). Numeric fields are float64 arrays with NaN for missing
+    values, "date" is a datetime64 array (NaT when missing) and the text
+    fields are object arrays with None for missing values.
+    """
 
-        raise SlingshotHTTPError(
-            f"Slingshot request failed after retries: {method} {url} -> HTTP 429\n"
-            "Response body: Exceeded maximum requests."
-        )
+    graincart_id: Optional[int]
+    header: Dict[str, Any]
+    raw_header: Dict[str, str]
+    load_columns: List[str]
+    columns: Dict[str, Any]
+
+    def __len__(self) -> int:
+        return len(self.columns["load_num"]) if self.columns else 0
+
+    def to_frame(self):
+        """Return the loads as a pandas DataFrame, one column per field."""
+        import pandas as pd
+
+        return pd.DataFrame(self.columns)
+
+
+class SlingshotClientBase:
+    """
+    Transport-independent parts of the Slingshot client: request signing,
+    response helpers and the GRC parser. Shared by SlingshotClient and
+    AsyncSlingshotClient (slingshot_async_client.py).
+    """
+
+    config: SlingshotConfig
+    # Set by the clients from RAVEN_PARSED_CACHE_DIR; a bare SlingshotClientBase() parses uncached.
+    parsed_cache: Optional[GrcParsedCache] = None
+
+    def parse_grc_bytes(
+        self,
+        raw: bytes,
+        graincart_id: Optional[int] = None,
+        file_name: Optional[str] = None,
+        lean: bool = False,
+        keep_raw: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Parse raw .grc bytes into the parse_grc_text dict shape.
+
+        lean=True returns the loads as GrcLoad records without the per-load
+        raw column dict (unless keep_raw=True), which is what batch imports
+        want: a fraction of the memory of the default load dicts.
+        """
+        header_map, load_columns, columns = self._grc_cells(raw)
+
+        loads: List[Any] = []
+        if load_columns:
+            plan = compile_load_row_plan(tuple(load_columns), header_map.get("GrcVersion"))
+            loads = plan.normalize_columns(columns, lean=lean, keep_raw=keep_raw or not lean)
+
+        return {
+            "graincart_id": graincart_id,
+            "header": self._build_header(header_map, file_name),
+            "loads": loads,
+            "raw_header": header_map,
+            "load_columns": load_columns,
+        }
+
+    def _grc_cells(self, raw: bytes) -> Tuple[Dict[str, str], List[str], List[List[Optional[str]]]]:
+        """
+        Tokenize raw .grc bytes into (header rows, load columns, one cell
+        list per load column), served from the parsed cache when possible.
+        """
+        digest = None
+        if self.parsed_cache is not None:
+            digest = hashlib.sha256(raw).hexdigest()
+            cached = self.parsed_cache.get(digest, GRC_PARSER_VERSION)
+            if cached is not None:
+                return cached
+
+        rows = self._iter_grc_rows(self.decode_grc_bytes(raw).splitlines())
+        header_map, load_columns = self._read_grc_header(rows)
+        width = len(load_columns)
+        load_rows = [row[:width] + [None] * (width - len(row)) for row in rows] if width else []
+        columns = [list(column) for column in zip(*load_rows)] if load_rows else [[] for _ in load_columns]
+
+        if digest is not None:
+            self.parsed_cache.put(digest, GRC_PARSER_VERSION, header_map, load_columns, columns)
+        return header_map, load_columns, columns
 
     # ------------------------------------------------------------------
     # Signature
     # ------------------------------------------------------------------
+    def _signed_headers(self, method: str, path: str, accept: str) -> Dict[str, str]:
+        timestamp = self._unix_timestamp()
+        signature = self._build_signature(method=method, path=path, timestamp=timestamp)
+
+        return {
+            "X-SS-APIKey": self.config.api_key,
+            "X-SS-AccessKey": self.config.access_key,
+            "X-SS-TimeStamp": timestamp,
+            "X-SS-Signature": signature,
+            "Accept": accept,
+        }
+
     def _build_signature(self, method: str, path: str, timestamp: str) -> str:
         parsed = urlparse(self.config.base_url)
         host = parsed.netloc.lower()
@@ -269,7 +743,14 @@ class SlingshotClient:
     # ------------------------------------------------------------------
     # GRC parser
     # ------------------------------------------------------------------
-    def parse_grc_text(self, text: str, graincart_id: Optional[int] = None, file_name: Optional[str] = None) -> Dict[str, Any]:
+    def parse_grc_text(
+        self,
+        text: str | bytes,
+        graincart_id: Optional[int] = None,
+        file_name: Optional[str] = None,
+        lean: bool = False,
+        keep_raw: bool = False,
+    ) -> Dict[str, Any]:
         """
         Parse text-based .grc file.
 
@@ -278,55 +759,201 @@ class SlingshotClient:
         - one units row
         - one actual load header row
         - load data rows
-        """
-        lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
 
-        parsed_rows: List[List[str]] = []
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-
-            row = next(csv.reader([line]))
-            row = [cell.strip() for cell in row]
-
-            while row and row[-1] == "":
-                row.pop()
+        Bytes are accepted too and decoded once (see parse_grc_bytes, also
+        for lean and keep_raw).
+        """
+        if isinstance(text, (bytes, bytearray)):
+            return self.parse_grc_bytes(bytes(text), graincart_id=graincart_id, file_name=file_name, lean=lean, keep_raw=keep_raw)
+        return self.stream_grc_lines(
+            text.splitlines(), graincart_id=graincart_id, file_name=file_name, lean=lean, keep_raw=keep_raw
+        ).to_parsed()
 
-            if row:
-                parsed_rows.append(row)
+    def parse_grc_columns(
+        self,
+        data: str | bytes,
+        graincart_id: Optional[int] = None,
+        file_name: Optional[str] = None,
+    ) -> GrcColumns:
+        """
+        Parse a .grc file into typed column arrays instead of per-load dicts.
 
-        header_map: Dict[str, str] = {}
-        load_columns: List[str] = []
-        loads: List[Dict[str, Any]] = []
+        Uses the same aliases and number cleanup as _normalize_load_row, but
+        converts each field for the whole file at once with pandas. Bytes
+        go through the parsed cache like parse_grc_bytes. Needs numpy and
+        pandas, which are imported here so the rest of the client does not
+        depend on them.
+        """
+        import numpy as np
+        import pandas as pd
+
+        raw = data.encode("utf-8") if isinstance(data, str) else bytes(data)
+        header_map, load_columns, cells = self._grc_cells(raw)
+
+        width = len(load_columns)
+        frame = pd.DataFrame({index: pd.Series(column, dtype=object) for index, column in enumerate(cells)}, columns=range(width))
+        # Same as building a dict per row: a repeated column name keeps the last one.
+        positions = {name: index for index, name in enumerate(load_columns)}
+
+        def pick(aliases: List[str]):
+            """Per row, the first alias with a non-empty value (like LoadRowPlan)."""
+            picked = pd.Series([None] * len(frame), dtype=object)
+            for alias in reversed(aliases):
+                if alias in positions:
+                    column = frame[positions[alias]]
+                    picked = column.where(column.notna() & (column != ""), picked)
+            return picked
+
+        def numbers(aliases: List[str]):
+            values = pick(aliases)
+            parsed = pd.to_numeric(values, errors="coerce").astype(np.float64)
+            # Only values like "1,234" or "980 lbs" need _safe_decimal's cleanup.
+            retry = parsed.isna() & values.notna()
+            if retry.any():
+                cleaned = values[retry].astype(str).str.replace(r",| lbs| lb| bu", "", regex=True)
+                parsed[retry] = pd.to_numeric(cleaned, errors="coerce")
+            return parsed.to_numpy(dtype=np.float64, na_value=np.nan)
+
+        def texts(aliases: List[str]):
+            return pick(aliases).to_numpy(dtype=object)
+
+        # Slingshot keeps only the tens digit of the seconds (09:26:4 is 09:26:40-49).
+        stamps = [
+            (f"{day} {time_}0" if time_[-2:-1] == ":" else f"{day} {time_}") if day and time_ else day
+            for day, time_ in zip(pick(LOAD_FIELD_ALIASES["date"]), pick(LOAD_FIELD_ALIASES["time"]))
+        ]
+
+        columns = {
+            field: numbers(aliases) if field in NUMERIC_LOAD_FIELDS else texts(aliases)
+            for field, aliases in LOAD_FIELD_ALIASES.items()
+            if field not in ("date", "time")
+        }
+        columns["date"] = pd.to_datetime(
+            pd.Series(stamps, dtype=object), errors="coerce", format="mixed"
+        ).to_numpy(dtype="datetime64[ns]")
+
+        return GrcColumns(
+            graincart_id=graincart_id,
+            header=self._build_header(header_map, file_name),
+            raw_header=header_map,
+            load_columns=load_columns,
+            columns=columns,
+        )
 
-        i = 0
-        while i < len(parsed_rows):
-            row = parsed_rows[i]
+    def stream_grc_lines(
+        self,
+        lines: Iterable[str],
+        graincart_id: Optional[int] = None,
+        file_name: Optional[str] = None,
+        lean: bool = False,
+        keep_raw: bool = False,
+    ) -> GrcStream:
+        """
+        Parse a .grc file lazily from an iterable of text lines.
 
-            # Detect the real load header row
-            if self._looks_like_load_header(row):
-                load_columns = row
-                i += 1
+        Single pass: the header rows are read eagerly (they always precede
+        the load section) until the load header row is seen, then the same
+        row iterator switches to load mode; loads are normalized one at a
+        time as the returned stream's .loads iterator is consumed (as
+        GrcLoad records when lean, see parse_grc_bytes).
+        """
+        rows = self._iter_grc_rows(lines)
+        header_map, load_columns = self._read_grc_header(rows)
+        loads = iter(())
+        if load_columns:
+            plan = compile_load_row_plan(tuple(load_columns), header_map.get("GrcVersion"))
+            loads = self._iter_load_rows(rows, plan, lean=lean, keep_raw=keep_raw)
+
+        return GrcStream(
+            graincart_id=graincart_id,
+            header=self._build_header(header_map, file_name),
+            raw_header=header_map,
+            load_columns=load_columns,
+            loads=loads,
+        )
 
-                # All following rows are load rows until file ends
-                while i < len(parsed_rows):
-                    data_row = parsed_rows[i]
+    def stream_grc_appended(
+        self,
+        raw: bytes,
+        cursor: Optional[GrcLoadCursor] = None,
+        graincart_id: Optional[int] = None,
+        file_name: Optional[str] = None,
+        lean: bool = False,
+        keep_raw: bool = False,
+    ) -> Tuple[GrcStream, GrcLoadCursor, int]:
+        """
+        Parse only the loads added to a file since cursor was taken.
 
-                    # skip blank/separator-like rows
-                    if not data_row:
-                        i += 1
-                        continue
+        Returns (stream, new cursor, skipped). When the cursor still matches
+        the start of the load section, the first skipped load lines are
+        hashed but never tokenized or normalized, and stream.loads holds only
+        the new trailing loads. Otherwise skipped is 0 and stream.loads holds
+        every load. The new cursor covers the whole file.
+        """
+        line_iter = iter(self.decode_grc_bytes(raw).splitlines())
+        # The row generator pulls one line at a time, so once the load header
+        # is found line_iter is positioned on the first load line.
+        header_map, load_columns = self._read_grc_header(self._iter_grc_rows(line_iter))
+
+        # The same lines the tokenizer would keep: not blank and not only commas.
+        load_lines = [line for line in (raw_line.strip() for raw_line in line_iter) if line.strip(" \t,")]
+
+        skipped = 0
+        if (
+            cursor is not None
+            and cursor.fingerprint
+            and 0 < cursor.load_lines <= len(load_lines)
+            and self._load_fingerprint(header_map, load_columns, load_lines[:cursor.load_lines]) == cursor.fingerprint
+        ):
+            skipped = cursor.load_lines
+
+        loads = iter(())
+        last_load_number = None
+        if load_columns:
+            plan = compile_load_row_plan(tuple(load_columns), header_map.get("GrcVersion"))
+            loads = self._iter_load_rows(self._iter_grc_rows(load_lines[skipped:]), plan, lean=lean, keep_raw=keep_raw)
+            last_load = next(self._iter_load_rows(self._iter_grc_rows(load_lines[-1:]), plan, lean=True), None)
+            if last_load is not None:
+                last_load_number = last_load.load_num
+
+        stream = GrcStream(
+            graincart_id=graincart_id,
+            header=self._build_header(header_map, file_name),
+            raw_header=header_map,
+            load_columns=load_columns,
+            loads=loads,
+        )
+        new_cursor = GrcLoadCursor(
+            load_lines=len(load_lines),
+            fingerprint=self._load_fingerprint(header_map, load_columns, load_lines),
+            last_load_number=last_load_number,
+        )
+        return stream, new_cursor, skipped
 
-                    load_row = {}
-                    for col_idx, col_name in enumerate(load_columns):
-                        value = data_row[col_idx] if col_idx < len(data_row) else None
-                        load_row[col_name] = value
+    @staticmethod
+    def _load_fingerprint(header_map: Dict[str, str], load_columns: List[str], load_lines: List[str]) -> str:
+        digest = hashlib.sha256()
+        # Header values that end up on every Harvest row; a change means re-importing everything.
+        for key in ("Grower", "Farm", "Field", "Year", "Crop", "BridgeId", "JobNumber"):
+            digest.update(f"{key}={header_map.get(key)}\n".encode("utf-8"))
+        digest.update(",".join(load_columns).encode("utf-8"))
+        digest.update(b"\n")
+        digest.update("\n".join(load_lines).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _read_grc_header(self, rows: Iterator[List[str]]) -> Tuple[Dict[str, str], List[str]]:
+        """
+        Consume rows up to and including the load header row.
 
-                    loads.append(load_row)
-                    i += 1
+        Returns the key/value header rows and the load columns ([] when the
+        file has no load section, in which case rows is exhausted).
+        """
+        header_map: Dict[str, str] = {}
 
-                break
+        for row in rows:
+            # Detect the real load header row
+            if self._looks_like_load_header(row):
+                return header_map, row
 
             # Before load section, collect simple key/value header rows
             if len(row) >= 2:
@@ -335,30 +962,73 @@ class SlingshotClient:
                 if key:
                     header_map[key] = value
 
-            i += 1
+        return header_map, []
 
-        parsed = {
-            "graincart_id": graincart_id,
-            "header": {
-                "grc_version": header_map.get("GrcVersion"),
-                "software_version": header_map.get("SoftwareVersion"),
-                "job_number": self._safe_int(header_map.get("JobNumber")),
-                "grower": header_map.get("Grower"),
-                "farm": header_map.get("Farm"),
-                "field": header_map.get("Field"),
-                "year": self._safe_int(header_map.get("Year")),
-                "crop": header_map.get("Crop"),
-                "bridge_id": header_map.get("BridgeId"),
-                "date_created": header_map.get("DateCreated"),
-                "time_created": header_map.get("TimeCreated"),
-                "file_name": file_name,
-            },
-            "loads": [self._normalize_load_row(r) for r in loads],
-            "raw_header": header_map,
-            "load_columns": load_columns,
-        }
+    @staticmethod
+    def _iter_grc_rows(lines: Iterable[str]) -> Iterator[List[str]]:
+        """
+        Tokenize .grc lines into stripped cells, dropping trailing empty cells
+        and blank rows.
 
-        return parsed
+        Slingshot writes plain comma-separated rows without quoting, so a
+        str.split() is enough for almost every line; only lines containing a
+        quote go through the csv module.
+        """
+        csv_reader = csv.reader
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+
+            if '"' in line:
+                row = [cell.strip() for cell in next(csv_reader([line]))]
+            else:
+                row = [cell.strip() for cell in line.split(",")]
+
+            while row and row[-1] == "":
+                row.pop()
+
+            if row:
+                yield row
+
+    @staticmethod
+    def _iter_load_rows(
+        rows: Iterator[List[str]],
+        plan: LoadRowPlan,
+        lean: bool = False,
+        keep_raw: bool = False,
+    ) -> Iterator[Any]:
+        # All following rows are load rows until file ends
+        column_count = len(plan.load_columns)
+        normalize = plan.normalize
+        if lean:
+            normalize_lean = plan.normalize_lean
+
+            def normalize(cells: List[Optional[str]]) -> GrcLoad:
+                return normalize_lean(cells, keep_raw)
+
+        for data_row in rows:
+            if len(data_row) < column_count:
+                data_row = data_row + [None] * (column_count - len(data_row))
+            elif len(data_row) > column_count:
+                data_row = data_row[:column_count]
+            yield normalize(data_row)
+
+    def _build_header(self, header_map: Dict[str, str], file_name: Optional[str]) -> Dict[str, Any]:
+        return {
+            "grc_version": header_map.get("GrcVersion"),
+            "software_version": header_map.get("SoftwareVersion"),
+            "job_number": self._safe_int(header_map.get("JobNumber")),
+            "grower": header_map.get("Grower"),
+            "farm": header_map.get("Farm"),
+            "field": header_map.get("Field"),
+            "year": self._safe_int(header_map.get("Year")),
+            "crop": header_map.get("Crop"),
+            "bridge_id": header_map.get("BridgeId"),
+            "date_created": header_map.get("DateCreated"),
+            "time_created": header_map.get("TimeCreated"),
+            "file_name": file_name,
+        }
 
     def _looks_like_load_header(self, row: List[str]) -> bool:
         row_lower = [c.strip().lower() for c in row]
@@ -377,33 +1047,55 @@ class SlingshotClient:
         return required.issubset(set(r.replace(" ", "") for r in row_lower))
 
     def _normalize_load_row(self, row: Dict[str, Any]) -> Dict[str, Any]:
-        load_date = self._get_first(row, ["LocalDate", "LoadDate"])
-        load_time = self._get_first(row, ["LocalTime", "LoadTime"])
-
-        combined_dt = None
-        if load_date and load_time:
-            combined_dt = f"{load_date} {load_time}"
-
-        return {
-            "load_num": self._get_first(row, ["LoadNumber"]),
-            "cart_id": self._extract_cart_code_from_bridge_id_or_file(row),
-            "weight": self._safe_decimal(self._get_first(row, ["Weight"])),
-            "truck": self._get_first(row, ["TruckID", "Truck"]),
-            "dest": self._get_first(row, ["Destination", "Dest"]),
-            "moisture": self._safe_decimal(self._get_first(row, ["Moisture", "MeasuredMoisture"])),
-            "comment": self._get_first(row, ["Comment", "Comments"]),
-            "test_weight": self._safe_decimal(self._get_first(row, ["TestWeight", "Test Weight"])),
-            "wet": self._safe_decimal(self._get_first(row, ["WetBushels", "Wet"])),
-            "dry": self._safe_decimal(self._get_first(row, ["DryBushels", "Dry"])),
-            "variety": self._get_first(row, ["Variety"]),
-            "date": combined_dt or load_date,
-            "load_cell": self._get_first(row, ["LoadCellCAL", "LoadCell", "Load Cell"]),
-            "raw": row,
-        }
+        """Normalize one load given as a {column: value} dict; see LoadRowPlan."""
+        return compile_load_row_plan(tuple(row)).normalize(list(row.values()))
 
     # ------------------------------------------------------------------
     # Response helpers
     # ------------------------------------------------------------------
+    @staticmethod
+    def summary_file_id(item: Dict[str, Any]) -> Optional[int]:
+        file_id_raw = item.get("ID") or item.get("Id") or item.get("id")
+        if not file_id_raw:
+            return None
+        return int(file_id_raw)
+
+    @staticmethod
+    def summary_last_modified(item: Dict[str, Any]) -> Optional[str]:
+        """
+        Version string for a graincart summary item, used as the cache key.
+
+        Slingshot reports the file's last-modified date/time; when only a
+        date is present it is used on its own. Returns None when the item
+        carries no modification metadata, which disables caching for it.
+        """
+        for date_key, time_key in (
+            ("DateLastModified", "TimeLastModified"),
+            ("LastModified", None),
+            ("DateModified", "TimeModified"),
+            ("ModifiedDate", "ModifiedTime"),
+            ("LastModifiedDate", "LastModifiedTime"),
+        ):
+            date_value = item.get(date_key)
+            if date_value in (None, ""):
+                continue
+            time_value = item.get(time_key) if time_key else None
+            if time_value not in (None, ""):
+                return f"{str(date_value).strip()} {str(time_value).strip()}"
+            return str(date_value).strip()
+        return None
+
+    @staticmethod
+    def _summary_total_count(payload: Dict[str, Any]) -> Optional[int]:
+        """Total number of files across all pages, when the payload reports it."""
+        candidates = [payload] + [value for value in payload.values() if isinstance(value, dict)]
+        for container in candidates:
+            for key in ("TotalCount", "TotalItems", "TotalRecords", "Total"):
+                value = container.get(key)
+                if isinstance(value, (int, str)) and str(value).strip().isdigit():
+                    return int(value)
+        return None
+
     def _extract_summary_items(self, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
         for key in ("GrainCart", "GrainCarts", "Items", "Result", "results", "items"):
             value = payload.get(key)
@@ -432,6 +1124,67 @@ class SlingshotClient:
     def _unix_timestamp() -> str:
         return str(int(time.time()))
 
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """
+        Retry-After is either delta-seconds or an HTTP date; None when it is
+        missing, negative or unparseable (an HTTP date in the past is 0).
+        """
+        if not value:
+            return None
+        value = value.strip()
+        try:
+            seconds = float(value)
+        except ValueError:
+            pass
+        else:
+            return seconds if 0.0 <= seconds < float("inf") else None
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    @staticmethod
+    def open_grc_text_stream(raw_stream: BinaryIO) -> TextIO:
+        """
+        Wrap a binary .grc stream as text, choosing the encoding once.
+
+        The encoding is picked from the first buffered block: a UTF-8 BOM
+        means utf-8-sig, valid UTF-8 means utf-8, anything else latin-1
+        (the same preference order as decode_grc_bytes). Invalid UTF-8
+        further into the file is replaced rather than re-decoded, so the
+        stream never has to be read twice. Universal newlines handle CRLF
+        and bare CR endings across chunk boundaries.
+        """
+        buffered = raw_stream if isinstance(raw_stream, io.BufferedReader) else io.BufferedReader(
+            raw_stream, buffer_size=GRC_STREAM_CHUNK_SIZE
+        )
+        head = buffered.peek(GRC_STREAM_CHUNK_SIZE)
+
+        if head.startswith(codecs.BOM_UTF8):
+            encoding = "utf-8-sig"
+        else:
+            try:
+                codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+                encoding = "utf-8"
+            except UnicodeDecodeError:
+                encoding = "latin-1"
+
+        return io.TextIOWrapper(buffered, encoding=encoding, errors="replace", newline=None)
+
+    @staticmethod
+    def decode_grc_bytes(raw: bytes) -> str:
+        # utf-8-sig decodes plain UTF-8 too, and drops a leading BOM like open_grc_text_stream does.
+        for encoding in ("utf-8-sig", "latin-1"):
+            try:
+                return raw.decode(encoding)
+            except UnicodeDecodeError:
+                continue
+        return raw.decode("utf-8", errors="replace")
+
     @staticmethod
     def _safe_int(value: Any) -> Optional[int]:
         if value in (None, "", "null"):
@@ -455,12 +1208,425 @@ class SlingshotClient:
         except Exception:
             return None
 
-    @staticmethod
-    def _get_first(data: Dict[str, Any], keys: List[str]) -> Any:
-        for key in keys:
-            if key in data and data[key] not in (None, ""):
-                return data[key]
-        return None
+
+class SlingshotClient(SlingshotClientBase):
+    # Bounds and latency targets for adaptive summary paging.
+    SUMMARY_MIN_PAGESIZE = 10
+    SUMMARY_MAX_PAGESIZE = 100
+    SUMMARY_FAST_PAGE_SECONDS = 1.0
+    SUMMARY_SLOW_PAGE_SECONDS = 5.0
+
+    def __init__(
+        self,
+        config: Optional[SlingshotConfig] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        metrics: Optional[SlingshotMetrics] = None,
+        cache: Optional[GrcFileCache] = None,
+        parsed_cache: Optional[GrcParsedCache] = None,
+    ) -> None:
+        self.config = config or SlingshotConfig.from_env()
+        self.session = requests.Session()
+        self.cache = cache if cache is not None else GrcFileCache.from_env()
+        self.parsed_cache = parsed_cache if parsed_cache is not None else GrcParsedCache.from_env()
+        self.rate_limiter = rate_limiter or RateLimiter.for_config(self.config)
+        self.metrics = metrics or SlingshotMetrics(trace_path=self.config.trace_file)
+
+        # One connection per download worker so the pool never blocks on the session.
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(10, self.config.max_workers))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def get_access_key_summary(self) -> Dict[str, Any]:
+        return self._get_json("/accesskey")
+
+    def list_graincart_files(self, page: int = 0, pagesize: int = 100) -> Dict[str, Any]:
+        return self._get_json("/graincart", params={"page": page, "pagesize": pagesize})
+
+    def get_graincart_detail(self, graincart_id: int) -> Dict[str, Any]:
+        return self._get_json(f"/graincart/{graincart_id}")
+
+    def download_graincart_bin(self, graincart_id: int, version: Optional[str] = None) -> bytes:
+        """
+        Raw .grc bytes. When version (see summary_last_modified) is given and
+        the local cache holds that version, no request is made.
+        """
+        if self.cache is not None and version:
+            cached = self.cache.get(graincart_id, version)
+            self.metrics.record_cache(cached is not None)
+            if cached is not None:
+                return cached
+
+        raw = self._get_bytes(f"/graincart/{graincart_id}", params={"format": "bin"})
+
+        if self.cache is not None and version:
+            self.cache.put(graincart_id, version, raw)
+        return raw
+
+    def download_graincart_text(self, graincart_id: int, version: Optional[str] = None) -> str:
+        return self.decode_grc_bytes(self.download_graincart_bin(graincart_id, version=version))
+
+    def iter_graincart_downloads(
+        self,
+        graincart_ids: Iterable[int],
+        max_workers: Optional[int] = None,
+        versions: Optional[Dict[int, Optional[str]]] = None,
+    ) -> Iterator[GraincartDownload]:
+        """
+        Download many .grc files on a bounded worker pool.
+
+        Results are yielded in completion order, not request order, so the
+        caller can parse and write one file while the rest are still in
+        flight. A failed download is yielded with .error set instead of
+        raising, so one bad file does not stop the batch. All workers share
+        this client's rate_limiter, so a 429 on one slows them all.
+
+        versions maps graincart ID -> summary_last_modified value so cached
+        files are served from disk.
+        """
+        unique_ids = list(dict.fromkeys(int(graincart_id) for graincart_id in graincart_ids))
+        if not unique_ids:
+            return
+
+        versions = versions or {}
+        workers = max(1, min(max_workers or self.config.max_workers, len(unique_ids)))
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="slingshot-download")
+        try:
+            futures = [
+                pool.submit(self._download_one, graincart_id, versions.get(graincart_id))
+                for graincart_id in unique_ids
+            ]
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            # If the consumer stops early, drop queued downloads instead of finishing them.
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def get_parsed_graincart_file(
+        self,
+        graincart_id: int,
+        file_name: Optional[str] = None,
+        version: Optional[str] = None,
+        lean: bool = False,
+    ) -> Dict[str, Any]:
+        raw = self.download_graincart_bin(graincart_id, version=version)
+        return self.parse_grc_bytes(raw, graincart_id=graincart_id, file_name=file_name, lean=lean)
+
+    def stream_parsed_graincart_file(
+        self,
+        graincart_id: int,
+        file_name: Optional[str] = None,
+        version: Optional[str] = None,
+        lean: bool = False,
+    ) -> GrcStream:
+        """
+        Download and parse a .grc file without holding it in memory.
+
+        The response body (or cached copy) is read in chunks as the returned
+        stream's .loads iterator is consumed, so memory stays flat however
+        many loads the file has. A network download is written through to
+        the cache, but only once the whole body has been read. Exhaust or
+        close() .loads to release the connection.
+        """
+        raw_stream: Optional[BinaryIO] = None
+        writer = None
+        response = None
+
+        if self.cache is not None and version:
+            raw_stream = self.cache.open(graincart_id, version)
+            self.metrics.record_cache(raw_stream is not None)
+
+        if raw_stream is None:
+            response = self._request(
+                "GET",
+                f"/graincart/{graincart_id}",
+                params={"format": "bin"},
+                accept="*/*",
+                stream=True,
+            )
+            response.raw.decode_content = True
+            if self.cache is not None:
+                writer = self.cache.open_writer(graincart_id, version)
+            raw_stream = _ResponseReader(response.raw, writer)
+
+        try:
+            text_stream = self.open_grc_text_stream(raw_stream)
+            stream = self.stream_grc_lines(text_stream, graincart_id=graincart_id, file_name=file_name, lean=lean)
+        except Exception:
+            if writer is not None:
+                writer.abort()
+            if response is not None:
+                response.close()
+            raw_stream.close()
+            raise
+
+        parsed_loads = stream.loads
+
+        def loads_then_close() -> Iterator[Dict[str, Any]]:
+            completed = False
+            try:
+                yield from parsed_loads
+                completed = True
+            finally:
+                if writer is not None:
+                    if completed:
+                        writer.commit()
+                    else:
+                        writer.abort()
+                text_stream.close()
+                if response is not None:
+                    response.close()
+
+        stream.loads = loads_then_close()
+        return stream
+
+    def iter_all_graincart_summaries(self, pagesize: int = 100, prefetch: int = 4):
+        for _payload, items in self.iter_graincart_summary_pages(pagesize=pagesize, prefetch=prefetch):
+            yield from items
+
+    def iter_graincart_summary_pages(
+        self,
+        pagesize: int = 100,
+        prefetch: int = 4,
+        adaptive: bool = True,
+    ) -> Iterator[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+        """
+        Yield (payload, items) for each summary page, in listing order.
+
+        Up to prefetch page requests are kept in flight on a small thread
+        pool while the caller works through the current page. When the
+        first payload reports a total count, every remaining page is known
+        up front and fetched in parallel. Otherwise pages are requested
+        speculatively and the overshoot past the last page is discarded.
+
+        With adaptive=True the page size grows (up to SUMMARY_MAX_PAGESIZE)
+        while pages come back quickly and shrinks (down to
+        SUMMARY_MIN_PAGESIZE) when they are slow or throttled. A new size
+        is only applied at an offset it divides evenly, so pages never
+        overlap or leave gaps.
+        """
+        prefetch = max(1, prefetch)
+        size = max(1, pagesize)
+
+        throttled_before = self.metrics.throttled
+        payload, items, seconds = self._fetch_summary_page(0, size)
+        if not items:
+            return
+        yield payload, items
+        if not payload.get("IsNextPage"):
+            return
+
+        total = self._summary_total_count(payload)
+        pool = ThreadPoolExecutor(max_workers=prefetch, thread_name_prefix="slingshot-list")
+        pending: Deque[Future] = deque()
+        try:
+            next_offset = size
+            stop = False
+            while not stop:
+                while len(pending) < prefetch and (total is None or next_offset < total):
+                    if adaptive and total is None:
+                        throttled = self.metrics.throttled > throttled_before
+                        throttled_before = self.metrics.throttled
+                        size = self._adapt_summary_pagesize(size, next_offset, seconds, throttled)
+                    pending.append(pool.submit(self._fetch_summary_page, next_offset // size, size))
+                    next_offset += size
+
+                if not pending:
+                    break
+
+                payload, items, seconds = pending.popleft().result()
+                if not items:
+                    break
+                yield payload, items
+                stop = not payload.get("IsNextPage")
+        finally:
+            for future in pending:
+                future.cancel()
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def iter_changed_graincart_summaries(
+        self,
+        state: SyncState,
+        pagesize: int = 100,
+        clean_pages_to_stop: int = 1,
+    ):
+        """
+        Yield only summaries that are new or modified since state was saved.
+
+        Slingshot lists recently modified files first, so once
+        clean_pages_to_stop consecutive pages contain nothing but files the
+        state already holds at the same last-modified value, the rest of the
+        listing is assumed unchanged and paging stops. Use
+        iter_all_graincart_summaries for a full walk.
+        """
+        clean_pages = 0
+        pages = self.iter_graincart_summary_pages(pagesize=pagesize, prefetch=1)
+        for _payload, items in pages:
+            page_changed = False
+            for item in items:
+                file_id = self.summary_file_id(item)
+                if file_id is not None and state.is_unchanged(file_id, self.summary_last_modified(item)):
+                    continue
+                page_changed = True
+                yield item
+
+            clean_pages = 0 if page_changed else clean_pages + 1
+            if clean_pages >= clean_pages_to_stop:
+                pages.close()
+                break
+
+    # ------------------------------------------------------------------
+    # HTTP helpers
+    # ------------------------------------------------------------------
+    def _get_json(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        response = self._request("GET", path, params=params, accept="application/json")
+        try:
+            return response.json()
+        except Exception as exc:
+            raise SlingshotHTTPError(
+                f"Expected JSON response from {path}, but parsing failed. "
+                f"HTTP {response.status_code}. Body starts with: {response.text[:500]}"
+            ) from exc
+
+    def _get_bytes(self, path: str, params: Optional[Dict[str, Any]] = None) -> bytes:
+        response = self._request("GET", path, params=params, accept="*/*")
+        return response.content
+
+    def _fetch_summary_page(self, page: int, pagesize: int) -> Tuple[Dict[str, Any], List[Dict[str, Any]], float]:
+        started = time.monotonic()
+        payload = self.list_graincart_files(page=page, pagesize=pagesize)
+        return payload, self._extract_summary_items(payload), time.monotonic() - started
+
+    def _adapt_summary_pagesize(self, size: int, offset: int, seconds: float, throttled: bool) -> int:
+        if throttled or seconds > self.SUMMARY_SLOW_PAGE_SECONDS:
+            proposed = max(self.SUMMARY_MIN_PAGESIZE, size // 2)
+        elif seconds < self.SUMMARY_FAST_PAGE_SECONDS:
+            proposed = min(self.SUMMARY_MAX_PAGESIZE, size * 2)
+        else:
+            return size
+
+        # Keep page boundaries aligned: page index = offset // size must be exact.
+        if proposed != size and offset % proposed == 0:
+            return proposed
+        return size
+
+    def _download_one(self, graincart_id: int, version: Optional[str] = None) -> GraincartDownload:
+        started = time.monotonic()
+        try:
+            content = self.download_graincart_bin(graincart_id, version=version)
+        except Exception as exc:
+            return GraincartDownload(graincart_id=graincart_id, error=exc, seconds=time.monotonic() - started)
+        return GraincartDownload(graincart_id=graincart_id, content=content, seconds=time.monotonic() - started)
+
+    def _wait_for_request_budget(self) -> None:
+        wait_seconds = self.rate_limiter.reserve()
+        if wait_seconds > 0:
+            self.metrics.record_wait(wait_seconds)
+            time.sleep(wait_seconds)
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        accept: str = "application/json",
+        stream: bool = False,
+    ) -> requests.Response:
+        method = method.upper()
+        path = self._normalize_path(path)
+
+        url = f"{self.config.base_url}{path}"
+        endpoint = endpoint_label(path, params)
+
+        for attempt in range(self.config.max_retries):
+            self._wait_for_request_budget()
+
+            headers = self._signed_headers(method=method, path=path, accept=accept)
+
+            started = time.monotonic()
+            response = self.session.request(
+                method=method,
+                url=url,
+                params=params,
+                headers=headers,
+                timeout=self.config.timeout,
+                verify=self.config.verify_ssl,
+                stream=stream,
+            )
+            # Streamed bodies are still unread here; fall back to Content-Length.
+            size = int(response.headers.get("Content-Length") or 0) if stream else len(response.content)
+            self.metrics.record_response(
+                method, endpoint, response.status_code, time.monotonic() - started, size, attempt
+            )
+
+            # Error responses are closed here so a streamed one hands its
+            # connection back to the pool; only a successful one is returned open.
+            if response.status_code == 401:
+                body = response.text[:1000]
+                response.close()
+                raise SlingshotAuthError(
+                    "Slingshot returned 401 Unauthorized.\n"
+                    f"Signed path: {path}\n"
+                    f"Response body: {body}"
+                )
+
+            if response.status_code == 429:
+                # The limiter blocks every thread; the wait is paid on the next reserve().
+                self.rate_limiter.on_throttled(self._parse_retry_after(response.headers.get("Retry-After")))
+                response.close()
+                continue
+
+            if not response.ok:
+                body = response.text[:2000]
+                response.close()
+                raise SlingshotHTTPError(
+                    f"Slingshot request failed: {method} {url} -> HTTP {response.status_code}\n"
+                    f"Response body: {body}"
+                )
+
+            self.rate_limiter.on_success()
+            return response
+
+        raise SlingshotHTTPError(
+            f"Slingshot request failed after {self.config.max_retries} attempts: {method} {url} -> HTTP 429\n"
+            "Response body: Exceeded maximum requests."
+        )
+
+
+class _ResponseReader(io.RawIOBase):
+    """
+    Raw stream over a urllib3 response body, optionally copying every byte
+    read into a cache writer.
+
+    urllib3 reports the body as closed as soon as it is exhausted, which
+    makes io.BufferedReader refuse to hand out bytes it already buffered;
+    this wrapper stays open until it is closed explicitly.
+    """
+
+    def __init__(self, source: BinaryIO, sink: Any = None) -> None:
+        self._source = source
+        self._sink = sink
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        data = self._source.read(len(buffer))
+        if not data:
+            return 0
+        size = len(data)
+        buffer[:size] = data
+        if self._sink is not None:
+            self._sink.write(data)
+        return size
+
+    def close(self) -> None:
+        try:
+            self._source.close()
+        finally:
+            super().close()
 
 
 def pretty_print_json(data: Any) -> None:
@@ -0,0 +1,217 @@
+"""
+slingshot_metrics.py
+
+Request-level instrumentation for the Slingshot clients.
+
+What this file does
+-------------------
+- Counts requests, HTTP 429s, retries, cache hits/misses and the time
+  spent waiting on the rate limiter
+- Keeps a latency histogram, byte count and status counts per endpoint
+  (/graincart, /graincart/{id}, /graincart/{id}?format=bin, ...)
+- Optionally appends every request and wait as one JSON line to a trace
+  file (RAVEN_TRACE_FILE), for comparing slow runs after the fact
+
+Importers can add their own stage timings (parse, DB write) with
+record_stage(), so one summary shows whether time went to Slingshot,
+throttling or local work.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import IO, Any, Dict, List, Optional
+
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is open-ended.
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_label(path: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Collapse IDs so requests group by endpoint, e.g. /graincart/{id}?format=bin."""
+    label = _ID_SEGMENT.sub("/{id}", path)
+    if params and params.get("format"):
+        label += f"?format={params['format']}"
+    return label
+
+
+@dataclass
+class EndpointStats:
+    requests: int = 0
+    throttled: int = 0
+    errors: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+    buckets: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+
+    def add(self, status: int, seconds: float, size: int) -> None:
+        self.requests += 1
+        self.bytes += size
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        if status == 429:
+            self.throttled += 1
+        elif status >= 400:
+            self.errors += 1
+
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.buckets[index] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Upper bound of the bucket holding the given fraction of requests."""
+        if not self.requests:
+            return None
+        target = fraction * self.requests
+        running = 0
+        for index, count in enumerate(self.buckets):
+            running += count
+            if running >= target:
+                return LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else self.max_seconds
+        return self.max_seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "errors": self.errors,
+            "bytes": self.bytes,
+            "seconds": round(self.seconds, 3),
+            "avg_seconds": round(self.seconds / self.requests, 4) if self.requests else None,
+            "p50_seconds": self.percentile(0.5),
+            "p95_seconds": self.percentile(0.95),
+            "max_seconds": round(self.max_seconds, 4),
+            "histogram": {
+                **{f"<={bound:g}s": count for bound, count in zip(LATENCY_BUCKETS, self.buckets)},
+                f">{LATENCY_BUCKETS[-1]:g}s": self.buckets[-1],
+            },
+        }
+
+
+@dataclass
+class SlingshotMetrics:
+    """Thread-safe request, throttling and stage metrics, with an optional JSON-lines trace."""
+
+    requests: int = 0
+    throttled: int = 0
+    retries: int = 0
+    throttle_waits: int = 0
+    throttle_wait_seconds: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    bytes_received: int = 0
+    endpoints: Dict[str, EndpointStats] = field(default_factory=dict)
+    stages: Dict[str, float] = field(default_factory=dict)
+    trace_path: Optional[str] = None
+    _trace: Optional[IO[str]] = field(default=None, repr=False, compare=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record_response(
+        self,
+        method: str,
+        endpoint: str,
+        status: int,
+        seconds: float,
+        size: int,
+        attempt: int = 0,
+    ) -> None:
+        with self._lock:
+            self.requests += 1
+            self.bytes_received += size
+            if status == 429:
+                self.throttled += 1
+                self.retries += 1
+            self.endpoints.setdefault(endpoint, EndpointStats()).add(status, seconds, size)
+            self._write_trace({
+                "event": "request",
+                "method": method,
+                "endpoint": endpoint,
+                "status": status,
+                "seconds": round(seconds, 4),
+                "bytes": size,
+                "attempt": attempt,
+            })
+
+    def record_wait(self, seconds: float) -> None:
+        if seconds <= 0:
+            return
+        with self._lock:
+            self.throttle_waits += 1
+            self.throttle_wait_seconds += seconds
+            self._write_trace({"event": "wait", "seconds": round(seconds, 4)})
+
+    def record_cache(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+
+    def record_stage(self, stage: str, seconds: float) -> None:
+        """Accumulate caller-side time, e.g. "parse" or "db_write"."""
+        with self._lock:
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+            self._write_trace({"event": "stage", "stage": stage, "seconds": round(seconds, 4)})
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "retries": self.retries,
+                "throttle_waits": self.throttle_waits,
+                "throttle_wait_seconds": round(self.throttle_wait_seconds, 3),
+                "cache_hits": self.cache_hits,
+                "cache_misses": self.cache_misses,
+                "bytes_received": self.bytes_received,
+                "endpoints": {name: stats.snapshot() for name, stats in sorted(self.endpoints.items())},
+                "stages": {name: round(seconds, 3) for name, seconds in sorted(self.stages.items())},
+            }
+
+    def format_summary(self) -> str:
+        snap = self.snapshot()
+        lines = [
+            f"Slingshot requests: {snap['requests']} "
+            f"({snap['bytes_received'] / 1024:.0f} KiB, {snap['throttled']} throttled, "
+            f"{snap['throttle_wait_seconds']:.1f}s waiting on rate limit, "
+            f"cache hits/misses {snap['cache_hits']}/{snap['cache_misses']})"
+        ]
+        for name, stats in snap["endpoints"].items():
+            lines.append(
+                f"  {name}: {stats['requests']} req, {stats['seconds']:.1f}s total, "
+                f"p50<={stats['p50_seconds']}s, p95<={stats['p95_seconds']}s, max {stats['max_seconds']}s"
+            )
+        for name, seconds in snap["stages"].items():
+            lines.append(f"  stage {name}: {seconds:.1f}s")
+        return "\n".join(lines)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._trace is not None:
+                self._trace.close()
+                self._trace = None
+
+    def _write_trace(self, record: Dict[str, Any]) -> None:
+        # Called with self._lock held.
+        if not self.trace_path:
+            return
+        if self._trace is None:
+            self._trace = open(self.trace_path, "a", encoding="utf-8", buffering=1)
+        record = {
+            "ts": datetime.now().isoformat(timespec="milliseconds"),
+            "mono": round(time.monotonic(), 4),
+            "thread": threading.current_thread().name,
+            **record,
+        }
+        self._trace.write(json.dumps(record) + "\n")
@@ -0,0 +1,415 @@
+"""
+slingshot_mock_server.py
+
+Local stand-in for the Raven Slingshot API, for benchmarks and offline testing.
+
+What this file does
+-------------------
+- Serves the endpoints slingshot_client.py uses:
+    GET /accesskey
+    GET /graincart?page=&pagesize=       (paged, with IsNextPage)
+    GET /graincart/{id}                  (detail)
+    GET /graincart/{id}?format=bin       (original .grc bytes)
+- Verifies the X-SS-* signature headers with the same HMAC scheme as the client
+- Serves recorded .grc files (e.g. data/grc/93123148_Corn_1793_...grc, the ID
+  comes from the file name prefix) plus optional synthetic files (grc_synth.py)
+- Injects configurable latency, HTTP 429 throttling (with Retry-After) and
+  HTTP 500 errors, and can enforce a request-per-second quota
+- GET /_mock/stats returns request counters for benchmark runs
+
+Run
+---
+python slingshot_mock_server.py --port 8080 --synthetic 400
+python slingshot_mock_server.py --latency-ms 150 --throttle-rate 0.05 --quota 5
+
+Then point the client at it:
+RAVEN_BASE_URL=http://127.0.0.1:8080 python import_grc.py
+
+Credentials are read from the same RAVEN_* variables as the client, so the
+signatures match; any non-empty values work (the shared secret must be
+base64).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from dotenv import load_dotenv
+
+from grc_synth import build_corpus
+from slingshot_client import SlingshotClientBase, SlingshotConfig
+
+
+RECORDED_FILE_PATTERN = re.compile(r"^(?P<id>\d+)_(?P<name>.+\.grc)$", re.IGNORECASE)
+MAX_CLOCK_SKEW_SECONDS = 300
+
+
+@dataclass
+class MockFile:
+    graincart_id: int
+    name: str
+    content: bytes
+    date_last_modified: str
+    time_last_modified: str
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "ID": self.graincart_id,
+            "Name": self.name,
+            "DateLastModified": self.date_last_modified,
+            "TimeLastModified": self.time_last_modified,
+            "Size": len(self.content),
+        }
+
+
+@dataclass
+class MockSettings:
+    api_key: str
+    access_key: str
+    shared_secret: str
+    check_signature: bool = True
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    throttle_rate: float = 0.0
+    error_rate: float = 0.0
+    retry_after: Optional[float] = 1.0
+    quota: Optional[float] = None
+    report_total: bool = False
+
+
+@dataclass
+class MockStats:
+    requests: int = 0
+    throttled: int = 0
+    errors: int = 0
+    auth_failures: int = 0
+    bytes_sent: int = 0
+    by_endpoint: Dict[str, int] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, endpoint: str, status: int, size: int) -> None:
+        with self._lock:
+            self.requests += 1
+            self.bytes_sent += size
+            self.by_endpoint[endpoint] = self.by_endpoint.get(endpoint, 0) + 1
+            if status == 429:
+                self.throttled += 1
+            elif status == 401:
+                self.auth_failures += 1
+            elif status >= 500:
+                self.errors += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "errors": self.errors,
+                "auth_failures": self.auth_failures,
+                "bytes_sent": self.bytes_sent,
+                "by_endpoint": dict(self.by_endpoint),
+            }
+
+
+class MockSlingshotServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, address: Tuple[str, int], settings: MockSettings, files: List[MockFile]) -> None:
+        super().__init__(address, MockSlingshotHandler)
+        self.settings = settings
+        # Listing order: most recently modified first, like Slingshot.
+        self.files = sorted(
+            files,
+            key=lambda f: (f.date_last_modified, _padded_time(f.time_last_modified), f.graincart_id),
+            reverse=True,
+        )
+        self.files_by_id = {f.graincart_id: f for f in self.files}
+        self.stats = MockStats()
+        self.quota = _QuotaBucket(settings.quota) if settings.quota else None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class MockSlingshotHandler(BaseHTTPRequestHandler):
+    server: MockSlingshotServer
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        parsed = urlparse(self.path)
+        path = parsed.path.rstrip("/") or "/"
+        query = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+        settings = self.server.settings
+
+        if path == "/_mock/stats":
+            self._send_json(path, 200, self.server.stats.snapshot())
+            return
+
+        endpoint = re.sub(r"/\d+$", "/{id}", path)
+        self._simulate_latency()
+
+        if settings.check_signature and not self._signature_ok(path):
+            self._send_json(endpoint, 401, {"Message": "Authorization has been denied for this request."})
+            return
+
+        if self._throttled():
+            headers = {}
+            if settings.retry_after is not None:
+                headers["Retry-After"] = f"{settings.retry_after:g}"
+            self._send_json(endpoint, 429, {"Message": "Exceeded maximum requests."}, headers)
+            return
+
+        if settings.error_rate and random.random() < settings.error_rate:
+            self._send_json(endpoint, 500, {"Message": "Injected server error."})
+            return
+
+        if path == "/accesskey":
+            self._send_json(endpoint, 200, {"AccessKey": settings.access_key, "Status": "Active"})
+        elif path == "/graincart":
+            self._send_summary_page(endpoint, query)
+        elif endpoint == "/graincart/{id}":
+            self._send_graincart(endpoint, int(path.rsplit("/", 1)[-1]), query)
+        else:
+            self._send_json(endpoint, 404, {"Message": f"No resource at {path}"})
+
+    # ------------------------------------------------------------------
+    # Endpoints
+    # ------------------------------------------------------------------
+    def _send_summary_page(self, endpoint: str, query: Dict[str, str]) -> None:
+        page = int(query.get("page") or 0)
+        pagesize = max(1, int(query.get("pagesize") or 100))
+        start = page * pagesize
+        items = self.server.files[start:start + pagesize]
+
+        payload: Dict[str, Any] = {
+            "GrainCart": [f.summary() for f in items],
+            "IsNextPage": start + pagesize < len(self.server.files),
+        }
+        if self.server.settings.report_total:
+            payload["TotalCount"] = len(self.server.files)
+        self._send_json(endpoint, 200, payload)
+
+    def _send_graincart(self, endpoint: str, graincart_id: int, query: Dict[str, str]) -> None:
+        mock_file = self.server.files_by_id.get(graincart_id)
+        if mock_file is None:
+            self._send_json(endpoint, 404, {"Message": f"Grain cart file {graincart_id} not found."})
+            return
+
+        if (query.get("format") or "").lower() == "bin":
+            self._send(endpoint, 200, mock_file.content, "application/octet-stream")
+        else:
+            self._send_json(endpoint, 200, {"GrainCart": [mock_file.summary()]})
+
+    # ------------------------------------------------------------------
+    # Fault injection and auth
+    # ------------------------------------------------------------------
+    def _simulate_latency(self) -> None:
+        settings = self.server.settings
+        delay_ms = settings.latency_ms
+        if settings.jitter_ms:
+            delay_ms += random.uniform(-settings.jitter_ms, settings.jitter_ms)
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000.0)
+
+    def _throttled(self) -> bool:
+        settings = self.server.settings
+        if settings.throttle_rate and random.random() < settings.throttle_rate:
+            return True
+        if self.server.quota is not None and not self.server.quota.try_acquire():
+            return True
+        return False
+
+    def _signature_ok(self, path: str) -> bool:
+        settings = self.server.settings
+        timestamp = self.headers.get("X-SS-TimeStamp") or ""
+
+        if self.headers.get("X-SS-APIKey") != settings.api_key:
+            return False
+        if self.headers.get("X-SS-AccessKey") != settings.access_key:
+            return False
+        try:
+            if abs(time.time() - int(timestamp)) > MAX_CLOCK_SKEW_SECONDS:
+                return False
+        except ValueError:
+            return False
+
+        signer = SlingshotClientBase()
+        signer.config = SlingshotConfig(
+            api_key=settings.api_key,
+            shared_secret=settings.shared_secret,
+            access_key=settings.access_key,
+            base_url=f"http://{self.headers.get('Host') or ''}",
+        )
+        expected = signer._build_signature(method=self.command, path=path, timestamp=timestamp)
+        return expected == self.headers.get("X-SS-Signature")
+
+    # ------------------------------------------------------------------
+    # Response helpers
+    # ------------------------------------------------------------------
+    def _send_json(
+        self,
+        endpoint: str,
+        status: int,
+        payload: Any,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        self._send(endpoint, status, json.dumps(payload).encode("utf-8"), "application/json", headers)
+
+    def _send(
+        self,
+        endpoint: str,
+        status: int,
+        body: bytes,
+        content_type: str,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.stats.record(endpoint, status, len(body))
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class _QuotaBucket:
+    """Server-side quota: a request over budget is rejected, never delayed."""
+
+    def __init__(self, rate: float) -> None:
+        self.rate = rate
+        self.capacity = max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            return True
+
+
+# ----------------------------------------------------------------------
+# Payloads
+# ----------------------------------------------------------------------
+def load_recorded_files(directory: str | os.PathLike) -> List[MockFile]:
+    files: List[MockFile] = []
+    base = Path(directory)
+    if not base.is_dir():
+        return files
+
+    for path in sorted(base.iterdir()):
+        match = RECORDED_FILE_PATTERN.match(path.name)
+        if not match:
+            continue
+        content = path.read_bytes()
+        header = _read_header_fields(content)
+        files.append(
+            MockFile(
+                graincart_id=int(match.group("id")),
+                name=match.group("name"),
+                content=content,
+                date_last_modified=header.get("DateLastModified") or "2025-01-01",
+                time_last_modified=header.get("TimeLastModified") or "0:0:0",
+            )
+        )
+    return files
+
+
+def build_synthetic_files(count: int, loads_per_file: int, first_id: int = 90000000, seed: int = 1) -> List[MockFile]:
+    return [
+        MockFile(
+            graincart_id=synthetic.graincart_id,
+            name=synthetic.name,
+            content=synthetic.content,
+            date_last_modified=synthetic.date_last_modified,
+            time_last_modified=synthetic.time_last_modified,
+        )
+        for synthetic in build_corpus(count, loads_per_file, first_id=first_id, seed=seed)
+    ]
+
+
+def _read_header_fields(content: bytes) -> Dict[str, str]:
+    fields: Dict[str, str] = {}
+    for line in content.decode("utf-8", errors="replace").splitlines()[:40]:
+        parts = [part.strip() for part in line.split(",")]
+        if len(parts) >= 2 and parts[0]:
+            fields[parts[0]] = parts[1]
+    return fields
+
+
+def _padded_time(value: str) -> Tuple[int, ...]:
+    try:
+        return tuple(int(part) for part in value.split(":"))
+    except ValueError:
+        return (0,)
+
+
+def main() -> None:
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Local mock of the Raven Slingshot API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--data-dir", default="data/grc", help="recorded <ID>_<Name>.grc files to serve")
+    parser.add_argument("--synthetic", type=int, default=0, help="number of synthetic files to add")
+    parser.add_argument("--loads-per-file", type=int, default=40)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="probability of answering HTTP 429")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="probability of answering HTTP 500")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds on 429 (negative: omit)")
+    parser.add_argument("--quota", type=float, default=None, help="requests per second before answering 429")
+    parser.add_argument("--report-total", action="store_true", help="include TotalCount in summary pages")
+    parser.add_argument("--no-auth", action="store_true", help="skip X-SS-* signature checks")
+    args = parser.parse_args()
+
+    settings = MockSettings(
+        api_key=(os.getenv("RAVEN_API_KEY") or "mock-api-key").strip(),
+        access_key=(os.getenv("RAVEN_ACCESS_KEY") or "mock-access-key").strip(),
+        shared_secret=(os.getenv("RAVEN_SHARED_SECRET") or "bW9jay1zZWNyZXQ=").strip(),
+        check_signature=not args.no_auth,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        throttle_rate=args.throttle_rate,
+        error_rate=args.error_rate,
+        retry_after=args.retry_after if args.retry_after >= 0 else None,
+        quota=args.quota,
+        report_total=args.report_total,
+    )
+
+    files = load_recorded_files(args.data_dir) + build_synthetic_files(args.synthetic, args.loads_per_file)
+    server = MockSlingshotServer((args.host, args.port), settings, files)
+    print(f"Mock Slingshot serving {len(files)} file(s) at {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
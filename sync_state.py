@@ -0,0 +1,142 @@
+"""
+sync_state.py
+
+Persisted cursor for incremental Slingshot syncs.
+
+What this file does
+-------------------
+- Remembers every graincart file already imported, with the last-modified
+  value it had at import time (the summary page cache)
+- Tracks the high-water mark: highest file ID and newest last-modified seen
+- Lets SlingshotClient.iter_changed_graincart_summaries() stop paging once
+  it reaches files that are known and unchanged
+- Keeps a load cursor per file (load lines imported, their fingerprint and
+  the last LoadNumber), so a file that only grew is imported from where
+  the last run stopped (see SlingshotClientBase.stream_grc_appended)
+- Remembers the sha256 of files imported from archive bundles, so a
+  bundle imported again skips the members already in the database
+
+A file is only recorded after it has been imported successfully, so a file
+that failed is offered again on the next run.
+
+Optional .env variables
+-----------------------
+RAVEN_SYNC_STATE=data/slingshot_sync_state.json
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from dotenv import load_dotenv
+
+
+DEFAULT_STATE_PATH = "data/slingshot_sync_state.json"
+
+
+@dataclass
+class SyncState:
+    path: Path
+    max_file_id: int = 0
+    max_last_modified: Optional[str] = None
+    last_sync_at: Optional[str] = None
+    files: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # sha256 of imported archive members -> graincart ID
+    content_hashes: Dict[str, int] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @classmethod
+    def load(cls, path: Optional[str | os.PathLike] = None) -> "SyncState":
+        if path is None:
+            load_dotenv()
+            path = (os.getenv("RAVEN_SYNC_STATE") or DEFAULT_STATE_PATH).strip()
+
+        state_path = Path(path)
+        try:
+            with state_path.open("r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except FileNotFoundError:
+            return cls(path=state_path)
+
+        return cls(
+            path=state_path,
+            max_file_id=int(data.get("max_file_id") or 0),
+            max_last_modified=data.get("max_last_modified"),
+            last_sync_at=data.get("last_sync_at"),
+            files=data.get("files") or {},
+            content_hashes=data.get("content_hashes") or {},
+        )
+
+    def is_unchanged(self, file_id: int, last_modified: Optional[str]) -> bool:
+        """True when the file was imported before with this exact last-modified value."""
+        known = self.files.get(str(file_id))
+        if known is None or last_modified is None:
+            return False
+        return known.get("last_modified") == last_modified
+
+    def cursor_for(self, file_id: int) -> Optional[Dict[str, Any]]:
+        """The load cursor saved with the last import of this file, if any."""
+        known = self.files.get(str(file_id))
+        return known.get("cursor") if known else None
+
+    def is_content_imported(self, digest: str) -> bool:
+        return digest in self.content_hashes
+
+    def mark_content_imported(self, digest: str, file_id: int) -> None:
+        with self._lock:
+            self.content_hashes[digest] = int(file_id)
+
+    def mark_imported(
+        self,
+        file_id: int,
+        file_name: Optional[str],
+        last_modified: Optional[str],
+        cursor: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        with self._lock:
+            entry: Dict[str, Any] = {"name": file_name, "last_modified": last_modified}
+            if cursor is not None:
+                entry["cursor"] = cursor
+            self.files[str(file_id)] = entry
+            self.max_file_id = max(self.max_file_id, int(file_id))
+            if last_modified and (
+                self.max_last_modified is None
+                or _sortable_timestamp(last_modified) > _sortable_timestamp(self.max_last_modified)
+            ):
+                self.max_last_modified = last_modified
+
+    def save(self) -> None:
+        with self._lock:
+            self.last_sync_at = datetime.now().isoformat(timespec="seconds")
+            payload = {
+                "max_file_id": self.max_file_id,
+                "max_last_modified": self.max_last_modified,
+                "last_sync_at": self.last_sync_at,
+                "files": self.files,
+                "content_hashes": self.content_hashes,
+            }
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f".{self.path.name}.tmp")
+            with tmp_path.open("w", encoding="utf-8") as handle:
+                json.dump(payload, handle, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.path)
+
+
+def _sortable_timestamp(value: str) -> tuple:
+    """
+    Slingshot times are not zero-padded (e.g. "12:57:3"), so compare the
+    numeric parts instead of the raw strings.
+    """
+    parts = []
+    for token in value.replace("T", " ").replace("-", " ").replace(":", " ").replace("/", " ").split():
+        try:
+            parts.append(int(token))
+        except ValueError:
+            parts.append(0)
+    return tuple(parts)